@@ -14,6 +14,7 @@ Version: 3.0 - Architecture modulaire
 
 import os
 import logging
+import threading
 from flask import Flask
 from flask_cors import CORS
 
@@ -21,11 +22,7 @@ from flask_cors import CORS
 from app.config.base import Config, DevelopmentConfig, ProductionConfig
 from app.utils.logger import setup_logger
 
-# Import des services
-from app.services.data_generator import ElectricityDataGenerator
-from app.services.osm_service import OSMService
-from app.services.validation_service import ValidationService
-from app.services.export_service import ExportService
+# Les services sont importés et construits au premier usage (voir initialize_services)
 
 def create_app(config_name=None):
     """
@@ -115,37 +112,83 @@ def create_app(config_name=None):
     return app
 
 
+class LazyService:
+    """
+    Proxy d'un service construit au premier accès à l'un de ses attributs.
+    
+    Le module du service (et ses dépendances lourdes) n'est importé qu'à ce
+    moment: les workers et jobs qui n'utilisent pas un service n'en paient
+    pas le coût de démarrage.
+    """
+    
+    def __init__(self, name: str, factory):
+        """
+        Args:
+            name: Nom du service (logs)
+            factory: Fonction sans argument qui construit le service
+        """
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_initialized(self) -> bool:
+        """Indique si le service a déjà été construit."""
+        return self._instance is not None
+    
+    def get_instance(self):
+        """Retourne le service, en le construisant au premier appel."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                    logging.getLogger(__name__).info(f"✅ {self._name} initialisé")
+        return self._instance
+    
+    def __getattr__(self, attribute):
+        return getattr(self.get_instance(), attribute)
+    
+    def __repr__(self) -> str:
+        state = 'initialisé' if self.is_initialized else 'non initialisé'
+        return f"LazyService({self._name}, {state})"
+
+
 def initialize_services(app):
     """
-    Initialise les services de l'application et les attache à l'instance Flask.
+    Attache les services à l'instance Flask.
+    
+    Chaque service est un LazyService: il est importé et construit au
+    premier accès (ex: current_app.osm_service.get_stats()).
     
     Args:
         app (Flask): Instance de l'application Flask
     """
     logger = logging.getLogger(__name__)
+    config = app.config
     
-    try:
-        # Service générateur de données
-        app.data_generator = ElectricityDataGenerator()
-        logger.info("✅ Service générateur de données initialisé")
-        
-        # Service OSM
-        app.osm_service = OSMService()
-        logger.info("✅ Service OSM initialisé")
-        
-        # Service de validation
-        app.validation_service = ValidationService()
-        logger.info("✅ Service de validation initialisé")
-        
-        # Service d'export
-        app.export_service = ExportService(
-            output_dir=app.config['GENERATED_DATA_DIR']
-        )
-        logger.info("✅ Service d'export initialisé")
-        
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de l'initialisation des services: {e}")
-        raise
+    def create_data_generator():
+        from app.services.data_generator import ElectricityDataGenerator
+        return ElectricityDataGenerator(config=config)
+    
+    def create_osm_service():
+        from app.services.osm_service import OSMService
+        return OSMService(config=config)
+    
+    def create_validation_service():
+        from app.services.validation_service import ValidationService
+        return ValidationService()
+    
+    def create_export_service():
+        from app.services.export_service import ExportService
+        return ExportService(output_dir=config['GENERATED_DATA_DIR'])
+    
+    app.data_generator = LazyService("Service générateur de données", create_data_generator)
+    app.osm_service = LazyService("Service OSM", create_osm_service)
+    app.validation_service = LazyService("Service de validation", create_validation_service)
+    app.export_service = LazyService("Service d'export", create_export_service)
+    
+    logger.info("✅ Services enregistrés (initialisation au premier usage)")
 
 
 def register_blueprints(app):
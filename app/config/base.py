@@ -37,8 +37,11 @@ class Config:
     
     # === CONFIGURATION OSM ULTRA-OPTIMISÉE ===
     
-    # URLs Overpass (load balancing automatique)
+    # URLs Overpass (routage selon la santé des miroirs)
+    # OVERPASS_API_URLS="http://localhost:8089/api/interpreter" pour un serveur local (ex: app/utils/overpass_stub.py)
     OVERPASS_API_URLS = [
+        url.strip() for url in os.environ.get('OVERPASS_API_URLS', '').split(',') if url.strip()
+    ] or [
         'https://overpass-api.de/api/interpreter',
         'https://lz4.overpass-api.de/api/interpreter', 
         'https://z.overpass-api.de/api/interpreter'
@@ -5,7 +5,9 @@ Définit les structures de données pour bâtiments, locations et séries tempor
 """
 
 from .building import Building
+from .building_table import BuildingTable
 from .location import Location
+from .osm_building_store import OSMBuildingStore
 from .timeseries import TimeSeries, TimeSeriesCollection
 
-__all__ = ['Building', 'Location', 'TimeSeries', 'TimeSeriesCollection']
\ No newline at end of file
+__all__ = ['Building', 'BuildingTable', 'Location', 'OSMBuildingStore', 'TimeSeries', 'TimeSeriesCollection']
\ No newline at end of file
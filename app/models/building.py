@@ -18,6 +18,39 @@ from datetime import datetime
 import uuid
 
 
+# Types de bâtiments et statuts de validation acceptés
+VALID_BUILDING_TYPES = ['residential', 'commercial', 'industrial', 'public']
+VALID_VALIDATION_STATUSES = ['pending', 'valid', 'invalid', 'warning']
+
+# Profils énergétiques par défaut selon le type
+ENERGY_PROFILES = {
+    'residential': {
+        'base_consumption_kwh': 25.0,
+        'peak_hours': [7, 8, 18, 19, 20],
+        'seasonal_variation': 0.3,
+        'ac_dependency': 0.6
+    },
+    'commercial': {
+        'base_consumption_kwh': 150.0,
+        'peak_hours': [9, 10, 11, 14, 15, 16],
+        'seasonal_variation': 0.4,
+        'ac_dependency': 0.8
+    },
+    'industrial': {
+        'base_consumption_kwh': 400.0,
+        'peak_hours': [8, 9, 10, 11, 13, 14, 15, 16],
+        'seasonal_variation': 0.2,
+        'ac_dependency': 0.3
+    },
+    'public': {
+        'base_consumption_kwh': 80.0,
+        'peak_hours': [8, 9, 10, 11, 13, 14, 15, 16, 17],
+        'seasonal_variation': 0.25,
+        'ac_dependency': 0.7
+    }
+}
+
+
 @dataclass
 class Building:
     """
@@ -73,51 +106,21 @@ class Building:
             raise ValueError("unique_id doit être une chaîne de 16 caractères")
         
         # Validation du type de bâtiment
-        valid_types = ['residential', 'commercial', 'industrial', 'public']
-        if self.building_type not in valid_types:
-            raise ValueError(f"building_type doit être dans {valid_types}")
+        if self.building_type not in VALID_BUILDING_TYPES:
+            raise ValueError(f"building_type doit être dans {VALID_BUILDING_TYPES}")
         
         # Validation du building_id
         if not self.building_id or not self.building_id.startswith('MY_'):
             raise ValueError("building_id doit commencer par 'MY_'")
         
         # Validation du statut
-        valid_statuses = ['pending', 'valid', 'invalid', 'warning']
-        if self.validation_status not in valid_statuses:
-            raise ValueError(f"validation_status doit être dans {valid_statuses}")
+        if self.validation_status not in VALID_VALIDATION_STATUSES:
+            raise ValueError(f"validation_status doit être dans {VALID_VALIDATION_STATUSES}")
     
     def _initialize_energy_profile(self):
         """Initialise le profil énergétique basé sur le type de bâtiment."""
         
-        # Profils énergétiques par défaut selon le type
-        energy_profiles = {
-            'residential': {
-                'base_consumption_kwh': 25.0,
-                'peak_hours': [7, 8, 18, 19, 20],
-                'seasonal_variation': 0.3,
-                'ac_dependency': 0.6
-            },
-            'commercial': {
-                'base_consumption_kwh': 150.0,
-                'peak_hours': [9, 10, 11, 14, 15, 16],
-                'seasonal_variation': 0.4,
-                'ac_dependency': 0.8
-            },
-            'industrial': {
-                'base_consumption_kwh': 400.0,
-                'peak_hours': [8, 9, 10, 11, 13, 14, 15, 16],
-                'seasonal_variation': 0.2,
-                'ac_dependency': 0.3
-            },
-            'public': {
-                'base_consumption_kwh': 80.0,
-                'peak_hours': [8, 9, 10, 11, 13, 14, 15, 16, 17],
-                'seasonal_variation': 0.25,
-                'ac_dependency': 0.7
-            }
-        }
-        
-        base_profile = energy_profiles.get(self.building_type, energy_profiles['residential'])
+        base_profile = ENERGY_PROFILES.get(self.building_type, ENERGY_PROFILES['residential'])
         
         # Ajuster selon les caractéristiques spécifiques
         self._energy_profile = self._customize_energy_profile(base_profile)
@@ -163,7 +166,9 @@ class Building:
         if 'energy_efficiency' in self.characteristics:
             efficiency = self.characteristics['energy_efficiency']
             # efficiency entre 0.5 (inefficace) et 1.5 (très efficace)
-            profile['base_consumption_kwh'] *= (2.0 - efficiency)
+            # (les classes 'A'-'D' du générateur ne sont pas numériques)
+            if isinstance(efficiency, (int, float)):
+                profile['base_consumption_kwh'] *= (2.0 - efficiency)
         
         return profile
     
@@ -445,7 +450,7 @@ class Building:
             Instance Building
         """
         # Import local pour éviter import circulaire
-        from app.models.location import Location
+        from app.models.location import create_location_from_dict
         
         # Créer l'objet location
         location_data = {
@@ -457,7 +462,7 @@ class Building:
             'population': data.get('population', 0),
             'timezone': data.get('timezone', 'Asia/Kuala_Lumpur')
         }
-        location = Location.from_dict(location_data)
+        location = create_location_from_dict(location_data)
         
         # Extraire les caractéristiques
         characteristics = data.get('characteristics', {})
@@ -528,9 +533,9 @@ class Building:
         # Nettoyer les valeurs None
         characteristics = {k: v for k, v in characteristics.items() if v is not None}
         
-        # Générer les IDs
+        # Générer les IDs (préfixe MY_ exigé par _validate_building_data)
         unique_id = str(uuid.uuid4()).replace('-', '')[:16]
-        building_id = f"OSM_{osm_data.get('osm_id', unique_id)}"
+        building_id = f"MY_OSM_{osm_data.get('osm_id', unique_id)}"
         
         return cls(
             unique_id=unique_id,
@@ -556,4 +561,4 @@ class Building:
 
 
 # Export de la classe principale
-__all__ = ['Building']
+__all__ = ['Building', 'ENERGY_PROFILES', 'VALID_BUILDING_TYPES', 'VALID_VALIDATION_STATUSES']
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TABLE DE BÂTIMENTS - GÉNÉRATEUR MALAYSIA
+Fichier: app/models/building_table.py
+
+Représentation en colonnes (struct-of-arrays) d'un ensemble de bâtiments.
+Les règles du modèle Building (validation, profil énergétique, consommation
+de base) y sont appliquées à des colonnes entières, sans créer d'objet
+Building ni Location par ligne.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 3.0 - Modèles structurés
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from .building import Building, ENERGY_PROFILES, VALID_BUILDING_TYPES, VALID_VALIDATION_STATUSES
+from .location import enrich_locations
+
+
+# Colonnes du DataFrame des bâtiments (même ordre que Building.to_dict)
+BUILDING_COLUMNS = [
+    'unique_id', 'building_id', 'latitude', 'longitude', 'location', 'state',
+    'region', 'population', 'timezone', 'building_class', 'cluster_size', 'freq',
+    'dataset', 'location_id', 'osm_source', 'validation_status',
+    'baseline_consumption_kwh', 'characteristics', 'created_at'
+]
+
+# Valeurs par défaut des colonnes absentes (cf. Building.to_dict / from_dict)
+_COLUMN_DEFAULTS = {
+    'latitude': 0.0,
+    'longitude': 0.0,
+    'location': 'Unknown',
+    'state': 'Unknown',
+    'region': 'Unknown',
+    'population': 0,
+    'timezone': 'Asia/Kuala_Lumpur',
+    'building_class': 'residential',
+    'cluster_size': 1,
+    'freq': 'H',
+    'dataset': 'malaysia_electricity_v3',
+    'osm_source': False,
+    'validation_status': 'pending'
+}
+
+# Caractéristiques numériques utilisées par le profil énergétique
+_PROFILE_CHARACTERISTICS = ['floor_area_sqm', 'building_age', 'has_ac', 'energy_efficiency']
+
+# Profils par type, indexés comme VALID_BUILDING_TYPES
+_PROFILE_ARRAYS = {
+    key: np.array([ENERGY_PROFILES[building_type][key] for building_type in VALID_BUILDING_TYPES])
+    for key in ('base_consumption_kwh', 'seasonal_variation', 'ac_dependency')
+}
+
+
+class BuildingTable:
+    """
+    Ensemble de bâtiments stocké en colonnes NumPy.
+    
+    Équivalent vectorisé d'une liste de Building: chaque attribut est une
+    colonne, le profil énergétique et la consommation de base sont calculés
+    pour toutes les lignes à la fois. La conversion vers et depuis le
+    DataFrame des bâtiments se fait colonne par colonne.
+    """
+    
+    def __init__(self, columns: Dict[str, Any], validate_fields: bool = True):
+        """
+        Initialise la table.
+        
+        Args:
+            columns: Colonnes (arrays, listes ou scalaires diffusés); 'unique_id' requis
+            validate_fields: Lève ValueError si une ligne viole les règles de Building
+        """
+        self.logger = logging.getLogger(__name__)
+        
+        if 'unique_id' not in columns:
+            raise ValueError("La colonne unique_id est requise")
+        
+        size = len(columns['unique_id'])
+        self._columns = {}
+        for name, column in columns.items():
+            if np.ndim(column) == 0 and name != 'characteristics':
+                column = np.full(size, column, dtype=object if isinstance(column, str) else None)
+            column = np.asarray(column) if name != 'characteristics' else _object_array(column, size)
+            if len(column) != size:
+                raise ValueError(f"Colonne {name} de longueur {len(column)} au lieu de {size}")
+            self._columns[name] = column
+        
+        self._fill_defaults(size)
+        
+        if validate_fields:
+            self._validate_fields()
+        
+        self._compute_energy_profiles()
+    
+    def __len__(self) -> int:
+        return len(self._columns['unique_id'])
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+    
+    @property
+    def columns(self) -> List[str]:
+        """Noms des colonnes de la table."""
+        return list(self._columns)
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, validate_fields: bool = True) -> 'BuildingTable':
+        """
+        Crée une table depuis le DataFrame des bâtiments.
+        
+        Args:
+            df: DataFrame au format de Building.to_dict
+            validate_fields: Lève ValueError si une ligne est invalide
+        
+        Returns:
+            BuildingTable
+        """
+        columns = {name: df[name].to_numpy() for name in df.columns}
+        if 'building_class' not in columns and 'building_type' in columns:
+            columns['building_class'] = columns.pop('building_type')
+        return cls(columns, validate_fields=validate_fields)
+    
+    @classmethod
+    def from_osm_records(cls, records: Iterable[Dict[str, Any]], city: Optional[str] = None,
+                         validate_fields: bool = True) -> 'BuildingTable':
+        """
+        Crée une table depuis des bâtiments OSM (équivalent de Building.from_osm_data).
+        
+        Args:
+            records: Dictionnaires OSM (osm_id, latitude, longitude, building_type, ...)
+            city: Nom de la ville (optionnel)
+            validate_fields: Lève ValueError si une ligne est invalide
+        
+        Returns:
+            BuildingTable
+        """
+        osm = pd.DataFrame.from_records(records if isinstance(records, list) else list(records))
+        size = len(osm)
+        
+        def column(name, default=None):
+            return osm[name].to_numpy() if name in osm.columns else np.full(size, default, dtype=object)
+        
+        unique_ids = _random_unique_ids(size)
+        osm_ids = column('osm_id')
+        osm_ids = np.where(pd.isna(osm_ids), unique_ids, osm_ids)
+        area = pd.to_numeric(pd.Series(column('area_sqm')), errors='coerce').to_numpy(dtype=float)
+        latitudes = column('latitude', 0.0).astype(float)
+        longitudes = column('longitude', 0.0).astype(float)
+        
+        # État, région, zone climatique et location_id depuis les coordonnées
+        locations = enrich_locations(latitudes, longitudes)
+        
+        characteristics_frame = pd.DataFrame({
+            'osm_id': column('osm_id'),
+            'osm_type': column('osm_type', 'way'),
+            # Un dictionnaire distinct par ligne (comme osm_data.get('tags', {}) dans Building)
+            'osm_tags': [tags if isinstance(tags, dict) else {} for tags in column('tags').tolist()],
+            'area_sqm': column('area_sqm'),
+            'levels': column('levels'),
+            'height': column('height'),
+            'floor_area_sqm': column('area_sqm')  # Approximation
+        })
+        
+        return cls({
+            'unique_id': unique_ids,
+            'building_id': np.array([f"MY_OSM_{osm_id}" for osm_id in osm_ids.tolist()], dtype=object),
+            'latitude': latitudes,
+            'longitude': longitudes,
+            'location': city if city else column('city', 'Unknown'),
+            'state': locations['state'],
+            'region': locations['region'],
+            'climate_zone': locations['climate_zone'],
+            'location_id': locations['location_id'],
+            'building_class': column('building_type', 'residential'),
+            'osm_source': True,
+            'validation_status': 'pending',
+            'floor_area_sqm': area,
+            'characteristics': _records_without_none(characteristics_frame)
+        }, validate_fields=validate_fields)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Convertit la table au format du DataFrame des bâtiments.
+        
+        Returns:
+            DataFrame avec les colonnes de Building.to_dict
+        """
+        columns = self._columns
+        data = {name: columns[name] for name in BUILDING_COLUMNS if name in columns}
+        
+        if 'location_id' not in columns:
+            data['location_id'] = np.array([f"MY_{uid[:5]}" for uid in columns['unique_id'].tolist()], dtype=object)
+        data['baseline_consumption_kwh'] = columns['baseline_consumption_kwh']
+        
+        return pd.DataFrame({name: data[name] for name in BUILDING_COLUMNS if name in data})
+    
+    def select(self, rows) -> 'BuildingTable':
+        """
+        Retourne une sous-table (masque booléen ou indices).
+        
+        Args:
+            rows: Masque booléen ou indices des lignes
+        
+        Returns:
+            Nouvelle BuildingTable partageant les règles calculées
+        """
+        table = self.__class__.__new__(self.__class__)
+        table.logger = self.logger
+        table._columns = {name: column[rows] for name, column in self._columns.items()}
+        return table
+    
+    def get_building(self, index: int) -> Building:
+        """
+        Matérialise une ligne en instance Building.
+        
+        Args:
+            index: Position de la ligne
+        
+        Returns:
+            Instance Building
+        """
+        row = {name: column[index] for name, column in self._columns.items()}
+        row = {name: (value.item() if isinstance(value, np.generic) else value) for name, value in row.items()}
+        row['characteristics'] = dict(row.get('characteristics') or {})
+        return Building.from_dict(row)
+    
+    def validate(self) -> Dict[str, Any]:
+        """
+        Valide tous les bâtiments (équivalent vectorisé de Building.validate).
+        
+        Met à jour la colonne validation_status.
+        
+        Returns:
+            Scores et statuts par ligne, et résumé par statut
+        """
+        columns = self._columns
+        size = len(self)
+        lat, lon = columns['latitude'].astype(float), columns['longitude'].astype(float)
+        baseline = columns['baseline_consumption_kwh']
+        area = columns['floor_area_sqm']
+        
+        score = np.full(size, 100.0)
+        errors = np.zeros(size, dtype=bool)
+        warnings = np.zeros(size, dtype=bool)
+        
+        # (masque, pénalité, erreur?) dans l'ordre de Building.validate
+        rules = [
+            (~((-90 <= lat) & (lat <= 90) & (-180 <= lon) & (lon <= 180)), 30, True),
+            (~((0.5 <= lat) & (lat <= 7.5) & (99.0 <= lon) & (lon <= 120.0)), 10, False),
+            (baseline <= 0, 20, True),
+            (baseline > 1000, 5, False),
+            (area <= 0, 15, True),
+            (area > 10000, 5, False)
+        ]
+        for mask, penalty, is_error in rules:
+            score -= np.where(mask, penalty, 0)
+            if is_error:
+                errors |= mask
+            else:
+                warnings |= mask
+        
+        field_errors = self._field_error_mask()
+        score[field_errors] = 0.0
+        
+        status = np.where(errors | field_errors, 'invalid', np.where(warnings, 'warning', 'valid')).astype(object)
+        columns['validation_status'] = status
+        
+        statuses, counts = np.unique(status.astype(str), return_counts=True)
+        return {
+            'scores': score,
+            'statuses': status,
+            'summary': dict(zip(statuses.tolist(), counts.tolist())),
+            'average_score': float(score.mean()) if size else 0.0
+        }
+    
+    def _fill_defaults(self, size: int):
+        """Complète les colonnes absentes et extrait les caractéristiques numériques."""
+        columns = self._columns
+        for name, default in _COLUMN_DEFAULTS.items():
+            if name not in columns:
+                columns[name] = np.full(size, default, dtype=object if isinstance(default, str) else None)
+        
+        if 'building_id' not in columns:
+            columns['building_id'] = np.array([f"MY_UNK_{uid[:6]}" for uid in columns['unique_id'].tolist()],
+                                              dtype=object)
+        if 'characteristics' not in columns:
+            columns['characteristics'] = _object_array([{} for _ in range(size)], size)
+        if 'created_at' not in columns:
+            columns['created_at'] = np.full(size, datetime.now().isoformat(), dtype=object)
+        
+        # Colonnes explicites prioritaires, sinon lecture des dictionnaires de caractéristiques
+        characteristics = columns['characteristics']
+        for name in _PROFILE_CHARACTERISTICS:
+            if name in columns:
+                values = columns[name]
+            else:
+                values = [c.get(name) if isinstance(c, dict) else None for c in characteristics]
+            columns[name] = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+    
+    def _field_error_mask(self) -> np.ndarray:
+        """Lignes violant les règles de Building._validate_building_data."""
+        columns = self._columns
+        unique_ids = pd.Series(columns['unique_id'], dtype=object)
+        building_ids = pd.Series(columns['building_id'], dtype=object)
+        
+        return (
+            (unique_ids.str.len() != 16).fillna(True).to_numpy()
+            | ~np.isin(columns['building_class'], VALID_BUILDING_TYPES)
+            | ~building_ids.str.startswith('MY_').fillna(False).to_numpy(dtype=bool)
+            | ~np.isin(columns['validation_status'], VALID_VALIDATION_STATUSES)
+        )
+    
+    def _validate_fields(self):
+        """
+        Applique les règles de Building._validate_building_data à toutes les lignes.
+        
+        Raises:
+            ValueError: Si au moins une ligne est invalide
+        """
+        invalid = np.flatnonzero(self._field_error_mask())
+        if len(invalid):
+            first = int(invalid[0])
+            raise ValueError(f"{len(invalid)} bâtiment(s) invalide(s), premier à la ligne {first}: "
+                             f"unique_id={self._columns['unique_id'][first]!r}, "
+                             f"building_id={self._columns['building_id'][first]!r}, "
+                             f"building_class={self._columns['building_class'][first]!r}")
+    
+    def _compute_energy_profiles(self):
+        """
+        Calcule profils énergétiques et consommations de base pour toutes les lignes.
+        
+        Mêmes règles que Building._customize_energy_profile et
+        Building._calculate_baseline_consumption.
+        """
+        columns = self._columns
+        type_codes = pd.Categorical(columns['building_class'], categories=VALID_BUILDING_TYPES).codes
+        type_codes = np.where(type_codes < 0, 0, type_codes)  # Fallback résidentiel
+        
+        base = _PROFILE_ARRAYS['base_consumption_kwh'][type_codes]
+        seasonal = _PROFILE_ARRAYS['seasonal_variation'][type_codes]
+        ac_dependency = _PROFILE_ARRAYS['ac_dependency'][type_codes]
+        
+        area, age = columns['floor_area_sqm'], columns['building_age']
+        base = base * np.select([area > 1000, area < 100], [1.5, 0.7], 1.0)
+        base = base * np.select([age > 20, age < 5], [1.2, 0.9], 1.0)
+        
+        without_ac = columns['has_ac'] == 0
+        ac_dependency = np.where(without_ac, 0.1, ac_dependency)
+        seasonal = np.where(without_ac, seasonal * 0.5, seasonal)
+        
+        efficiency = columns['energy_efficiency']
+        base = base * np.where(np.isnan(efficiency), 1.0, 2.0 - efficiency)
+        
+        columns['base_consumption_kwh'] = base
+        columns['seasonal_variation'] = seasonal
+        columns['ac_dependency'] = ac_dependency
+        
+        # Ajustements selon la localisation
+        population = pd.to_numeric(pd.Series(columns['population']), errors='coerce').fillna(0).to_numpy()
+        baseline = base * np.select([population > 1000000, (population > 0) & (population < 100000)], [1.1, 0.95], 1.0)
+        
+        if 'climate_zone' in columns:
+            climate_zone = columns['climate_zone']
+            baseline = baseline * np.select([climate_zone == 'tropical_hot', climate_zone == 'tropical_moderate'],
+                                            [1.15, 1.05], 1.0)
+        
+        columns['baseline_consumption_kwh'] = np.round(baseline, 2)
+
+
+# Fonctions utilitaires
+
+def _object_array(values, size: int) -> np.ndarray:
+    """Crée un array d'objets sans que NumPy ne déplie les dictionnaires ou listes."""
+    array = np.empty(size, dtype=object)
+    array[:] = list(values) if not isinstance(values, np.ndarray) else values
+    return array
+
+
+def _random_unique_ids(size: int) -> np.ndarray:
+    """Identifiants aléatoires de 16 caractères hexadécimaux (comme uuid4().hex[:16])."""
+    values = np.frombuffer(os.urandom(8 * size), dtype=np.uint64)
+    return np.array([f'{value:016x}' for value in values.tolist()], dtype=object)
+
+
+def _records_without_none(frame: pd.DataFrame) -> np.ndarray:
+    """Convertit un DataFrame en dictionnaires par ligne en omettant les valeurs manquantes."""
+    names = list(frame.columns)
+    records = [
+        {name: value for name, value in zip(names, row) if value is not None and not _is_nan(value)}
+        for row in zip(*(frame[name].tolist() for name in names))
+    ]
+    return _object_array(records, len(records))
+
+
+def _is_nan(value) -> bool:
+    """Indique si une valeur scalaire est NaN."""
+    return isinstance(value, float) and value != value
+
+
+# Export des classes et fonctions
+__all__ = ['BuildingTable', 'BUILDING_COLUMNS']
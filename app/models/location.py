@@ -12,10 +12,48 @@ Date: 2025
 Version: 3.0 - Modèles structurés
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 import math
+import numpy as np
+
+
+# Rayon de la Terre (km) pour la formule de Haversine
+EARTH_RADIUS_KM = 6371
+
+# Mapping approximatif des états malaysiens par coordonnées (premier rectangle qui contient le point)
+STATE_BOUNDING_BOXES = {
+    'Johor': {'lat_range': (1.2, 2.8), 'lon_range': (102.5, 104.8), 'code': 'JHR'},
+    'Kedah': {'lat_range': (5.0, 6.8), 'lon_range': (99.6, 101.0), 'code': 'KDH'},
+    'Kelantan': {'lat_range': (4.5, 6.3), 'lon_range': (101.8, 102.8), 'code': 'KTN'},
+    'Malacca': {'lat_range': (2.0, 2.5), 'lon_range': (102.0, 102.6), 'code': 'MLK'},
+    'Negeri Sembilan': {'lat_range': (2.4, 3.2), 'lon_range': (101.8, 102.8), 'code': 'NSN'},
+    'Pahang': {'lat_range': (2.8, 4.8), 'lon_range': (101.8, 104.0), 'code': 'PHG'},
+    'Penang': {'lat_range': (5.2, 5.6), 'lon_range': (100.1, 100.6), 'code': 'PNG'},
+    'Perak': {'lat_range': (3.8, 5.8), 'lon_range': (100.5, 101.8), 'code': 'PRK'},
+    'Perlis': {'lat_range': (6.3, 6.8), 'lon_range': (100.0, 100.6), 'code': 'PLS'},
+    'Selangor': {'lat_range': (2.8, 3.8), 'lon_range': (101.0, 102.0), 'code': 'SGR'},
+    'Terengganu': {'lat_range': (4.0, 6.0), 'lon_range': (102.8, 103.8), 'code': 'TRG'},
+    'Federal Territory': {'lat_range': (3.0, 3.3), 'lon_range': (101.5, 101.8), 'code': 'WP'},
+    'Sabah': {'lat_range': (4.0, 7.5), 'lon_range': (115.0, 119.5), 'code': 'SBH'},
+    'Sarawak': {'lat_range': (0.8, 5.0), 'lon_range': (109.5, 115.5), 'code': 'SWK'}
+}
+
+# Points côtiers de référence pour la Malaysia
+COASTAL_REFERENCE_POINTS = [
+    (5.414, 100.333),  # Penang
+    (3.139, 101.687),  # Port Klang
+    (1.465, 103.747),  # Johor Bahru
+    (2.189, 102.250),  # Malacca
+    (5.979, 116.075),  # Kota Kinabalu
+    (1.553, 110.359),  # Kuching
+]
+
+# Constantes du hachage stable des coordonnées (finaliseur splitmix64)
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+_LOCATION_HASH_MULTIPLIERS = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB)
+_LOCATION_ID_MODULO = 100000
 
 
 @dataclass
@@ -93,33 +131,14 @@ class Location:
     
     def _generate_location_id(self):
         """Génère un identifiant unique pour la localisation."""
-        # Format: MY_<hash_des_coordonnées>
-        coord_hash = abs(hash(f"{self.latitude:.4f},{self.longitude:.4f}")) % 100000
-        self.location_id = f"MY_{coord_hash:05d}"
+        # Format: MY_<hash_des_coordonnées> (stable d'un processus à l'autre)
+        self.location_id = f"MY_{_location_hash(self.latitude, self.longitude):05d}"
     
     def _determine_state_code(self):
         """Détermine le code de l'état malaysien selon les coordonnées."""
         
-        # Mapping approximatif des états malaysiens par coordonnées
-        state_mappings = {
-            'Johor': {'lat_range': (1.2, 2.8), 'lon_range': (102.5, 104.8), 'code': 'JHR'},
-            'Kedah': {'lat_range': (5.0, 6.8), 'lon_range': (99.6, 101.0), 'code': 'KDH'},
-            'Kelantan': {'lat_range': (4.5, 6.3), 'lon_range': (101.8, 102.8), 'code': 'KTN'},
-            'Malacca': {'lat_range': (2.0, 2.5), 'lon_range': (102.0, 102.6), 'code': 'MLK'},
-            'Negeri Sembilan': {'lat_range': (2.4, 3.2), 'lon_range': (101.8, 102.8), 'code': 'NSN'},
-            'Pahang': {'lat_range': (2.8, 4.8), 'lon_range': (101.8, 104.0), 'code': 'PHG'},
-            'Penang': {'lat_range': (5.2, 5.6), 'lon_range': (100.1, 100.6), 'code': 'PNG'},
-            'Perak': {'lat_range': (3.8, 5.8), 'lon_range': (100.5, 101.8), 'code': 'PRK'},
-            'Perlis': {'lat_range': (6.3, 6.8), 'lon_range': (100.0, 100.6), 'code': 'PLS'},
-            'Selangor': {'lat_range': (2.8, 3.8), 'lon_range': (101.0, 102.0), 'code': 'SGR'},
-            'Terengganu': {'lat_range': (4.0, 6.0), 'lon_range': (102.8, 103.8), 'code': 'TRG'},
-            'Federal Territory': {'lat_range': (3.0, 3.3), 'lon_range': (101.5, 101.8), 'code': 'WP'},
-            'Sabah': {'lat_range': (4.0, 7.5), 'lon_range': (115.0, 119.5), 'code': 'SBH'},
-            'Sarawak': {'lat_range': (0.8, 5.0), 'lon_range': (109.5, 115.5), 'code': 'SWK'}
-        }
-        
         # Déterminer l'état selon les coordonnées
-        for state_name, info in state_mappings.items():
+        for state_name, info in STATE_BOUNDING_BOXES.items():
             lat_min, lat_max = info['lat_range']
             lon_min, lon_max = info['lon_range']
             
@@ -179,19 +198,9 @@ class Location:
         Returns:
             Distance en kilomètres
         """
-        # Points côtiers de référence pour la Malaysia
-        coastal_points = [
-            (5.414, 100.333),  # Penang
-            (3.139, 101.687),  # Port Klang
-            (1.465, 103.747),  # Johor Bahru
-            (2.189, 102.250),  # Malacca
-            (5.979, 116.075),  # Kota Kinabalu
-            (1.553, 110.359),  # Kuching
-        ]
-        
         min_distance = float('inf')
         
-        for coastal_lat, coastal_lon in coastal_points:
+        for coastal_lat, coastal_lon in COASTAL_REFERENCE_POINTS:
             distance = self.calculate_distance_to(coastal_lat, coastal_lon)
             min_distance = min(min_distance, distance)
         
@@ -209,7 +218,7 @@ class Location:
             Distance en kilomètres
         """
         # Formule de Haversine
-        R = 6371  # Rayon de la Terre en km
+        R = EARTH_RADIUS_KM
         
         lat1_rad = math.radians(self.latitude)
         lon1_rad = math.radians(self.longitude)
@@ -393,18 +402,165 @@ def create_location_from_dict(location_data: Dict) -> Location:
         if field not in location_data:
             raise ValueError(f"Champ obligatoire manquant: {field}")
     
-    # Créer l'instance avec tous les champs disponibles
+    # Créer l'instance avec les champs acceptés par le constructeur
+    # (les champs calculés comme state_code ou location_id sont ignorés)
+    init_fields = {f.name for f in fields(Location) if f.init}
     location_kwargs = {}
     for key, value in location_data.items():
-        if hasattr(Location, key):
+        if key in init_fields:
             location_kwargs[key] = value
     
     return Location(**location_kwargs)
 
 
+def enrich_locations(latitudes, longitudes, altitudes=None, states=None,
+                     regions=None, climate_zones=None) -> Dict[str, np.ndarray]:
+    """
+    Enrichit des tableaux de coordonnées en une seule passe vectorisée.
+    
+    Applique les règles de Location.__post_init__ (code d'état, zone
+    climatique, région, identifiant) à toutes les coordonnées à la fois.
+    Les valeurs fournies (états, régions, zones climatiques) sont conservées
+    comme dans Location, seules les valeurs par défaut étant déterminées.
+    
+    Args:
+        latitudes: Latitudes (degrés décimaux)
+        longitudes: Longitudes (degrés décimaux)
+        altitudes: Altitudes en mètres (optionnel, NaN = inconnue)
+        states: États connus (optionnel, 'Unknown' = à déterminer)
+        regions: Régions connues (optionnel, 'Unknown' = à déterminer)
+        climate_zones: Zones climatiques connues (optionnel, 'tropical' = à déterminer)
+        
+    Returns:
+        Dictionnaire d'arrays: 'state', 'state_code', 'climate_zone', 'region',
+        'coastal_distance_km', 'location_id'
+    
+    Raises:
+        ValueError: Si des coordonnées sont hors des bornes géographiques
+    """
+    lat = np.asarray(latitudes, dtype=float)
+    lon = np.asarray(longitudes, dtype=float)
+    n = len(lat)
+    
+    if not ((-90 <= lat) & (lat <= 90)).all():
+        raise ValueError("Latitude invalide: doit être entre -90 et 90.")
+    if not ((-180 <= lon) & (lon <= 180)).all():
+        raise ValueError("Longitude invalide: doit être entre -180 et 180.")
+    
+    states = np.full(n, 'Unknown', dtype=object) if states is None else np.array(states, dtype=object)
+    regions = np.full(n, 'Unknown', dtype=object) if regions is None else np.array(regions, dtype=object)
+    climate_zones = (np.full(n, 'tropical', dtype=object) if climate_zones is None
+                     else np.array(climate_zones, dtype=object))
+    altitudes = np.full(n, np.nan) if altitudes is None else np.asarray(altitudes, dtype=float)
+    
+    # États: premier rectangle contenant le point (même ordre que STATE_BOUNDING_BOXES)
+    boxes = list(STATE_BOUNDING_BOXES.items())
+    lat_bounds = np.array([info['lat_range'] for _, info in boxes])
+    lon_bounds = np.array([info['lon_range'] for _, info in boxes])
+    inside = ((lat[:, None] >= lat_bounds[:, 0]) & (lat[:, None] <= lat_bounds[:, 1]) &
+              (lon[:, None] >= lon_bounds[:, 0]) & (lon[:, None] <= lon_bounds[:, 1]))
+    found = inside.any(axis=1)
+    box_index = inside.argmax(axis=1)
+    
+    state_names = np.array([name for name, _ in boxes], dtype=object)
+    state_codes = np.where(found, np.array([info['code'] for _, info in boxes], dtype=object)[box_index], 'UNK')
+    states = np.where(found & (states == 'Unknown'), state_names[box_index], states)
+    
+    # Zones climatiques
+    coastal_distance = coastal_distances(lat, lon)
+    default_zone = climate_zones == 'tropical'
+    zones = np.select(
+        [coastal_distance < 50, altitudes > 500],
+        [np.where(lat > 5.0, 'tropical_coastal_north', 'tropical_coastal_south'), 'tropical_highland'],
+        'tropical_inland'
+    ).astype(object)
+    climate_zones = np.where(default_zone, zones, climate_zones)
+    
+    # Régions
+    derived_regions = np.select(
+        [(lon < 109) & (lat > 5.0), (lon < 109) & (lat > 3.5), lon < 109, (lon > 109) & (lat > 4.0), lon > 109],
+        ['Northern Peninsula', 'Central Peninsula', 'Southern Peninsula', 'Sabah', 'Sarawak'],
+        'Unknown'
+    ).astype(object)
+    regions = np.where(regions == 'Unknown', derived_regions, regions)
+    
+    location_hashes = location_hashes_from_coordinates(lat, lon)
+    
+    return {
+        'state': states,
+        'state_code': state_codes.astype(object),
+        'climate_zone': climate_zones,
+        'region': regions,
+        'coastal_distance_km': coastal_distance,
+        'location_id': np.array([f"MY_{value:05d}" for value in location_hashes.tolist()], dtype=object)
+    }
+
+
+def coastal_distances(latitudes, longitudes) -> np.ndarray:
+    """
+    Distance (km) au point côtier de référence le plus proche, vectorisée.
+    
+    Args:
+        latitudes: Latitudes (degrés décimaux)
+        longitudes: Longitudes (degrés décimaux)
+        
+    Returns:
+        Distances en kilomètres
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))[:, None]
+    lon = np.radians(np.asarray(longitudes, dtype=float))[:, None]
+    points = np.radians(np.array(COASTAL_REFERENCE_POINTS))
+    
+    dlat = points[:, 0] - lat
+    dlon = points[:, 1] - lon
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(points[:, 0]) * np.sin(dlon / 2) ** 2
+    distances = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return distances.min(axis=1)
+
+
+def location_hashes_from_coordinates(latitudes, longitudes) -> np.ndarray:
+    """
+    Hachage stable (0-99999) des coordonnées arrondies à 4 décimales.
+    
+    Contrairement à hash(), le résultat ne dépend pas du processus: une même
+    coordonnée donne toujours le même location_id. Équivalent vectorisé de
+    _location_hash.
+    
+    Args:
+        latitudes: Latitudes (degrés décimaux)
+        longitudes: Longitudes (degrés décimaux)
+        
+    Returns:
+        Hachages entiers (int64)
+    """
+    lat_q = np.round(np.asarray(latitudes, dtype=float) * 10000).astype(np.int64) + 900000
+    lon_q = np.round(np.asarray(longitudes, dtype=float) * 10000).astype(np.int64) + 1800000
+    
+    with np.errstate(over='ignore'):
+        z = (lat_q * 3600001 + lon_q).astype(np.uint64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(_LOCATION_HASH_MULTIPLIERS[0])
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(_LOCATION_HASH_MULTIPLIERS[1])
+        z = z ^ (z >> np.uint64(31))
+    
+    return (z % np.uint64(_LOCATION_ID_MODULO)).astype(np.int64)
+
+
+def _location_hash(latitude: float, longitude: float) -> int:
+    """Version scalaire de location_hashes_from_coordinates."""
+    z = (round(latitude * 10000) + 900000) * 3600001 + round(longitude * 10000) + 1800000
+    z = ((z ^ (z >> 30)) * _LOCATION_HASH_MULTIPLIERS[0]) & _UINT64_MASK
+    z = ((z ^ (z >> 27)) * _LOCATION_HASH_MULTIPLIERS[1]) & _UINT64_MASK
+    z = z ^ (z >> 31)
+    return z % _LOCATION_ID_MODULO
+
+
 # Export des classes et fonctions
 __all__ = [
     'Location',
     'create_location_from_coordinates',
-    'create_location_from_dict'
+    'create_location_from_dict',
+    'enrich_locations',
+    'coastal_distances',
+    'location_hashes_from_coordinates'
 ]
\ No newline at end of file
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+STOCKAGE COLONNAIRE DES BÂTIMENTS OSM - GÉNÉRATEUR MALAYSIA
+Fichier: app/models/osm_building_store.py
+
+Représentation compacte des bâtiments récupérés depuis Overpass. Au lieu
+d'un dictionnaire par bâtiment (tags, liste de coordonnées {'lat','lon'}),
+chaque attribut est une colonne NumPy:
+- identifiants OSM en int64, centroïdes, surface, étages et hauteur en float64
+- type OSM et type de bâtiment encodés par dictionnaire (catégories)
+- géométries en coordonnées plates + offsets (format "liste" d'Arrow)
+- tags en table creuse: offsets par bâtiment, codes de clés et de valeurs
+
+Les conversions vers/depuis Arrow et DataFrame réutilisent les buffers
+NumPy sans copie.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 4.0 - Ultra-optimisé pour récupération complète
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+
+# Types OSM et géométrie associée dans les enregistrements du parseur
+OSM_TYPES = ('way', 'relation')
+GEOMETRY_TYPES = {'way': 'polygon', 'relation': 'multipolygon'}
+
+# Tags recopiés en champs de premier niveau par le parseur Overpass
+TAG_FIELDS = {
+    'name': 'name',
+    'addr_street': 'addr:street',
+    'addr_housenumber': 'addr:housenumber',
+    'addr_postcode': 'addr:postcode',
+    'addr_city': 'addr:city'
+}
+
+# Colonnes numériques (NaN = valeur absente)
+_FLOAT_COLUMNS = ('latitude', 'longitude', 'area_sqm', 'levels', 'height')
+
+
+class OSMBuildingStore:
+    """
+    Ensemble de bâtiments OSM stocké en colonnes.
+    
+    Attributs publics (arrays NumPy de longueur len(store) sauf mention):
+        osm_id: Identifiants OSM (int64)
+        osm_type_codes / osm_types: Codes (int8) et catégories du type OSM
+        building_type_codes / building_types: Codes (int16) et catégories du type de bâtiment
+        latitude, longitude, area_sqm, levels, height: float64 (NaN si absent)
+        coord_offsets: Offsets (int64, len + 1) dans coord_lat / coord_lon
+        tag_offsets: Offsets (int64, len + 1) dans tag_keys / tag_values
+        tag_keys / tag_values: Codes (int32) dans tag_key_dictionary / tag_value_dictionary
+    """
+    
+    def __init__(self, osm_id: np.ndarray, osm_type_codes: np.ndarray, osm_types: Sequence[str],
+                 building_type_codes: np.ndarray, building_types: Sequence[str],
+                 floats: Dict[str, np.ndarray],
+                 coord_offsets: np.ndarray, coord_lat: np.ndarray, coord_lon: np.ndarray,
+                 tag_offsets: np.ndarray, tag_keys: np.ndarray, tag_values: np.ndarray,
+                 tag_key_dictionary: Sequence[str], tag_value_dictionary: Sequence[str]):
+        """
+        Initialise le stockage depuis ses colonnes (sans copie).
+        
+        Utiliser plutôt from_records, from_arrow, from_dataframe ou empty.
+        """
+        self.logger = logging.getLogger(__name__)
+        
+        self.osm_id = np.asarray(osm_id, dtype=np.int64)
+        self.osm_type_codes = np.asarray(osm_type_codes, dtype=np.int8)
+        self.osm_types = _object_array(osm_types)
+        self.building_type_codes = np.asarray(building_type_codes, dtype=np.int16)
+        self.building_types = _object_array(building_types)
+        
+        for name in _FLOAT_COLUMNS:
+            setattr(self, name, np.asarray(floats[name], dtype=np.float64))
+        
+        self.coord_offsets = np.asarray(coord_offsets, dtype=np.int64)
+        self.coord_lat = np.asarray(coord_lat, dtype=np.float64)
+        self.coord_lon = np.asarray(coord_lon, dtype=np.float64)
+        
+        self.tag_offsets = np.asarray(tag_offsets, dtype=np.int64)
+        self.tag_keys = np.asarray(tag_keys, dtype=np.int32)
+        self.tag_values = np.asarray(tag_values, dtype=np.int32)
+        self.tag_key_dictionary = _object_array(tag_key_dictionary)
+        self.tag_value_dictionary = _object_array(tag_value_dictionary)
+        
+        size = len(self.osm_id)
+        if len(self.coord_offsets) != size + 1 or len(self.tag_offsets) != size + 1:
+            raise ValueError(f"Offsets incohérents pour {size} bâtiments")
+    
+    def __len__(self) -> int:
+        return len(self.osm_id)
+    
+    # Constructeurs
+    
+    @classmethod
+    def empty(cls) -> 'OSMBuildingStore':
+        """Retourne un stockage vide."""
+        return cls.from_records([])
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'OSMBuildingStore':
+        """
+        Crée le stockage depuis les dictionnaires produits par le parseur Overpass.
+        
+        Args:
+            records: Bâtiments au format de OSMService._parse_way_to_building
+        
+        Returns:
+            OSMBuildingStore
+        """
+        osm_ids, osm_type_codes, building_type_codes = [], [], []
+        floats = {name: [] for name in _FLOAT_COLUMNS}
+        coord_counts, coord_lat, coord_lon = [], [], []
+        tag_counts, tag_keys, tag_values = [], [], []
+        
+        osm_types = {name: code for code, name in enumerate(OSM_TYPES)}
+        building_types, key_codes, value_codes = {}, {}, {}
+        
+        for record in records:
+            osm_type, _, osm_id = str(record['osm_id']).partition('/')
+            osm_type = record.get('osm_type') or osm_type
+            osm_ids.append(int(osm_id))
+            osm_type_codes.append(osm_types.setdefault(osm_type, len(osm_types)))
+            
+            building_type = record.get('building_type') or 'residential'
+            building_type_codes.append(building_types.setdefault(building_type, len(building_types)))
+            
+            for name in _FLOAT_COLUMNS:
+                value = record.get(name)
+                floats[name].append(np.nan if value is None else value)
+            
+            coords = record.get('coordinates') or ()
+            coord_counts.append(len(coords))
+            for coord in coords:
+                coord_lat.append(coord['lat'])
+                coord_lon.append(coord['lon'])
+            
+            tags = record.get('tags') or {}
+            tag_counts.append(len(tags))
+            for key, value in tags.items():
+                tag_keys.append(key_codes.setdefault(key, len(key_codes)))
+                tag_values.append(value_codes.setdefault(value, len(value_codes)))
+        
+        return cls(
+            osm_id=np.array(osm_ids, dtype=np.int64),
+            osm_type_codes=np.array(osm_type_codes, dtype=np.int8),
+            osm_types=list(osm_types),
+            building_type_codes=np.array(building_type_codes, dtype=np.int16),
+            building_types=list(building_types),
+            floats={name: np.array(values, dtype=np.float64) for name, values in floats.items()},
+            coord_offsets=_offsets_from_counts(coord_counts),
+            coord_lat=np.array(coord_lat, dtype=np.float64),
+            coord_lon=np.array(coord_lon, dtype=np.float64),
+            tag_offsets=_offsets_from_counts(tag_counts),
+            tag_keys=np.array(tag_keys, dtype=np.int32),
+            tag_values=np.array(tag_values, dtype=np.int32),
+            tag_key_dictionary=list(key_codes),
+            tag_value_dictionary=list(value_codes)
+        )
+    
+    @classmethod
+    def concat(cls, stores: Iterable['OSMBuildingStore']) -> 'OSMBuildingStore':
+        """
+        Concatène plusieurs stockages (fusion des dictionnaires).
+        
+        Args:
+            stores: Stockages à concaténer, dans l'ordre
+        
+        Returns:
+            OSMBuildingStore
+        """
+        stores = [store for store in stores if store is not None]
+        if not stores:
+            return cls.empty()
+        if len(stores) == 1:
+            return stores[0]
+        
+        osm_types, building_types, key_codes, value_codes = {}, {}, {}, {}
+        osm_type_codes, building_type_codes, tag_keys, tag_values = [], [], [], []
+        
+        for store in stores:
+            osm_type_codes.append(_remap_codes(store.osm_type_codes, store.osm_types, osm_types))
+            building_type_codes.append(_remap_codes(store.building_type_codes, store.building_types, building_types))
+            tag_keys.append(_remap_codes(store.tag_keys, store.tag_key_dictionary, key_codes))
+            tag_values.append(_remap_codes(store.tag_values, store.tag_value_dictionary, value_codes))
+        
+        return cls(
+            osm_id=np.concatenate([store.osm_id for store in stores]),
+            osm_type_codes=np.concatenate(osm_type_codes),
+            osm_types=list(osm_types),
+            building_type_codes=np.concatenate(building_type_codes),
+            building_types=list(building_types),
+            floats={name: np.concatenate([getattr(store, name) for store in stores]) for name in _FLOAT_COLUMNS},
+            coord_offsets=_concat_offsets([store.coord_offsets for store in stores]),
+            coord_lat=np.concatenate([store.coord_lat for store in stores]),
+            coord_lon=np.concatenate([store.coord_lon for store in stores]),
+            tag_offsets=_concat_offsets([store.tag_offsets for store in stores]),
+            tag_keys=np.concatenate(tag_keys),
+            tag_values=np.concatenate(tag_values),
+            tag_key_dictionary=list(key_codes),
+            tag_value_dictionary=list(value_codes)
+        )
+    
+    # Accès aux colonnes
+    
+    @property
+    def geometry_sizes(self) -> np.ndarray:
+        """Nombre de sommets de chaque géométrie."""
+        return np.diff(self.coord_offsets)
+    
+    @property
+    def nbytes(self) -> int:
+        """Taille mémoire des colonnes (hors dictionnaires)."""
+        arrays = [
+            self.osm_id, self.osm_type_codes, self.building_type_codes,
+            self.coord_offsets, self.coord_lat, self.coord_lon,
+            self.tag_offsets, self.tag_keys, self.tag_values
+        ]
+        arrays.extend(getattr(self, name) for name in _FLOAT_COLUMNS)
+        return sum(array.nbytes for array in arrays)
+    
+    def osm_type_labels(self) -> np.ndarray:
+        """Type OSM de chaque bâtiment (array d'objets)."""
+        return self.osm_types[self.osm_type_codes]
+    
+    def building_type_labels(self) -> np.ndarray:
+        """Type de bâtiment de chaque ligne (array d'objets)."""
+        return self.building_types[self.building_type_codes]
+    
+    def building_type_counts(self) -> Dict[str, int]:
+        """Nombre de bâtiments par type."""
+        counts = np.bincount(self.building_type_codes, minlength=len(self.building_types))
+        return {str(label): int(count) for label, count in zip(self.building_types, counts) if count}
+    
+    def tag_column(self, key: str) -> np.ndarray:
+        """
+        Extrait la valeur d'un tag pour tous les bâtiments.
+        
+        Args:
+            key: Clé du tag (ex: 'addr:city')
+        
+        Returns:
+            Array d'objets (None si le tag est absent)
+        """
+        column = np.full(len(self), None, dtype=object)
+        
+        key_code = np.flatnonzero(self.tag_key_dictionary == key)
+        if len(key_code) == 0:
+            return column
+        
+        positions = np.flatnonzero(self.tag_keys == key_code[0])
+        rows = np.searchsorted(self.tag_offsets, positions, side='right') - 1
+        column[rows] = self.tag_value_dictionary[self.tag_values[positions]]
+        return column
+    
+    def coordinates(self, index: int) -> List[Dict[str, float]]:
+        """Géométrie d'un bâtiment au format [{'lat', 'lon'}, ...]."""
+        start, end = self.coord_offsets[index], self.coord_offsets[index + 1]
+        return [
+            {'lat': lat, 'lon': lon}
+            for lat, lon in zip(self.coord_lat[start:end].tolist(), self.coord_lon[start:end].tolist())
+        ]
+    
+    def tags(self, index: int) -> Dict[str, str]:
+        """Tags d'un bâtiment."""
+        start, end = self.tag_offsets[index], self.tag_offsets[index + 1]
+        return dict(zip(
+            self.tag_key_dictionary[self.tag_keys[start:end]].tolist(),
+            self.tag_value_dictionary[self.tag_values[start:end]].tolist()
+        ))
+    
+    # Sélection
+    
+    def select(self, rows) -> 'OSMBuildingStore':
+        """
+        Retourne un sous-ensemble des bâtiments.
+        
+        Args:
+            rows: Slice, masque booléen ou indices
+        
+        Returns:
+            OSMBuildingStore (dictionnaires partagés)
+        """
+        rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        rows = rows.astype(np.int64, copy=False)  # Une liste vide donne un array float
+        
+        coord_offsets, coord_index = _take_ragged(self.coord_offsets, rows)
+        tag_offsets, tag_index = _take_ragged(self.tag_offsets, rows)
+        
+        return OSMBuildingStore(
+            osm_id=self.osm_id[rows],
+            osm_type_codes=self.osm_type_codes[rows],
+            osm_types=self.osm_types,
+            building_type_codes=self.building_type_codes[rows],
+            building_types=self.building_types,
+            floats={name: getattr(self, name)[rows] for name in _FLOAT_COLUMNS},
+            coord_offsets=coord_offsets,
+            coord_lat=self.coord_lat[coord_index],
+            coord_lon=self.coord_lon[coord_index],
+            tag_offsets=tag_offsets,
+            tag_keys=self.tag_keys[tag_index],
+            tag_values=self.tag_values[tag_index],
+            tag_key_dictionary=self.tag_key_dictionary,
+            tag_value_dictionary=self.tag_value_dictionary
+        )
+    
+    def deduplicate(self) -> 'OSMBuildingStore':
+        """Supprime les doublons (type, id) en gardant la première occurrence."""
+        keys = self.osm_id * max(len(self.osm_types), 1) + self.osm_type_codes
+        _, first = np.unique(keys, return_index=True)
+        
+        removed_count = len(self) - len(first)
+        if removed_count == 0:
+            return self
+        
+        self.logger.info(f"🔄 Déduplication: {removed_count} doublons supprimés")
+        first.sort()
+        return self.select(first)
+    
+    # Conversions
+    
+    def to_records(self, include_geometry: bool = True) -> List[Dict[str, Any]]:
+        """
+        Reconstruit les dictionnaires du parseur Overpass.
+        
+        Args:
+            include_geometry: Inclure la liste 'coordinates' des ways
+        
+        Returns:
+            Liste de bâtiments (mêmes clés que OSMService._parse_way_to_building)
+        """
+        osm_types = self.osm_type_labels().tolist()
+        building_types = self.building_type_labels().tolist()
+        floats = {name: getattr(self, name).tolist() for name in _FLOAT_COLUMNS}
+        
+        records = []
+        for index, (osm_type, osm_id) in enumerate(zip(osm_types, self.osm_id.tolist())):
+            tags = self.tags(index)
+            levels = floats['levels'][index]
+            
+            record = {
+                'osm_id': f"{osm_type}/{osm_id}",
+                'osm_type': osm_type,
+                'latitude': floats['latitude'][index],
+                'longitude': floats['longitude'][index],
+                'building_type': building_types[index],
+                'area_sqm': _none_if_nan(floats['area_sqm'][index]),
+                'levels': None if levels != levels else int(levels),
+                'height': _none_if_nan(floats['height'][index])
+            }
+            for field, key in TAG_FIELDS.items():
+                record[field] = tags.get(key)
+            record['tags'] = tags
+            record['geometry_type'] = GEOMETRY_TYPES.get(osm_type, 'polygon')
+            
+            if include_geometry and self.coord_offsets[index + 1] > self.coord_offsets[index]:
+                record['coordinates'] = self.coordinates(index)
+            
+            records.append(record)
+        
+        return records
+    
+    def to_arrow(self) -> 'pa.Table':
+        """
+        Convertit en table Arrow sans copier les colonnes.
+        
+        Les types sont encodés en dictionnaire, la géométrie en
+        large_list<struct<lat, lon>> et les tags en large_list<struct<key, value>>
+        dont clés et valeurs sont elles-mêmes encodées en dictionnaire.
+        
+        Returns:
+            pyarrow.Table
+        """
+        import pyarrow as pa
+        
+        columns = {
+            'osm_id': pa.array(self.osm_id),
+            'osm_type': pa.DictionaryArray.from_arrays(pa.array(self.osm_type_codes), pa.array(self.osm_types, pa.string())),
+            'building_type': pa.DictionaryArray.from_arrays(
+                pa.array(self.building_type_codes), pa.array(self.building_types, pa.string())
+            )
+        }
+        for name in _FLOAT_COLUMNS:
+            columns[name] = pa.array(getattr(self, name))
+        
+        columns['geometry'] = pa.LargeListArray.from_arrays(
+            pa.array(self.coord_offsets),
+            pa.StructArray.from_arrays([pa.array(self.coord_lat), pa.array(self.coord_lon)], names=['lat', 'lon'])
+        )
+        columns['tags'] = pa.LargeListArray.from_arrays(
+            pa.array(self.tag_offsets),
+            pa.StructArray.from_arrays([
+                pa.DictionaryArray.from_arrays(pa.array(self.tag_keys), pa.array(self.tag_key_dictionary, pa.string())),
+                pa.DictionaryArray.from_arrays(pa.array(self.tag_values), pa.array(self.tag_value_dictionary, pa.string()))
+            ], names=['key', 'value'])
+        )
+        
+        return pa.table(columns)
+    
+    @classmethod
+    def from_arrow(cls, table: 'pa.Table') -> 'OSMBuildingStore':
+        """
+        Crée le stockage depuis une table produite par to_arrow.
+        
+        Les colonnes d'un seul chunk sans valeurs nulles sont reprises sans
+        copie; les colonnes de type texte non encodées sont encodées en dictionnaire.
+        
+        Args:
+            table: pyarrow.Table
+        
+        Returns:
+            OSMBuildingStore
+        """
+        osm_type_codes, osm_types = _dictionary_column(_single_chunk(table.column('osm_type')))
+        building_type_codes, building_types = _dictionary_column(_single_chunk(table.column('building_type')))
+        
+        coord_offsets, (coord_lat, coord_lon) = _list_column(_single_chunk(table.column('geometry')))
+        tag_offsets, (keys, values) = _list_column(_single_chunk(table.column('tags')), convert=False)
+        tag_keys, tag_key_dictionary = _dictionary_column(keys)
+        tag_values, tag_value_dictionary = _dictionary_column(values)
+        
+        return cls(
+            osm_id=_numpy_column(_single_chunk(table.column('osm_id'))),
+            osm_type_codes=osm_type_codes,
+            osm_types=osm_types,
+            building_type_codes=building_type_codes,
+            building_types=building_types,
+            floats={name: _numpy_column(_single_chunk(table.column(name))) for name in _FLOAT_COLUMNS},
+            coord_offsets=coord_offsets,
+            coord_lat=coord_lat,
+            coord_lon=coord_lon,
+            tag_offsets=tag_offsets,
+            tag_keys=tag_keys,
+            tag_values=tag_values,
+            tag_key_dictionary=tag_key_dictionary,
+            tag_value_dictionary=tag_value_dictionary
+        )
+    
+    def to_dataframe(self) -> 'pd.DataFrame':
+        """
+        Convertit en DataFrame sans copier les colonnes.
+        
+        Colonnes numériques NumPy, types en Categorical, géométrie et tags en
+        colonnes Arrow (pd.ArrowDtype) partageant les buffers du stockage.
+        
+        Returns:
+            DataFrame (une ligne par bâtiment)
+        """
+        import pandas as pd
+        
+        table = self.to_arrow()
+        columns = {
+            'osm_id': self.osm_id,
+            'osm_type': pd.Categorical.from_codes(self.osm_type_codes, categories=self.osm_types, validate=False),
+            'building_type': pd.Categorical.from_codes(self.building_type_codes, categories=self.building_types, validate=False)
+        }
+        for name in _FLOAT_COLUMNS:
+            columns[name] = getattr(self, name)
+        for name in ('geometry', 'tags'):
+            columns[name] = pd.arrays.ArrowExtensionArray(table.column(name))
+        
+        return pd.DataFrame(columns, copy=False)
+    
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> 'OSMBuildingStore':
+        """
+        Crée le stockage depuis un DataFrame produit par to_dataframe.
+        
+        Args:
+            df: DataFrame
+        
+        Returns:
+            OSMBuildingStore
+        """
+        import pyarrow as pa
+        
+        return cls.from_arrow(pa.Table.from_pandas(df, preserve_index=False))
+
+
+# Fonctions utilitaires
+
+def _object_array(values) -> np.ndarray:
+    """Convertit une séquence de libellés en array d'objets 1D."""
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
+
+
+def _offsets_from_counts(counts: Sequence[int]) -> np.ndarray:
+    """Offsets (len + 1) depuis le nombre d'éléments par ligne."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _concat_offsets(offsets_list: List[np.ndarray]) -> np.ndarray:
+    """Concatène des offsets en décalant chaque bloc."""
+    parts = [offsets_list[0]]
+    shift = offsets_list[0][-1]
+    for offsets in offsets_list[1:]:
+        parts.append(offsets[1:] + shift)
+        shift += offsets[-1]
+    return np.concatenate(parts)
+
+
+def _remap_codes(codes: np.ndarray, dictionary: np.ndarray, merged: Dict[str, int]) -> np.ndarray:
+    """Réindexe des codes dans un dictionnaire fusionné (complété en place)."""
+    mapping = np.array([merged.setdefault(value, len(merged)) for value in dictionary.tolist()], dtype=np.int64)
+    if len(mapping) == 0:
+        return codes
+    return mapping[codes].astype(codes.dtype, copy=False)
+
+
+def _take_ragged(offsets: np.ndarray, rows: np.ndarray):
+    """
+    Sélectionne des lignes d'une colonne de listes (offsets + valeurs plates).
+    
+    Returns:
+        Tuple (nouveaux offsets, indices des valeurs à conserver)
+    """
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    new_offsets = _offsets_from_counts(counts)
+    index = np.arange(new_offsets[-1], dtype=np.int64) + np.repeat(starts - new_offsets[:-1], counts)
+    return new_offsets, index
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    """Remplace NaN par None."""
+    return None if value != value else value
+
+
+def _single_chunk(column: 'pa.ChunkedArray') -> 'pa.Array':
+    """Retourne l'unique chunk d'une colonne (fusion seulement si nécessaire)."""
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    return column.combine_chunks()
+
+
+def _numpy_column(array: 'pa.Array') -> np.ndarray:
+    """Vue NumPy d'un array Arrow primitif (copie si valeurs nulles)."""
+    return array.to_numpy(zero_copy_only=array.null_count == 0, writable=False)
+
+
+def _dictionary_column(array: 'pa.Array'):
+    """
+    Décompose un array Arrow en (codes, dictionnaire).
+    
+    Returns:
+        Tuple (codes NumPy, libellés en array d'objets)
+    """
+    import pyarrow as pa
+    
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    return _numpy_column(array.indices), _object_array(array.dictionary.to_pylist())
+
+
+def _list_column(array: 'pa.Array', convert: bool = True):
+    """
+    Décompose une colonne large_list<struct> en (offsets, champs).
+    
+    Args:
+        array: Array Arrow de listes de structures
+        convert: Convertir les champs en arrays NumPy
+    
+    Returns:
+        Tuple (offsets int64 partant de 0, liste des champs)
+    """
+    offsets = _numpy_column(array.offsets).astype(np.int64, copy=False)
+    values = array.values
+    if offsets[0] != 0 or offsets[-1] != len(values):
+        values = values.slice(offsets[0], offsets[-1] - offsets[0])
+        offsets = offsets - offsets[0]
+    
+    fields = values.flatten()
+    if convert:
+        fields = [_numpy_column(field) for field in fields]
+    return offsets, fields
+
+
+# Export des classes et fonctions
+__all__ = ['OSMBuildingStore', 'OSM_TYPES', 'GEOMETRY_TYPES', 'TAG_FIELDS']
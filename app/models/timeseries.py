@@ -12,17 +12,64 @@ Date: 2025
 Version: 3.0 - Modèles structurés
 """
 
+import logging
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Any, List
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import numpy as np
 import pytz
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Fuseau horaire de référence des observations
+MALAYSIA_TIMEZONE = 'Asia/Kuala_Lumpur'
+
+# Objet timezone partagé par toutes les observations
+_MALAYSIA_TZ = pytz.timezone(MALAYSIA_TIMEZONE)
+
+# Décalage fixe (UTC+8) depuis le dernier changement d'heure: localisation
+# directe, sans passer par pytz.localize, pour les dates postérieures
+_MALAYSIA_FIXED_OFFSET_SINCE = datetime(1982, 1, 1)
+_MALAYSIA_FIXED_TZINFO = _MALAYSIA_TZ.localize(datetime(2000, 1, 1)).tzinfo
+
+# Statuts de validation admis (ordre = code des colonnes de TimeSeriesCollection)
+VALIDATION_STATUSES = ['valid', 'invalid', 'suspect', 'interpolated']
+
+# Score d'anomalie par statut (même ordre que VALIDATION_STATUSES)
+_STATUS_ANOMALY_SCORES = np.array([0, 100, 60, 20], dtype=float)
+
+# Colonnes des collections: identifiant, timestamps (ns UTC), consommation, qualité, statut, anomalie
+_COLUMN_DTYPES = {
+    'unique_id': object,
+    'timestamps': np.int64,
+    'values': np.float64,
+    'quality': np.float64,
+    'status': np.int8,
+    'anomaly': np.bool_
+}
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Observations compactes (__slots__) quand la version de Python le permet (3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Seuils (kWh) des catégories de consommation, bornes supérieures exclues
+CONSUMPTION_CATEGORY_BINS = [5, 15, 30, 60]
+CONSUMPTION_CATEGORY_LABELS = ['very_low', 'low', 'medium', 'high', 'very_high']
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TimeSeries:
     """
     Modèle représentant une observation de série temporelle énergétique.
     
+    Les caractéristiques temporelles et la catégorie de consommation sont
+    calculées à la première lecture (time_features, consumption_category)
+    et non à la création: les collections volumineuses ne paient que ce
+    qu'elles utilisent.
+    
     Attributes:
         unique_id: Identifiant du bâtiment associé
         timestamp: Moment de l'observation
@@ -48,27 +95,26 @@ class TimeSeries:
     weather_context: Optional[Dict[str, Any]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    # Métadonnées calculées
-    _consumption_category: Optional[str] = field(default=None, init=False)
-    _time_features: Optional[Dict[str, Any]] = field(default=None, init=False)
+    # Métadonnées calculées (à la demande)
+    _consumption_category: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _time_features: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialisation après création de l'instance."""
         self._ensure_timezone()
         self._validate_data()
-        self._calculate_features()
-        self._categorize_consumption()
     
     def _ensure_timezone(self):
         """S'assure que le timestamp a un timezone (Malaysia par défaut)."""
         if self.timestamp.tzinfo is None:
             # Assumer le timezone de Malaysia si non spécifié
-            malaysia_tz = pytz.timezone('Asia/Kuala_Lumpur')
-            self.timestamp = malaysia_tz.localize(self.timestamp)
-        elif self.timestamp.tzinfo != pytz.timezone('Asia/Kuala_Lumpur'):
+            if self.timestamp >= _MALAYSIA_FIXED_OFFSET_SINCE:
+                self.timestamp = self.timestamp.replace(tzinfo=_MALAYSIA_FIXED_TZINFO)
+            else:
+                self.timestamp = _MALAYSIA_TZ.localize(self.timestamp)
+        elif getattr(self.timestamp.tzinfo, 'zone', None) != MALAYSIA_TIMEZONE:
             # Convertir vers le timezone Malaysia
-            malaysia_tz = pytz.timezone('Asia/Kuala_Lumpur')
-            self.timestamp = self.timestamp.astimezone(malaysia_tz)
+            self.timestamp = self.timestamp.astimezone(_MALAYSIA_TZ)
     
     def _validate_data(self):
         """
@@ -84,8 +130,7 @@ class TimeSeries:
         if not (0 <= self.quality_score <= 100):
             raise ValueError(f"Quality score invalide: {self.quality_score}")
         
-        valid_statuses = ['valid', 'invalid', 'suspect', 'interpolated']
-        if self.validation_status not in valid_statuses:
+        if self.validation_status not in VALIDATION_STATUSES:
             raise ValueError(f"Status de validation invalide: {self.validation_status}")
     
     def _calculate_features(self):
@@ -129,13 +174,17 @@ class TimeSeries:
     
     @property
     def time_features(self) -> Dict[str, Any]:
-        """Retourne les caractéristiques temporelles."""
-        return self._time_features or {}
+        """Retourne les caractéristiques temporelles (calculées au premier accès)."""
+        if self._time_features is None:
+            self._calculate_features()
+        return self._time_features
     
     @property
     def consumption_category(self) -> str:
-        """Retourne la catégorie de consommation."""
-        return self._consumption_category or 'unknown'
+        """Retourne la catégorie de consommation (calculée au premier accès)."""
+        if self._consumption_category is None:
+            self._categorize_consumption()
+        return self._consumption_category
     
     @property
     def is_anomaly(self) -> bool:
@@ -172,7 +221,7 @@ class TimeSeries:
         Args:
             start_hour: Heure de début (0-23)
             end_hour: Heure de fin (0-23)
-            
+        
         Returns:
             True si dans la plage
         """
@@ -222,7 +271,7 @@ class TimeSeries:
         
         Args:
             baseline_consumption: Consommation de référence
-            
+        
         Returns:
             Score d'anomalie (0-100, 100 = très anormal)
         """
@@ -268,7 +317,7 @@ class TimeSeries:
             previous_value: Valeur précédente
             next_value: Valeur suivante
             position_ratio: Position dans l'intervalle (0-1)
-            
+        
         Returns:
             Nouvelle observation TimeSeries interpolée
         """
@@ -316,7 +365,7 @@ class TimeSeries:
         
         Args:
             data: Dictionnaire avec les données de l'observation
-            
+        
         Returns:
             Instance TimeSeries
         """
@@ -352,90 +401,427 @@ class TimeSeries:
                 f"quality_score={self.quality_score})")
 
 
-@dataclass 
 class TimeSeriesCollection:
     """
     Collection de séries temporelles avec méthodes d'analyse et manipulation.
     
+    Les observations sont maintenues triées dans des colonnes NumPy
+    (timestamps int64 en ns UTC, consommations, qualité, statut). Les
+    ajouts s'écrivent en fin de colonnes en O(1) amorti: dans l'ordre
+    chronologique ils restent triés, sinon ils forment une queue non triée
+    fusionnée (searchsorted) à la lecture suivante. Les requêtes par plage
+    sont en O(log n), les statistiques sont mises à jour à chaque ajout et
+    le dictionnaire metadata n'est reconstruit qu'à sa lecture.
+    
+    Une collection construite depuis des colonnes (from_arrays,
+    from_dataframe) ne crée aucun objet TimeSeries: la liste
+    `observations` n'est matérialisée qu'au premier accès.
+    
     Attributes:
-        observations: Liste des observations TimeSeries
+        observations: Liste des observations TimeSeries (triée par timestamp)
         building_id: Identifiant du bâtiment associé
         metadata: Métadonnées de la collection
     """
     
-    observations: List[TimeSeries]
-    building_id: str = ''
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    
-    def __post_init__(self):
-        """Initialisation après création."""
-        self.observations.sort(key=lambda x: x.timestamp)
+    def __init__(self, observations: Optional[List[TimeSeries]] = None,
+                 building_id: str = '', metadata: Optional[Dict[str, Any]] = None):
+        """
+        Initialise la collection.
+        
+        Args:
+            observations: Observations (dans un ordre quelconque)
+            building_id: Identifiant du bâtiment associé
+            metadata: Métadonnées initiales (optionnel)
+        """
+        self.building_id = building_id
+        self.metadata = metadata if metadata is not None else {}
+        
+        observations = list(observations) if observations else []
+        timestamps = np.array([_datetime_to_ns(obs.timestamp) for obs in observations], dtype=np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        
+        self._observations = [observations[i] for i in order]
+        self._size = 0
+        self._sorted_size = 0
+        self._columns = _empty_columns(len(observations))
+        self._fill_columns(
+            np.array([obs.unique_id for obs in self._observations], dtype=object),
+            timestamps[order],
+            np.array([obs.consumption_kwh for obs in self._observations], dtype=float),
+            np.array([obs.quality_score for obs in self._observations], dtype=float),
+            np.array([VALIDATION_STATUSES.index(obs.validation_status) for obs in self._observations], dtype=np.int8),
+            np.array([obs.anomaly_flag for obs in self._observations], dtype=bool)
+        )
         self._calculate_collection_metadata()
     
+    @classmethod
+    def from_arrays(cls, timestamps_ns: np.ndarray, values: np.ndarray,
+                    quality_scores: Optional[np.ndarray] = None,
+                    status_codes: Optional[np.ndarray] = None,
+                    anomaly_flags: Optional[np.ndarray] = None,
+                    unique_ids: Optional[np.ndarray] = None,
+                    building_id: str = '',
+                    metadata: Optional[Dict[str, Any]] = None) -> 'TimeSeriesCollection':
+        """
+        Construit une collection directement depuis des colonnes.
+        
+        Args:
+            timestamps_ns: Timestamps (int64, ns depuis l'époque UTC), ordre quelconque
+            values: Consommations en kWh
+            quality_scores: Scores de qualité (optionnel, 100 par défaut)
+            status_codes: Index des statuts dans VALIDATION_STATUSES (optionnel, 'valid')
+            anomaly_flags: Indicateurs d'anomalie (optionnel, False par défaut)
+            unique_ids: Identifiants par observation (optionnel, building_id par défaut)
+            building_id: Identifiant du bâtiment associé
+            metadata: Métadonnées initiales (optionnel)
+        
+        Returns:
+            Collection dont les observations seront matérialisées à la demande
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        n = len(timestamps_ns)
+        
+        columns = [
+            np.full(n, building_id, dtype=object) if unique_ids is None else np.asarray(unique_ids, dtype=object),
+            timestamps_ns,
+            np.asarray(values, dtype=float),
+            np.full(n, 100.0) if quality_scores is None else np.asarray(quality_scores, dtype=float),
+            np.zeros(n, dtype=np.int8) if status_codes is None else np.asarray(status_codes, dtype=np.int8),
+            np.zeros(n, dtype=bool) if anomaly_flags is None else np.asarray(anomaly_flags, dtype=bool)
+        ]
+        
+        # Mêmes règles que TimeSeries._validate_data
+        negative = columns[2] < 0
+        columns[4] = np.where(negative, VALIDATION_STATUSES.index('invalid'), columns[4]).astype(np.int8)
+        columns[3] = np.where(negative, 0.0, columns[3])
+        if ((columns[3] < 0) | (columns[3] > 100)).any():
+            raise ValueError("Quality score invalide: hors de [0, 100]")
+        if ((columns[4] < 0) | (columns[4] >= len(VALIDATION_STATUSES))).any():
+            raise ValueError("Status de validation invalide")
+        
+        order = np.argsort(timestamps_ns, kind='stable')
+        if not (order[1:] > order[:-1]).all():
+            columns = [column[order] for column in columns]
+        
+        collection = cls.__new__(cls)
+        collection.building_id = building_id
+        collection.metadata = metadata if metadata is not None else {}
+        collection._observations = None
+        collection._size = 0
+        collection._sorted_size = 0
+        collection._columns = _empty_columns(n)
+        collection._fill_columns(*columns)
+        collection._calculate_collection_metadata()
+        return collection
+    
+    @classmethod
+    def from_dataframe(cls, df, building_id: str = '') -> 'TimeSeriesCollection':
+        """
+        Construit une collection depuis un DataFrame sans objet par ligne.
+        
+        Colonnes reconnues: timestamp, y / consumption_kwh / value,
+        quality_score, anomaly_flag, validation_status, unique_id.
+        
+        Args:
+            df: DataFrame des observations
+            building_id: Identifiant du bâtiment
+        
+        Returns:
+            TimeSeriesCollection
+        """
+        return cls.from_arrays(building_id=building_id, **_dataframe_columns(df, building_id))
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Métadonnées de la collection (statistiques publiées à la lecture)."""
+        if self._metadata_stale:
+            self._publish_metadata()
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+        self._metadata_stale = False
+    
+    @property
+    def observations(self) -> List[TimeSeries]:
+        """Observations TimeSeries triées (matérialisées au premier accès)."""
+        self._ensure_sorted()
+        if self._observations is None:
+            self._observations = self._build_observations(0, self._size)
+        return self._observations
+    
+    def _build_observations(self, start: int, end: int) -> List[TimeSeries]:
+        """Crée les objets TimeSeries des positions [start, end) depuis les colonnes (triées)."""
+        columns = self._columns
+        timestamps = _ns_to_datetimes(columns['timestamps'][start:end])
+        return [
+            TimeSeries(
+                unique_id=unique_id,
+                timestamp=timestamp,
+                consumption_kwh=value,
+                quality_score=quality,
+                anomaly_flag=anomaly,
+                validation_status=VALIDATION_STATUSES[status]
+            )
+            for unique_id, timestamp, value, quality, status, anomaly in zip(
+                columns['unique_id'][start:end].tolist(),
+                timestamps,
+                columns['values'][start:end].tolist(),
+                columns['quality'][start:end].tolist(),
+                columns['status'][start:end].tolist(),
+                columns['anomaly'][start:end].tolist()
+            )
+        ]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps triés (int64, ns depuis l'époque UTC), en lecture seule."""
+        return self._column_view('timestamps')
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Consommations (kWh) dans l'ordre des timestamps, en lecture seule."""
+        return self._column_view('values')
+    
+    @property
+    def quality_scores(self) -> np.ndarray:
+        """Scores de qualité dans l'ordre des timestamps, en lecture seule."""
+        return self._column_view('quality')
+    
+    def _column_view(self, name: str) -> np.ndarray:
+        """Vue en lecture seule de la partie remplie d'une colonne."""
+        view = self._column(name)
+        view.flags.writeable = False
+        return view
+    
+    def _column(self, name: str) -> np.ndarray:
+        """Partie remplie d'une colonne, triée par timestamp."""
+        self._ensure_sorted()
+        return self._columns[name][:self._size]
+    
+    def _fill_columns(self, unique_ids, timestamps, values, quality, status, anomaly):
+        """Remplit les colonnes avec des données déjà triées."""
+        n = len(timestamps)
+        self._ensure_capacity(n)
+        for name, data in zip(_COLUMN_DTYPES, (unique_ids, timestamps, values, quality, status, anomaly)):
+            self._columns[name][:n] = data
+        self._size = n
+        self._sorted_size = n
+    
+    def _ensure_sorted(self):
+        """
+        Fusionne la queue d'ajouts hors ordre avec la partie triée.
+        
+        La queue est triée (stable) puis placée par searchsorted après les
+        timestamps égaux de la partie triée: même ordre que des insertions
+        une à une. Coût O(n + k log k) pour k ajouts en attente.
+        """
+        head, size = self._sorted_size, self._size
+        if head == size:
+            return
+        
+        timestamps = self._columns['timestamps']
+        tail_order = head + np.argsort(timestamps[head:size], kind='stable')
+        positions = np.searchsorted(timestamps[:head], timestamps[tail_order], side='right')
+        tail_targets = positions + np.arange(size - head)
+        head_targets = np.arange(head) + np.searchsorted(positions, np.arange(head), side='right')
+        
+        order = np.empty(size, dtype=np.int64)
+        order[head_targets] = np.arange(head)
+        order[tail_targets] = tail_order
+        
+        for column in self._columns.values():
+            column[:size] = column[:size][order]
+        if self._observations is not None:
+            observations = self._observations
+            self._observations = [observations[i] for i in order.tolist()]
+        self._sorted_size = size
+    
+    def _ensure_capacity(self, capacity: int):
+        """Agrandit les colonnes (capacité doublée) si nécessaire."""
+        current = len(self._columns['timestamps'])
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, 2 * current, 16)
+        for name, dtype in _COLUMN_DTYPES.items():
+            column = np.empty(new_capacity, dtype=dtype)
+            column[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = column
+    
     def _calculate_collection_metadata(self):
-        """Calcule les métadonnées de la collection."""
-        if not self.observations:
+        """Calcule les métadonnées de la collection à partir des colonnes."""
+        if not self._size:
             return
         
-        consumptions = [obs.consumption_kwh for obs in self.observations]
-        quality_scores = [obs.quality_score for obs in self.observations]
+        values = self.values
+        quality = self.quality_scores
+        status_counts = np.bincount(self._column('status'), minlength=len(VALIDATION_STATUSES))
+        
+        self._stats = {
+            'total_kwh': float(values.sum()),
+            'max_kwh': float(values.max()),
+            'min_kwh': float(values.min()),
+            'total_quality': float(quality.sum()),
+            'min_quality': float(quality.min()),
+            'status_counts': status_counts.astype(np.int64)
+        }
+        self._publish_metadata()
+    
+    def _publish_metadata(self):
+        """Met à jour le dictionnaire metadata depuis les statistiques courantes."""
+        self._metadata_stale = False
+        if not self._size:
+            return
         
-        self.metadata.update({
-            'total_observations': len(self.observations),
+        stats = self._stats
+        timestamps = self._column('timestamps')
+        self._metadata.update({
+            'total_observations': self._size,
             'date_range': {
-                'start': self.observations[0].timestamp.isoformat(),
-                'end': self.observations[-1].timestamp.isoformat()
+                'start': _ns_to_datetimes(timestamps[:1])[0].isoformat(),
+                'end': _ns_to_datetimes(timestamps[-1:])[0].isoformat()
             },
             'consumption_stats': {
-                'total_kwh': sum(consumptions),
-                'avg_kwh': sum(consumptions) / len(consumptions),
-                'max_kwh': max(consumptions),
-                'min_kwh': min(consumptions)
+                'total_kwh': stats['total_kwh'],
+                'avg_kwh': stats['total_kwh'] / self._size,
+                'max_kwh': stats['max_kwh'],
+                'min_kwh': stats['min_kwh']
             },
             'quality_stats': {
-                'avg_quality_score': sum(quality_scores) / len(quality_scores),
-                'min_quality_score': min(quality_scores)
+                'avg_quality_score': stats['total_quality'] / self._size,
+                'min_quality_score': stats['min_quality']
             },
             'validation_summary': self._get_validation_summary()
         })
     
     def _get_validation_summary(self) -> Dict[str, int]:
         """Résumé des statuts de validation."""
-        summary = {
-            'valid': 0,
-            'invalid': 0,
-            'suspect': 0,
-            'interpolated': 0
-        }
+        return {status: int(count) for status, count in zip(VALIDATION_STATUSES, self._stats['status_counts'])}
+    
+    def add_observation(self, observation: TimeSeries):
+        """
+        Ajoute une observation à la collection.
+        
+        La ligne est écrite en fin de colonnes (O(1) amorti): elle reste
+        triée si son timestamp suit le dernier, sinon elle rejoint la queue
+        fusionnée à la lecture suivante, après les timestamps égaux. Les
+        statistiques sont mises à jour incrémentalement et metadata n'est
+        reconstruit qu'à sa lecture. Les objets TimeSeries ne sont pas
+        matérialisés; s'ils le sont déjà, l'objet ajouté est conservé tel quel.
+        """
+        timestamp_ns = _datetime_to_ns(observation.timestamp)
+        status = VALIDATION_STATUSES.index(observation.validation_status)
+        row = (observation.unique_id, timestamp_ns, observation.consumption_kwh,
+               observation.quality_score, status, observation.anomaly_flag)
+        
+        position = self._size
+        in_order = self._sorted_size == position and (
+            position == 0 or timestamp_ns >= self._columns['timestamps'][position - 1])
+        
+        self._ensure_capacity(position + 1)
+        for name, value in zip(_COLUMN_DTYPES, row):
+            self._columns[name][position] = value
+        self._size += 1
+        if in_order:
+            self._sorted_size = self._size
+        if self._observations is not None:
+            self._observations.append(observation)
         
-        for obs in self.observations:
-            if obs.validation_status in summary:
-                summary[obs.validation_status] += 1
+        if self._size == 1:
+            self._calculate_collection_metadata()
+            return
         
-        return summary
+        stats = self._stats
+        stats['total_kwh'] += observation.consumption_kwh
+        stats['max_kwh'] = max(stats['max_kwh'], observation.consumption_kwh)
+        stats['min_kwh'] = min(stats['min_kwh'], observation.consumption_kwh)
+        stats['total_quality'] += observation.quality_score
+        stats['min_quality'] = min(stats['min_quality'], observation.quality_score)
+        stats['status_counts'][status] += 1
+        self._metadata_stale = True
     
-    def add_observation(self, observation: TimeSeries):
-        """Ajoute une observation à la collection."""
-        self.observations.append(observation)
-        self.observations.sort(key=lambda x: x.timestamp)
-        self._calculate_collection_metadata()
+    def _range_bounds(self, start_time: datetime, end_time: datetime) -> tuple:
+        """Positions [début, fin) des observations comprises entre deux dates (incluses)."""
+        timestamps = self._column('timestamps')
+        start = int(np.searchsorted(timestamps, _datetime_to_ns(start_time), side='left'))
+        end = int(np.searchsorted(timestamps, _datetime_to_ns(end_time), side='right'))
+        return start, max(start, end)
     
     def get_observations_in_range(self, start_time: datetime, end_time: datetime) -> List[TimeSeries]:
-        """Retourne les observations dans une plage temporelle."""
-        return [obs for obs in self.observations 
-                if start_time <= obs.timestamp <= end_time]
+        """Retourne les observations dans une plage temporelle (bornes incluses)."""
+        start, end = self._range_bounds(start_time, end_time)
+        if self._observations is None:
+            return self._build_observations(start, end)
+        return self._observations[start:end]
+    
+    def get_values_in_range(self, start_time: datetime, end_time: datetime) -> tuple:
+        """
+        Retourne les colonnes (timestamps ns, consommations) d'une plage temporelle.
+        
+        Args:
+            start_time: Début de la plage (inclus)
+            end_time: Fin de la plage (incluse)
+        
+        Returns:
+            Tuple (timestamps, values) de vues en lecture seule
+        """
+        start, end = self._range_bounds(start_time, end_time)
+        return self.timestamps[start:end], self.values[start:end]
+    
+    def _local_index(self):
+        """Timestamps de la collection en DatetimeIndex (heure de Malaysia)."""
+        import pandas as pd
+        return pd.DatetimeIndex(self.timestamps, tz='UTC').tz_convert(MALAYSIA_TIMEZONE)
     
     def get_daily_consumption(self) -> Dict[str, float]:
-        """Calcule la consommation quotidienne."""
-        daily_consumption = {}
+        """Calcule la consommation quotidienne (jour local Malaysia)."""
+        if not self._size:
+            return {}
         
-        for obs in self.observations:
-            date_key = obs.timestamp.date().isoformat()
-            if date_key not in daily_consumption:
-                daily_consumption[date_key] = 0.0
-            daily_consumption[date_key] += obs.consumption_kwh
+        days = self._local_index().normalize()
+        unique_days, day_codes = np.unique(days.asi8, return_inverse=True)
+        totals = np.bincount(day_codes, weights=self.values, minlength=len(unique_days))
         
-        return daily_consumption
+        day_keys = days[np.unique(day_codes, return_index=True)[1]].strftime('%Y-%m-%d')
+        return dict(zip(day_keys, totals.tolist()))
+    
+    def resample(self, frequency: str = 'D', aggregation: str = 'sum'):
+        """
+        Rééchantillonne la consommation à une autre fréquence.
+        
+        Args:
+            frequency: Fréquence cible pandas ('h', 'D', 'W', 'MS', etc.)
+            aggregation: Agrégation ('sum', 'mean', 'max', 'min', 'count')
+        
+        Returns:
+            pandas.Series indexée par période (heure de Malaysia)
+        """
+        import pandas as pd
+        
+        series = pd.Series(self.values, index=self._local_index(), name='consumption_kwh')
+        return series.resample(frequency).agg(aggregation)
+    
+    def calculate_anomaly_scores(self, baseline_consumption: float = None) -> np.ndarray:
+        """
+        Calcule le score d'anomalie de toutes les observations.
+        
+        Args:
+            baseline_consumption: Consommation de référence
+        
+        Returns:
+            Array des scores (0-100) dans l'ordre des observations
+        """
+        return calculate_anomaly_scores(
+            self.values,
+            self.quality_scores,
+            self._column('status'),
+            np.asarray(self._local_index().hour),
+            baseline_consumption
+        )
     
     def detect_anomalies(self, threshold: float = 70.0) -> List[TimeSeries]:
         """
@@ -443,21 +829,22 @@ class TimeSeriesCollection:
         
         Args:
             threshold: Seuil de score d'anomalie
-            
+        
         Returns:
             Liste des observations anormales
         """
-        # Calculer la consommation moyenne comme baseline
-        consumptions = [obs.consumption_kwh for obs in self.observations if obs.validation_status == 'valid']
-        avg_consumption = sum(consumptions) / len(consumptions) if consumptions else 0
+        if not self._size:
+            return []
         
-        anomalies = []
-        for obs in self.observations:
-            anomaly_score = obs.calculate_anomaly_score(avg_consumption)
-            if anomaly_score >= threshold:
-                anomalies.append(obs)
+        # Calculer la consommation moyenne comme baseline
+        valid = self._column('status') == VALIDATION_STATUSES.index('valid')
+        avg_consumption = float(self.values[valid].mean()) if valid.any() else 0
         
-        return anomalies
+        scores = self.calculate_anomaly_scores(avg_consumption)
+        positions = np.flatnonzero(scores >= threshold)
+        if self._observations is None:
+            return [self._build_observations(i, i + 1)[0] for i in positions]
+        return [self._observations[i] for i in positions]
     
     def to_dataframe(self):
         """Convertit la collection en DataFrame pandas."""
@@ -479,40 +866,519 @@ class TimeSeriesCollection:
 
 # Fonctions utilitaires
 
+def _datetime_to_ns(timestamp: datetime) -> int:
+    """Convertit un datetime en nanosecondes depuis l'époque UTC (naïf = heure de Malaysia)."""
+    if timestamp.tzinfo is None:
+        if timestamp >= _MALAYSIA_FIXED_OFFSET_SINCE:
+            timestamp = timestamp.replace(tzinfo=_MALAYSIA_FIXED_TZINFO)
+        else:
+            timestamp = _MALAYSIA_TZ.localize(timestamp)
+    nanoseconds = getattr(timestamp, 'nanosecond', 0)
+    return (timestamp - _EPOCH_UTC) // _ONE_MICROSECOND * 1000 + nanoseconds
+
+
+def _ns_to_datetimes(timestamps_ns: np.ndarray) -> List[datetime]:
+    """Convertit des timestamps (ns UTC) en datetimes à l'heure de Malaysia."""
+    import pandas as pd
+    index = pd.DatetimeIndex(np.asarray(timestamps_ns, dtype='datetime64[ns]'), tz='UTC')
+    return list(index.tz_convert(MALAYSIA_TIMEZONE).to_pydatetime())
+
+
+def _dataframe_columns(df, building_id: str = '') -> Dict[str, np.ndarray]:
+    """
+    Extrait les colonnes d'un DataFrame de séries temporelles sous forme d'arrays.
+    
+    Returns:
+        Arguments de TimeSeriesCollection.from_arrays (hors building_id)
+    """
+    import pandas as pd
+    
+    n = len(df)
+    
+    # Timestamps en ns UTC (naïfs = heure de Malaysia)
+    timestamps = pd.DatetimeIndex(pd.to_datetime(df['timestamp']))
+    if timestamps.tz is None:
+        timestamps = timestamps.tz_localize(MALAYSIA_TIMEZONE)
+    timestamps_ns = timestamps.tz_convert('UTC').as_unit('ns').asi8
+    
+    # Consommation (mêmes noms de colonnes que TimeSeries.from_dict)
+    consumption_column = next((c for c in ('y', 'consumption_kwh', 'value') if c in df.columns), None)
+    values = df[consumption_column].to_numpy(dtype=float) if consumption_column else np.zeros(n)
+    
+    status_codes = None
+    if 'validation_status' in df.columns:
+        status_codes = pd.Categorical(df['validation_status'], categories=VALIDATION_STATUSES).codes
+        if (status_codes < 0).any():
+            raise ValueError("Status de validation invalide")
+    
+    return {
+        'timestamps_ns': timestamps_ns,
+        'values': values,
+        'quality_scores': df['quality_score'].to_numpy(dtype=float) if 'quality_score' in df.columns else None,
+        'status_codes': status_codes,
+        'anomaly_flags': df['anomaly_flag'].to_numpy(dtype=bool) if 'anomaly_flag' in df.columns else None,
+        'unique_ids': df['unique_id'].to_numpy(dtype=object) if 'unique_id' in df.columns else None
+    }
+
+
+def _empty_columns(capacity: int) -> Dict[str, np.ndarray]:
+    """Crée les colonnes vides d'une TimeSeriesCollection."""
+    return {name: np.empty(capacity, dtype=dtype) for name, dtype in _COLUMN_DTYPES.items()}
+
+
+def calculate_anomaly_scores(consumption, quality_scores, status_codes, hours,
+                             baseline_consumption: float = None) -> np.ndarray:
+    """
+    Version vectorisée de TimeSeries.calculate_anomaly_score.
+    
+    Args:
+        consumption: Consommations en kWh
+        quality_scores: Scores de qualité (0-100)
+        status_codes: Index des statuts dans VALIDATION_STATUSES
+        hours: Heure locale de chaque observation (0-23)
+        baseline_consumption: Consommation de référence
+    
+    Returns:
+        Array des scores d'anomalie (0-100, 100 = très anormal)
+    """
+    consumption = np.asarray(consumption, dtype=float)
+    hours = np.asarray(hours)
+    
+    # Score basé sur la qualité
+    anomaly_score = (100 - np.asarray(quality_scores, dtype=float)) * 0.3
+    
+    # Score basé sur la validation
+    anomaly_score += _STATUS_ANOMALY_SCORES[np.asarray(status_codes)] * 0.2
+    
+    # Score basé sur la deviation par rapport au baseline
+    if baseline_consumption and baseline_consumption > 0:
+        deviation_ratio = np.abs(consumption - baseline_consumption) / baseline_consumption
+        anomaly_score += np.select([deviation_ratio > 2.0, deviation_ratio > 1.0, deviation_ratio > 0.5],
+                                   [50, 30, 15], default=0)
+    
+    # Score basé sur des valeurs extrêmes (zéro en dehors des heures creuses 2h-5h)
+    off_peak = (hours >= 2) & (hours <= 5)
+    anomaly_score += np.select([consumption > 1000, (consumption == 0) & ~off_peak],
+                               [40, 25], default=0)
+    
+    return np.minimum(100.0, np.round(anomaly_score, 1))
+
+
+def categorize_consumption_array(values):
+    """
+    Version vectorisée de TimeSeries._categorize_consumption.
+    
+    Args:
+        values: Array des consommations en kWh
+    
+    Returns:
+        pandas.Categorical des catégories de consommation
+    """
+    import pandas as pd
+    
+    values = np.asarray(values, dtype=float)
+    categories = ['zero'] + CONSUMPTION_CATEGORY_LABELS
+    
+    # Code 0 = 'zero', puis une catégorie par intervalle de seuils
+    codes = np.searchsorted(CONSUMPTION_CATEGORY_BINS, values, side='right') + 1
+    codes[values == 0] = 0
+    
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def build_timeseries_frame(unique_ids, date_range, consumption_matrix,
+                           quality_scores=None, anomaly_flags=None,
+                           validation_status: str = 'valid'):
+    """
+    Construit le DataFrame des séries temporelles directement depuis des arrays.
+    
+    Chemin rapide équivalent à [TimeSeries(...).to_dict() for ...] sans créer
+    d'objet par observation: identifiants répétés (catégoriels), index temporel
+    répété par bâtiment, valeurs, scores de qualité et indicateurs.
+    Le dataclass TimeSeries reste la représentation des observations isolées.
+    
+    Args:
+        unique_ids: Identifiants des bâtiments (n_buildings,)
+        date_range: DatetimeIndex commun (n_timestamps,)
+        consumption_matrix: Consommations (n_buildings, n_timestamps)
+        quality_scores: Scores de qualité, même forme (optionnel, 100 par défaut)
+        anomaly_flags: Indicateurs d'anomalie, même forme (optionnel, False par défaut)
+        validation_status: Statut de validation commun
+    
+    Returns:
+        DataFrame long (n_buildings * n_timestamps lignes)
+    """
+    import pandas as pd
+    
+    unique_ids = pd.Index(unique_ids)
+    consumption_matrix = np.asarray(consumption_matrix, dtype=float)
+    n_buildings, n_timestamps = len(unique_ids), len(date_range)
+    
+    if consumption_matrix.shape != (n_buildings, n_timestamps):
+        raise ValueError(f"Matrice de consommation invalide: {consumption_matrix.shape} "
+                         f"au lieu de {(n_buildings, n_timestamps)}")
+    
+    # Timestamps en heure de Malaysia (équivalent de TimeSeries._ensure_timezone)
+    date_range = pd.DatetimeIndex(date_range)
+    if date_range.tz is None:
+        date_range = date_range.tz_localize(MALAYSIA_TIMEZONE)
+    else:
+        date_range = date_range.tz_convert(MALAYSIA_TIMEZONE)
+    
+    values = consumption_matrix.ravel()
+    
+    if quality_scores is None:
+        quality_scores = np.full(values.shape, 100.0)
+    if anomaly_flags is None:
+        anomaly_flags = np.zeros(values.shape, dtype=bool)
+    
+    building_codes = np.repeat(np.arange(n_buildings), n_timestamps)
+    
+    return pd.DataFrame({
+        'unique_id': pd.Categorical.from_codes(building_codes, categories=unique_ids),
+        'timestamp': date_range.take(np.tile(np.arange(n_timestamps), n_buildings)),
+        'y': values,
+        'consumption_kwh': values,
+        'quality_score': np.asarray(quality_scores, dtype=float).ravel(),
+        'anomaly_flag': np.asarray(anomaly_flags, dtype=bool).ravel(),
+        'validation_status': pd.Categorical.from_codes(np.zeros(len(values), dtype=np.int8),
+                                                       categories=[validation_status]),
+        'consumption_category': categorize_consumption_array(values)
+    })
+
+
+def timeseries_frame_to_records(df) -> List[Dict[str, Any]]:
+    """
+    Convertit un DataFrame de séries temporelles en enregistrements JSON.
+    
+    Les colonnes datetime sont rendues en ISO 8601 avec décalage horaire
+    ('2024-01-01T00:00:00+08:00'), comme TimeSeries.to_dict: sans cela,
+    jsonify les sérialiserait au format HTTP en UTC. Chaque timestamp
+    distinct n'est formaté qu'une fois.
+    
+    Args:
+        df: DataFrame (voir build_timeseries_frame)
+    
+    Returns:
+        Liste de dictionnaires (un par observation)
+    """
+    import pandas as pd
+    
+    converted = {}
+    for column in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df[column].dtype):
+            continue
+        codes, uniques = pd.factorize(df[column])
+        iso_values = np.array([timestamp.isoformat() for timestamp in uniques] + [None], dtype=object)
+        converted[column] = iso_values[codes]  # code -1 (NaT) -> None
+    
+    if converted:
+        df = df.assign(**converted)
+    return df.to_dict('records')
+
+
 def create_timeseries_from_dataframe(df, building_id: str = '') -> TimeSeriesCollection:
     """
     Crée une TimeSeriesCollection à partir d'un DataFrame.
     
+    Construction en bloc depuis les colonnes (voir TimeSeriesCollection.from_dataframe):
+    aucun objet TimeSeries n'est créé tant que `observations` n'est pas lu.
+    
     Args:
         df: DataFrame avec les colonnes requises
         building_id: Identifiant du bâtiment
-        
+    
     Returns:
         TimeSeriesCollection
     """
-    observations = []
+    return TimeSeriesCollection.from_dataframe(df, building_id=building_id)
+
+
+def create_timeseries_collections_by_building(df) -> Dict[str, TimeSeriesCollection]:
+    """
+    Découpe un DataFrame multi-bâtiments en une collection par bâtiment.
     
-    for _, row in df.iterrows():
-        obs = TimeSeries.from_dict(row.to_dict())
-        observations.append(obs)
+    Les colonnes sont extraites une seule fois, puis réparties selon les
+    positions de chaque groupe (un seul passage groupby sur unique_id).
     
-    return TimeSeriesCollection(observations=observations, building_id=building_id)
+    Args:
+        df: DataFrame des séries temporelles (colonne unique_id requise)
+    
+    Returns:
+        Dictionnaire {unique_id: TimeSeriesCollection}
+    """
+    columns = _dataframe_columns(df)
+    groups = df.groupby('unique_id', observed=True, sort=False).indices
+    
+    collections = {}
+    for unique_id, positions in groups.items():
+        collections[unique_id] = TimeSeriesCollection.from_arrays(
+            building_id=unique_id,
+            **{name: (column[positions] if column is not None else None) for name, column in columns.items()}
+        )
+    
+    return collections
 
 
 def interpolate_missing_observations(collection: TimeSeriesCollection, 
-                                   frequency: str = 'H') -> TimeSeriesCollection:
+                                   frequency: str = 'H',
+                                   method: str = 'linear') -> TimeSeriesCollection:
     """
     Interpole les observations manquantes dans une collection.
     
+    Les mesures hors grille sont ramenées au pas le plus proche (voir
+    _interpolate_gaps). Les mesures gardent leur unique_id; les points
+    interpolés reprennent celui de la mesure précédente.
+    
     Args:
         collection: Collection de séries temporelles
         frequency: Fréquence attendue ('H', 'D', etc.)
-        
+        method: 'linear' ou 'profile' (suit le profil journalier du bâtiment)
+    
     Returns:
         Nouvelle collection avec observations interpolées
     """
-    # Implementation basique - peut être étendue selon les besoins
-    return collection
+    size = len(collection)
+    if size == 0:
+        return collection
+    
+    columns = {name: collection._column(name) for name in _COLUMN_DTYPES}
+    filled = _interpolate_gaps(
+        np.zeros(size, dtype=np.int64),
+        columns['timestamps'],
+        columns['values'],
+        columns['quality'],
+        columns['status'],
+        columns['anomaly'],
+        _frequency_to_ns(frequency),
+        method
+    )
+    
+    return TimeSeriesCollection.from_arrays(
+        filled['timestamps'],
+        filled['values'],
+        quality_scores=filled['quality'],
+        status_codes=filled['status'],
+        anomaly_flags=filled['anomaly'],
+        unique_ids=columns['unique_id'][filled['sources']],
+        building_id=collection.building_id,
+        metadata=dict(collection.metadata)
+    )
+
+
+def interpolate_missing_timeseries(df, frequency: str = 'H', method: str = 'linear'):
+    """
+    Complète les trous de séries temporelles multi-bâtiments en un seul passage.
+    
+    Chaque bâtiment est réindexé sur la fréquence attendue entre sa première
+    et sa dernière mesure; les points manquants (ou de consommation NaN)
+    sont interpolés et marqués 'interpolated'. Les mesures hors grille sont
+    ramenées au pas le plus proche (voir _interpolate_gaps).
+    
+    Args:
+        df: DataFrame avec unique_id, timestamp et y / consumption_kwh / value
+        frequency: Fréquence attendue ('H', '30min', 'D', etc.)
+        method: 'linear' ou 'profile' (suit le profil journalier du bâtiment)
+    
+    Returns:
+        DataFrame au format de build_timeseries_frame, trié par bâtiment puis timestamp
+    """
+    import pandas as pd
+    
+    columns = _dataframe_columns(df)
+    n = len(df)
+    codes, unique_ids = pd.factorize(df['unique_id'], sort=False)
+    
+    filled = _interpolate_gaps(
+        codes.astype(np.int64),
+        columns['timestamps_ns'],
+        columns['values'],
+        np.full(n, 100.0) if columns['quality_scores'] is None else columns['quality_scores'],
+        np.zeros(n, dtype=np.int8) if columns['status_codes'] is None else columns['status_codes'].astype(np.int8),
+        np.zeros(n, dtype=bool) if columns['anomaly_flags'] is None else columns['anomaly_flags'],
+        _frequency_to_ns(frequency),
+        method
+    )
+    
+    values = filled['values']
+    return pd.DataFrame({
+        'unique_id': pd.Categorical.from_codes(filled['codes'], categories=pd.Index(unique_ids)),
+        'timestamp': pd.DatetimeIndex(filled['timestamps'].astype('datetime64[ns]'), tz='UTC').tz_convert(MALAYSIA_TIMEZONE),
+        'y': values,
+        'consumption_kwh': values,
+        'quality_score': filled['quality'],
+        'anomaly_flag': filled['anomaly'],
+        'validation_status': pd.Categorical.from_codes(filled['status'], categories=VALIDATION_STATUSES),
+        'consumption_category': categorize_consumption_array(values)
+    })
+
+
+def _frequency_to_ns(frequency: str) -> int:
+    """Convertit une fréquence pandas ('H', '15min', 'D'...) en pas fixe en nanosecondes."""
+    import pandas as pd
+    
+    step = pd.Timedelta(pd.tseries.frequencies.to_offset(frequency.replace('H', 'h'))).value
+    if step <= 0:
+        raise ValueError(f"Fréquence invalide: {frequency}")
+    return int(step)
+
+
+def _interpolate_gaps(codes: np.ndarray, timestamps_ns: np.ndarray, values: np.ndarray,
+                      quality: np.ndarray, status: np.ndarray, anomaly: np.ndarray,
+                      step_ns: int, method: str = 'linear') -> Dict[str, np.ndarray]:
+    """
+    Moteur d'interpolation vectorisé sur tous les bâtiments à la fois.
+    
+    Les bâtiments sont mis bout à bout sur une grille régulière unique
+    (un segment par bâtiment, de sa première à sa dernière mesure). Les
+    extrémités de chaque segment sont des mesures: l'interpolation sur la
+    grille globale ne traverse donc jamais deux bâtiments.
+    
+    La grille part de la première mesure de chaque bâtiment. Une mesure hors
+    grille est ramenée au créneau le plus proche, et si plusieurs mesures
+    tombent dans le même créneau seule la première est conservée; les deux
+    cas sont signalés dans le journal (warning).
+    
+    Args:
+        codes: Code du bâtiment par observation (0..n_buildings-1)
+        timestamps_ns: Timestamps (ns UTC)
+        values: Consommations (NaN = manquante)
+        quality: Scores de qualité
+        status: Index des statuts dans VALIDATION_STATUSES
+        anomaly: Indicateurs d'anomalie
+        step_ns: Pas attendu en nanosecondes
+        method: 'linear' ou 'profile'
+    
+    Returns:
+        Colonnes 'codes', 'timestamps', 'values', 'quality', 'status', 'anomaly' de la grille,
+        et 'sources': index de la mesure d'origine de chaque créneau (mesure
+        précédente pour les créneaux interpolés)
+    """
+    if method not in ('linear', 'profile'):
+        raise ValueError(f"Méthode d'interpolation inconnue: {method}")
+    
+    values = np.asarray(values, dtype=float)
+    known = ~np.isnan(values)
+    known_index = np.flatnonzero(known)
+    codes, timestamps_ns = codes[known], timestamps_ns[known]
+    values, quality, status, anomaly = values[known], quality[known], status[known], anomaly[known]
+    
+    n_buildings = int(codes.max()) + 1 if len(codes) else 0
+    if n_buildings == 0:
+        empty = np.array([], dtype=np.int64)
+        return {'codes': empty, 'timestamps': empty, 'values': np.array([]), 'quality': np.array([]),
+                'status': np.array([], dtype=np.int8), 'anomaly': np.array([], dtype=bool), 'sources': empty}
+    
+    # Segment de grille par bâtiment
+    starts = np.full(n_buildings, np.iinfo(np.int64).max)
+    ends = np.full(n_buildings, np.iinfo(np.int64).min)
+    np.minimum.at(starts, codes, timestamps_ns)
+    np.maximum.at(ends, codes, timestamps_ns)
+    present = starts <= ends
+    starts, ends = np.where(present, starts, 0), np.where(present, ends, -step_ns)
+    
+    # Même arrondi que le placement des mesures: la dernière mesure reste dans son segment
+    lengths = np.rint((ends - starts) / step_ns).astype(np.int64) + 1
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    total = int(offsets[-1])
+    
+    grid_codes = np.repeat(np.arange(n_buildings), lengths)
+    grid_positions = np.arange(total) - offsets[grid_codes]
+    grid_timestamps = starts[grid_codes] + grid_positions * step_ns
+    
+    # Placement des mesures (arrondi au pas le plus proche; premier doublon conservé)
+    off_grid = int(np.count_nonzero((timestamps_ns - starts[codes]) % step_ns))
+    slots = offsets[codes] + np.rint((timestamps_ns - starts[codes]) / step_ns).astype(np.int64)
+    slots, first = np.unique(slots, return_index=True)
+    
+    if off_grid or len(slots) < len(codes):
+        logger.warning(f"⚠️ Interpolation: {off_grid} mesures hors grille ramenées au pas le plus proche, "
+                       f"{len(codes) - len(slots)} mesures en doublon ignorées")
+    
+    grid_values = np.full(total, np.nan)
+    grid_values[slots] = values[first]
+    grid_quality = np.empty(total)
+    grid_quality[slots] = quality[first]
+    grid_status = np.full(total, VALIDATION_STATUSES.index('interpolated'), dtype=np.int8)
+    grid_status[slots] = status[first]
+    grid_anomaly = np.zeros(total, dtype=bool)
+    grid_anomaly[slots] = anomaly[first]
+    
+    # Mesure d'origine de chaque créneau (la précédente pour les créneaux vides)
+    grid_sources = known_index[first][np.searchsorted(slots, np.arange(total), side='right') - 1]
+    
+    missing = np.flatnonzero(np.isnan(grid_values))
+    if len(missing):
+        if method == 'profile':
+            filled = _profile_interpolation(grid_codes, grid_timestamps, grid_values, slots, missing, step_ns)
+        else:
+            filled = np.interp(missing, slots, grid_values[slots])
+        grid_values[missing] = np.round(filled, 3)
+        
+        # Qualité réduite par rapport à la mesure précédente (cf. TimeSeries.interpolate_missing_value)
+        previous = slots[np.searchsorted(slots, missing) - 1]
+        grid_quality[missing] = np.maximum(50.0, grid_quality[previous] - 20)
+    
+    return {
+        'codes': grid_codes,
+        'timestamps': grid_timestamps,
+        'values': grid_values,
+        'quality': grid_quality,
+        'status': grid_status,
+        'anomaly': grid_anomaly,
+        'sources': grid_sources
+    }
+
+
+def _profile_interpolation(grid_codes: np.ndarray, grid_timestamps: np.ndarray, grid_values: np.ndarray,
+                           slots: np.ndarray, missing: np.ndarray, step_ns: int) -> np.ndarray:
+    """
+    Interpolation suivant le profil journalier moyen de chaque bâtiment.
+    
+    Le rapport mesure / profil est interpolé linéairement entre les mesures
+    voisines puis multiplié par le profil du créneau manquant. Repli sur
+    l'interpolation linéaire si le pas ne divise pas la journée ou si le
+    profil du créneau est inconnu ou nul.
+    
+    Returns:
+        Valeurs interpolées aux positions `missing`
+    """
+    linear = np.interp(missing, slots, grid_values[slots])
+    
+    day_ns = 24 * 3600 * 10**9
+    if step_ns >= day_ns or day_ns % step_ns:
+        return linear
+    
+    # Créneau de la journée en heure locale (UTC+8 fixe depuis 1982)
+    n_phases = day_ns // step_ns
+    utc_offset_ns = int(_MALAYSIA_FIXED_TZINFO.utcoffset(_MALAYSIA_FIXED_OFFSET_SINCE).total_seconds()) * 10**9
+    phases = ((grid_timestamps + utc_offset_ns) % day_ns) // step_ns
+    
+    # Profil moyen (bâtiment × créneau) des mesures
+    n_buildings = int(grid_codes[-1]) + 1
+    cells = grid_codes[slots] * n_phases + phases[slots]
+    sums = np.bincount(cells, weights=grid_values[slots], minlength=n_buildings * n_phases)
+    counts = np.bincount(cells, minlength=n_buildings * n_phases)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profile = sums / counts
+    
+    known_profile = profile[cells]
+    missing_profile = profile[grid_codes[missing] * n_phases + phases[missing]]
+    
+    usable = known_profile > 0
+    if not usable.any():
+        return linear
+    
+    ratio_slots = slots[usable]
+    ratios = np.interp(missing, ratio_slots, grid_values[ratio_slots] / known_profile[usable])
+    
+    # Les ratios ne doivent pas être pris d'un autre bâtiment
+    left = ratio_slots[np.clip(np.searchsorted(ratio_slots, missing) - 1, 0, None)]
+    right = ratio_slots[np.clip(np.searchsorted(ratio_slots, missing), None, len(ratio_slots) - 1)]
+    same_building = (grid_codes[left] == grid_codes[missing]) & (grid_codes[right] == grid_codes[missing])
+    
+    valid = same_building & (missing_profile > 0) & np.isfinite(missing_profile)
+    return np.where(valid, ratios * missing_profile, linear)
 
 
 # Export des classes principales
@@ -520,5 +1386,11 @@ __all__ = [
     'TimeSeries',
     'TimeSeriesCollection',
     'create_timeseries_from_dataframe',
-    'interpolate_missing_observations'
+    'create_timeseries_collections_by_building',
+    'interpolate_missing_observations',
+    'interpolate_missing_timeseries',
+    'calculate_anomaly_scores',
+    'categorize_consumption_array',
+    'build_timeseries_frame',
+    'timeseries_frame_to_records'
 ]
\ No newline at end of file
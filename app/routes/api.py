@@ -43,57 +43,16 @@ def get_cities():
         min_population = request.args.get('min_population', type=int)
         response_format = request.args.get('format', 'simple')
         
-        # Récupérer les données Malaysia
-        malaysia_data = current_app.data_generator.malaysia_data
-        all_locations = malaysia_data.get_available_locations()
-        
-        # Appliquer les filtres
-        filtered_locations = all_locations.copy()
-        
+        # Filtre normalisé: villes servies par les index et le cache de MalaysiaLocationData
+        location_filter = {}
         if state_filter:
-            filtered_locations = {
-                k: v for k, v in filtered_locations.items()
-                if v.get('state') == state_filter
-            }
-        
+            location_filter['state'] = state_filter
         if min_population:
-            filtered_locations = {
-                k: v for k, v in filtered_locations.items()
-                if v.get('population', 0) >= min_population
-            }
+            location_filter['min_population'] = min_population
         
-        # Formater la réponse
-        if response_format == 'simple':
-            cities = [
-                {
-                    'city': city,
-                    'state': data['state'],
-                    'population': data['population']
-                }
-                for city, data in filtered_locations.items()
-            ]
-        else:  # detailed
-            cities = [
-                {
-                    'city': city,
-                    'state': data['state'],
-                    'state_code': data.get('state_code'),
-                    'region': data['region'],
-                    'population': data['population'],
-                    'coordinates': {
-                        'latitude': data['latitude'],
-                        'longitude': data['longitude']
-                    },
-                    'urban_level': data.get('urban_level'),
-                    'type': data.get('type'),
-                    'timezone': data.get('timezone'),
-                    'economic_level': data.get('economic_level')
-                }
-                for city, data in filtered_locations.items()
-            ]
-        
-        # Trier par population (descendant)
-        cities.sort(key=lambda x: x['population'], reverse=True)
+        # Déjà triées par population (descendant)
+        malaysia_data = current_app.data_generator.malaysia_data
+        cities = list(malaysia_data.list_cities(location_filter, detailed=response_format != 'simple'))
         
         response = {
             'success': True,
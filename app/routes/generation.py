@@ -23,6 +23,7 @@ from pathlib import Path
 from flask import Blueprint, request, jsonify, current_app, send_file
 from werkzeug.exceptions import BadRequest
 
+from app.models.timeseries import timeseries_frame_to_records
 from app.utils.validators import validate_generation_request, validate_osm_request
 
 # Créer le blueprint pour les routes de génération
@@ -43,6 +44,7 @@ def generate_standard():
         "frequency": "D",
         "location_filter": {...},
         "building_types": [...],
+        "seed": 42,
         "export_format": "parquet",
         "download_immediately": false,
         "return_data": true
@@ -78,7 +80,8 @@ def generate_standard():
             'end_date': data.get('end_date', current_app.config.get('DEFAULT_END_DATE', '2024-01-31')),
             'frequency': data.get('frequency', current_app.config.get('DEFAULT_FREQUENCY', 'D')),
             'location_filter': data.get('location_filter'),
-            'building_types': data.get('building_types')
+            'building_types': data.get('building_types'),
+            'seed': data.get('seed')
         }
         
         logger.info(f"📊 Génération: {generation_params['num_buildings']} bâtiments, "
@@ -147,7 +150,7 @@ def generate_standard():
             # Retour JSON standard avec données incluses
             response_data['data'] = {
                 'buildings': dataset['buildings'].to_dict('records'),
-                'timeseries': dataset['timeseries'].to_dict('records')
+                'timeseries': timeseries_frame_to_records(dataset['timeseries'])
             }
             return jsonify(response_data)
         
@@ -268,7 +271,7 @@ def generate_from_osm():
         if data.get('return_data', True) and export_format == 'json':
             response_data['data'] = {
                 'buildings': dataset['buildings'].to_dict('records'),
-                'timeseries': dataset['timeseries'].to_dict('records')
+                'timeseries': timeseries_frame_to_records(dataset['timeseries'])
             }
             return jsonify(response_data)
         else:
@@ -456,7 +459,7 @@ def generate_sample():
             'parameters': sample_params,
             'data': {
                 'buildings': dataset['buildings'].to_dict('records'),
-                'timeseries': dataset['timeseries'].to_dict('records')
+                'timeseries': timeseries_frame_to_records(dataset['timeseries'])
             },
             'statistics': {
                 'buildings_count': len(dataset['buildings']),
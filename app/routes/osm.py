@@ -26,6 +26,7 @@ import tempfile
 import gzip
 from pathlib import Path
 
+from app.models.osm_building_store import OSMBuildingStore
 from app.utils.validators import validate_coordinates, validate_bbox, validate_city_name
 
 # Créer le blueprint pour les routes OSM
@@ -69,21 +70,24 @@ def get_all_buildings():
         logger.info("⚡ Début récupération exhaustive...")
         start_time = datetime.now()
         
-        buildings = osm_service.get_all_buildings_malaysia()
+        store = osm_service.get_all_buildings_store()
         
         fetch_time = (datetime.now() - start_time).total_seconds()
-        logger.info(f"✅ Récupération terminée: {len(buildings)} bâtiments en {fetch_time:.1f}s")
+        logger.info(f"✅ Récupération terminée: {len(store)} bâtiments en {fetch_time:.1f}s")
         
         # Échantillonnage si demandé
-        if sample_size and sample_size < len(buildings):
-            buildings = buildings[:sample_size]
-            logger.info(f"📊 Échantillon réduit à {len(buildings)} bâtiments")
+        if sample_size and sample_size < len(store):
+            store = store.select(slice(0, sample_size))
+            logger.info(f"📊 Échantillon réduit à {len(store)} bâtiments")
         
-        # Statistiques
-        stats = _calculate_building_statistics(buildings)
+        # Statistiques (calculées sur les colonnes)
+        stats = _calculate_building_statistics(store)
         stats['fetch_time_seconds'] = round(fetch_time, 2)
         stats['osm_stats'] = osm_service.get_stats()
         
+        # Dictionnaires construits uniquement pour la sérialisation
+        buildings = store.to_records(include_geometry=include_geometry)
+        
         # Génération de la réponse selon le format
         if download or response_format != 'json':
             # Génération de fichier pour téléchargement
@@ -391,7 +395,8 @@ def get_stats():
                         stats['failed_requests'] / stats['total_requests'] * 100
                         if stats['total_requests'] > 0 else 0, 1
                     )
-                }
+                },
+                'endpoints': osm_service.get_endpoint_stats()
             },
             'system_info': {
                 'available_states': list(osm_service.malaysia_states.keys()),
@@ -412,8 +417,11 @@ def get_stats():
 
 # Fonctions utilitaires
 
-def _calculate_building_statistics(buildings: list) -> dict:
-    """Calcule les statistiques des bâtiments."""
+def _calculate_building_statistics(buildings) -> dict:
+    """Calcule les statistiques des bâtiments (liste de dictionnaires ou OSMBuildingStore)."""
+    if isinstance(buildings, OSMBuildingStore) and len(buildings) > 0:
+        return _calculate_store_statistics(buildings)
+    
     if not buildings:
         return {
             'total_count': 0,
@@ -460,6 +468,29 @@ def _calculate_building_statistics(buildings: list) -> dict:
     }
 
 
+def _calculate_store_statistics(store: OSMBuildingStore) -> dict:
+    """Calcule les statistiques des bâtiments depuis le stockage colonnaire."""
+    # Par état (approximatif depuis addr_city)
+    state_counts = pd.Series(store.tag_column('addr:city')).fillna('unknown').value_counts(sort=False)
+    
+    # Les relations sont des multipolygones: tous les bâtiments ont une géométrie
+    geometry_count = len(store)
+    
+    area = store.area_sqm
+    with_area = area > 0  # NaN exclus
+    area_count = int(with_area.sum())
+    
+    return {
+        'total_count': len(store),
+        'by_type': store.building_type_counts(),
+        'by_state': {state: int(count) for state, count in state_counts.items()},
+        'has_geometry': geometry_count,
+        'geometry_percentage': round(geometry_count / len(store) * 100, 1),
+        'average_area_sqm': round(float(area[with_area].sum()) / area_count, 1) if area_count > 0 else 0,
+        'buildings_with_area': area_count
+    }
+
+
 def _generate_download_file(buildings: list, format_type: str, include_geometry: bool, compress: bool) -> tuple:
     """Génère un fichier de téléchargement dans le format demandé."""
     temp_dir = Path(tempfile.gettempdir()) / 'osm_downloads'
@@ -24,6 +24,7 @@ import pandas as pd
 import tempfile
 from pathlib import Path
 
+from app.models.timeseries import timeseries_frame_to_records
 from app.utils.validators import validate_osm_request, validate_generation_request
 
 # Créer le blueprint pour les routes de génération OSM
@@ -274,7 +275,7 @@ def generate_all_malaysia():
             # Inclure les données dans la réponse JSON
             response_data['data'] = {
                 'buildings': energy_dataset['buildings'].to_dict('records') if hasattr(energy_dataset['buildings'], 'to_dict') else energy_dataset['buildings'],
-                'timeseries': energy_dataset['timeseries'].to_dict('records') if hasattr(energy_dataset['timeseries'], 'to_dict') else energy_dataset['timeseries']
+                'timeseries': timeseries_frame_to_records(energy_dataset['timeseries']) if hasattr(energy_dataset['timeseries'], 'to_dict') else energy_dataset['timeseries']
             }
         
         logger.info(f"🎉 Génération exhaustive terminée: {len(filtered_buildings)} bâtiments en {total_time:.1f}s")
@@ -647,7 +648,7 @@ def _export_energy_dataset(dataset: dict, format_type: str, config: dict) -> dic
                     'config': config
                 },
                 'buildings': dataset['buildings'].to_dict('records') if hasattr(dataset['buildings'], 'to_dict') else dataset['buildings'],
-                'timeseries': dataset['timeseries'].to_dict('records') if hasattr(dataset['timeseries'], 'to_dict') else dataset['timeseries']
+                'timeseries': timeseries_frame_to_records(dataset['timeseries']) if hasattr(dataset['timeseries'], 'to_dict') else dataset['timeseries']
             }
             
             import json
@@ -4,10 +4,22 @@ Package des services métier pour le générateur Malaysia.
 Contient toute la logique de génération, validation et export.
 """
 
-from .data_generator import ElectricityDataGenerator
-from .osm_service import OSMService
-from .validation_service import ValidationService
-from .export_service import ExportService
+import importlib
+
+# Import des services à la demande (PEP 562): importer un service ne charge pas les autres
+_SERVICE_MODULES = {
+    'ElectricityDataGenerator': '.data_generator',
+    'OSMService': '.osm_service',
+    'ValidationService': '.validation_service',
+    'ExportService': '.export_service'
+}
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        return getattr(importlib.import_module(_SERVICE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'ElectricityDataGenerator',
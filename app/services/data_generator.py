@@ -13,19 +13,129 @@ Date: 2025
 Version: 3.0 - Service modulaire
 """
 
+import hashlib
 import logging
-import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import numpy as np
 import pandas as pd
-from faker import Faker
 
-from app.utils.malaysia_data import MalaysiaLocationData
+from app.utils.malaysia_data import MalaysiaLocationData, LocationSampler
 from app.utils.energy_patterns import EnergyPatternGenerator
-from app.models.building import Building
 from app.models.location import Location
-from app.models.timeseries import TimeSeries
+from app.models.timeseries import build_timeseries_frame
+
+
+# Flux aléatoires par bâtiment: SeedSequence(seed, spawn_key=(clé, flux))
+METADATA_STREAM = 0
+TIMESERIES_STREAM = 1
+
+
+def building_rng(seed: int, building_key: int, stream: int) -> np.random.Generator:
+    """
+    Retourne le générateur aléatoire d'un bâtiment pour un flux donné.
+    
+    Le générateur est dérivé directement de (seed, clé, flux) sans dépendre
+    des autres bâtiments: n'importe quelle série peut être rejouée seule.
+    
+    Args:
+        seed: Graine (entropie) de la génération
+        building_key: Clé entière du bâtiment (index ou unique_id_key)
+        stream: Flux (METADATA_STREAM ou TIMESERIES_STREAM)
+        
+    Returns:
+        Générateur numpy indépendant
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(building_key, stream)))
+
+
+def building_random_bits(seed: int, building_keys: np.ndarray, n_draws: int,
+                         stream: int, offset: int = 0) -> np.ndarray:
+    """
+    Tire des mots aléatoires de 64 bits pour un ensemble de bâtiments.
+    
+    Générateur à compteur (splitmix64) vectorisé: le tirage j du bâtiment k
+    ne dépend que de (seed, flux, k, offset + j). Les bâtiments sont donc
+    indépendants les uns des autres, comme avec building_rng, mais sans
+    créer un générateur par bâtiment.
+    
+    Args:
+        seed: Graine (entropie) de la génération
+        building_keys: Clés entières des bâtiments
+        n_draws: Nombre de tirages par bâtiment
+        stream: Flux (METADATA_STREAM ou TIMESERIES_STREAM)
+        offset: Rang du premier tirage
+        
+    Returns:
+        Array uint64 de forme (n_bâtiments, n_draws)
+    """
+    stream_key = np.random.SeedSequence(seed, spawn_key=(stream,)).generate_state(1, dtype=np.uint64)
+    keys = _splitmix64(np.asarray(building_keys).astype(np.uint64) ^ stream_key[0])
+    counters = np.arange(offset, offset + n_draws, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        return _splitmix64(keys[:, None] + counters[None, :] * _SPLITMIX_GAMMA)
+
+
+def building_uniforms(seed: int, building_keys: np.ndarray, n_draws: int,
+                      stream: int, offset: int = 0) -> np.ndarray:
+    """
+    Tire des uniformes [0, 1) pour un ensemble de bâtiments (voir building_random_bits).
+    
+    Returns:
+        Array float de forme (n_bâtiments, n_draws)
+    """
+    bits = building_random_bits(seed, building_keys, n_draws, stream, offset)
+    return (bits >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def unique_id_key(unique_id: Any) -> int:
+    """Convertit un identifiant de bâtiment en clé entière stable entre processus."""
+    digest = hashlib.blake2b(str(unique_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+# Paramètres d'échantillonnage des métadonnées
+BUILDING_TYPES = ['residential', 'commercial', 'industrial', 'public']
+
+BUILDING_AREA_RANGES = {
+    'residential': (50, 300),
+    'commercial': (100, 2000),
+    'industrial': (500, 5000),
+    'public': (200, 1500)
+}
+
+BUILDING_FLOOR_RANGES = {
+    'residential': (1, 3),
+    'commercial': (1, 20),
+    'industrial': (1, 4),
+    'public': (1, 10)
+}
+
+# Consommation de base par type (mêmes profils que Building)
+BASELINE_CONSUMPTION_KWH = {
+    'residential': 25.0,
+    'commercial': 150.0,
+    'industrial': 400.0,
+    'public': 80.0
+}
+
+ENERGY_EFFICIENCY_CLASSES = (['A', 'B', 'C', 'D'], [0.2, 0.3, 0.4, 0.1])
+APARTMENT_TYPES = (['condo', 'terrace', 'semi-d', 'bungalow'], [0.4, 0.3, 0.2, 0.1])
+BUSINESS_TYPES = (['office', 'retail', 'restaurant', 'hotel'], [0.4, 0.3, 0.2, 0.1])
+INDUSTRY_TYPES = (['manufacturing', 'warehouse', 'processing'], [0.5, 0.3, 0.2])
+
+TYPE_SPECIFIC_CHARACTERISTICS = {
+    'residential': ['occupants', 'apartment_type'],
+    'commercial': ['business_type', 'employees'],
+    'industrial': ['industry_type', 'machinery_count'],
+    'public': []
+}
+
+# Tirages par bâtiment: ville, type, 7 caractéristiques (l'identifiant suit)
+_METADATA_DRAWS = 9
+
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
 
 
 class ElectricityDataGenerator:
@@ -49,14 +159,8 @@ class ElectricityDataGenerator:
         self.logger = logging.getLogger(__name__)
         self.config = config
         
-        # ✅ CORRECTION: Utiliser des locales supportés par Faker
-        # en_US pour l'anglais et id_ID pour l'indonésien (proche du malaysien)
-        try:
-            self.faker = Faker(['en_US', 'id_ID'])  # Locales supportés
-        except AttributeError:
-            # Fallback si id_ID n'est pas disponible
-            self.faker = Faker(['en_US'])
-            self.logger.warning("⚠️ Locale id_ID non disponible, utilisation de en_US uniquement")
+        # Faker n'est créé qu'au premier accès (voir la propriété faker)
+        self._faker = None
         
         # Initialiser les données de base
         self.malaysia_data = MalaysiaLocationData()
@@ -68,16 +172,40 @@ class ElectricityDataGenerator:
         
         self.logger.info("✅ Générateur de données énergétiques Malaysia initialisé")
     
+    @property
+    def faker(self):
+        """Instance Faker, créée (et importée) au premier accès."""
+        if self._faker is None:
+            from faker import Faker
+            
+            # ✅ CORRECTION: Utiliser des locales supportés par Faker
+            # en_US pour l'anglais et id_ID pour l'indonésien (proche du malaysien)
+            try:
+                self._faker = Faker(['en_US', 'id_ID'])  # Locales supportés
+            except AttributeError:
+                # Fallback si id_ID n'est pas disponible
+                self._faker = Faker(['en_US'])
+                self.logger.warning("⚠️ Locale id_ID non disponible, utilisation de en_US uniquement")
+        return self._faker
+    
     def generate_complete_dataset(self, 
                                 num_buildings: int = 100,
                                 start_date: str = '2024-01-01',
                                 end_date: str = '2024-01-31',
                                 frequency: str = 'D',
                                 location_filter: Optional[Dict] = None,
-                                building_types: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+                                building_types: Optional[List[str]] = None,
+                                seed: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
         Génère un dataset complet avec métadonnées des bâtiments et séries temporelles.
         
+        Les séries temporelles sont générées par lots de bâtiments
+        (GENERATION_BATCH_SIZE), répartis sur GENERATION_PARALLEL_WORKERS
+        processus. Chaque bâtiment tire ses nombres aléatoires de flux
+        indépendants dérivés de `seed` (building_uniforms pour les métadonnées,
+        building_rng pour les séries): le résultat ne dépend ni du nombre de
+        workers ni des autres bâtiments.
+        
         Args:
             num_buildings: Nombre de bâtiments à générer
             start_date: Date de début (format YYYY-MM-DD)
@@ -85,6 +213,8 @@ class ElectricityDataGenerator:
             frequency: Fréquence des données ('H', 'D', '30T', etc.)
             location_filter: Filtre pour les localisations (ville, état, région)
             building_types: Types de bâtiments à inclure
+            seed: Graine pour une génération reproductible (optionnel, aléatoire
+                  sinon; la graine effective est retournée dans les métadonnées)
             
         Returns:
             Dict contenant les DataFrames 'buildings' et 'timeseries'
@@ -95,27 +225,35 @@ class ElectricityDataGenerator:
             # Validation des paramètres
             self._validate_generation_parameters(num_buildings, start_date, end_date, frequency)
             
+            # Graine effective (tirée au hasard si non fournie, pour pouvoir rejouer)
+            seed = np.random.SeedSequence(seed).entropy
+            
             # Génération des métadonnées des bâtiments
             buildings_df = self.generate_building_metadata(
                 num_buildings=num_buildings,
                 location_filter=location_filter,
-                building_types=building_types
+                building_types=building_types,
+                seed=seed
             )
             
-            # Génération des séries temporelles
-            timeseries_df = self.generate_timeseries_data(
+            # Génération des séries temporelles par lots (éventuellement en parallèle)
+            timeseries_df = self._generate_timeseries_batches(
                 buildings_df=buildings_df,
                 start_date=start_date,
                 end_date=end_date,
-                frequency=frequency
+                frequency=frequency,
+                seed=seed
             )
             
             self.logger.info(f"✅ Dataset généré: {len(buildings_df)} bâtiments, {len(timeseries_df)} observations")
             
+            metadata = self._generate_dataset_metadata(buildings_df, timeseries_df, start_date, end_date, frequency)
+            metadata['seed'] = seed
+            
             return {
                 'buildings': buildings_df,
                 'timeseries': timeseries_df,
-                'metadata': self._generate_dataset_metadata(buildings_df, timeseries_df, start_date, end_date, frequency)
+                'metadata': metadata
             }
             
         except Exception as e:
@@ -125,64 +263,169 @@ class ElectricityDataGenerator:
     def generate_building_metadata(self, 
                                  num_buildings: int,
                                  location_filter: Optional[Dict] = None,
-                                 building_types: Optional[List[str]] = None) -> pd.DataFrame:
+                                 building_types: Optional[List[str]] = None,
+                                 seed: Optional[int] = None,
+                                 start_index: int = 0) -> pd.DataFrame:
         """
         Génère les métadonnées des bâtiments (localisation, type, caractéristiques).
         
+        Tous les tirages sont faits en bloc: les localisations candidates et
+        leurs distributions de types sont préparées une fois par ville, puis
+        chaque attribut est échantillonné pour tous les bâtiments à partir de
+        building_uniforms(seed, index, METADATA_STREAM). Le bâtiment d'index i
+        ne dépend donc que de (seed, i): une tranche générée avec
+        `start_index` est identique à la même tranche d'une génération complète.
+        
         Args:
             num_buildings: Nombre de bâtiments à générer
             location_filter: Filtre pour les localisations
             building_types: Types de bâtiments autorisés
+            seed: Graine de génération (optionnel)
+            start_index: Index du premier bâtiment généré
             
         Returns:
             DataFrame avec les métadonnées des bâtiments
         """
         self.logger.debug(f"📋 Génération des métadonnées pour {num_buildings} bâtiments")
         
-        buildings_data = []
+        seed = np.random.SeedSequence(seed).entropy
+        indices = np.arange(start_index, start_index + num_buildings, dtype=np.int64)
+        draws = building_uniforms(seed, indices, _METADATA_DRAWS, METADATA_STREAM)
+        
+        # Localisations: une instance Location par ville candidate
+        sampler, locations = self._get_candidate_locations(location_filter)
+        city_codes = sampler.codes_from_uniforms(draws[:, 0])
+        
+        # Types de bâtiments selon la distribution de la ville
+        type_probabilities = self._get_type_probabilities(locations, building_types)
+        type_codes = _sample_categorical(draws[:, 1], type_probabilities[city_codes])
+        type_names = np.array(BUILDING_TYPES)[type_codes]
+        
+        # Caractéristiques tirées en colonnes
+        characteristics = self._sample_building_characteristics(type_codes, draws[:, 2:])
+        
+        # Attributs des villes diffusés aux bâtiments
+        location_table = pd.DataFrame([location.to_dict() for location in locations])
+        city_names = sampler.city_array[city_codes]
+        state_codes = location_table['state_code'].to_numpy(dtype=object)[city_codes]
+        
+        unique_ids = building_random_bits(seed, indices, 1, METADATA_STREAM, offset=_METADATA_DRAWS)[:, 0]
+        created_at = datetime.now().isoformat()
+        
+        buildings_df = pd.DataFrame({
+            'unique_id': [f'{value:016x}' for value in unique_ids.tolist()],
+            'building_id': [f"MY_{state_code}_{index:06d}"
+                            for state_code, index in zip(state_codes, indices.tolist())],
+            'latitude': np.array([location.latitude for location in locations], dtype=float)[city_codes],
+            'longitude': np.array([location.longitude for location in locations], dtype=float)[city_codes],
+            'location': city_names,
+            'state': location_table['state'].to_numpy(dtype=object)[city_codes],
+            'region': location_table['region'].to_numpy(dtype=object)[city_codes],
+            'population': location_table['population'].to_numpy()[city_codes],
+            'timezone': location_table['timezone'].to_numpy(dtype=object)[city_codes],
+            'building_class': type_names,
+            'cluster_size': 1,
+            'freq': 'H',  # Valeur par défaut
+            'dataset': 'malaysia_electricity_v3',
+            'location_id': location_table['location_id'].to_numpy(dtype=object)[city_codes],
+            'osm_source': False,
+            'validation_status': 'valid',
+            'baseline_consumption_kwh': self._calculate_baselines(
+                type_codes, characteristics['floor_area_sqm'], locations, city_codes
+            ),
+            'characteristics': self._build_characteristics_records(type_names, characteristics),
+            'created_at': created_at
+        })
+        
+        self.logger.debug(f"✅ Métadonnées générées: {len(buildings_df)} bâtiments")
+        
+        return buildings_df
+    
+    def iter_dataset_chunks(self,
+                            num_buildings: int = 100,
+                            start_date: str = '2024-01-01',
+                            end_date: str = '2024-12-31',
+                            frequency: str = 'D',
+                            location_filter: Optional[Dict] = None,
+                            building_types: Optional[List[str]] = None,
+                            seed: Optional[int] = None,
+                            max_records_per_chunk: Optional[int] = None
+                            ) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Génère le dataset par morceaux de taille bornée.
+        
+        Chaque morceau contient un groupe de bâtiments et toutes leurs
+        observations, de sorte que la mémoire utilisée dépend de la taille des
+        morceaux et non de celle du dataset. Pour une même graine, la
+        concaténation des morceaux est identique à generate_complete_dataset.
         
-        for i in range(num_buildings):
-            # Sélectionner une localisation
-            location = self._select_location(location_filter)
+        Args:
+            num_buildings: Nombre de bâtiments à générer
+            start_date: Date de début (YYYY-MM-DD)
+            end_date: Date de fin (YYYY-MM-DD)
+            frequency: Fréquence des données ('H', 'D', '30T', etc.)
+            location_filter: Filtre pour les localisations (optionnel)
+            building_types: Types de bâtiments à inclure (optionnel)
+            seed: Graine pour une génération reproductible (optionnel)
+            max_records_per_chunk: Observations maximales par morceau
+                                   (CHUNK_SIZE_TIMESERIES par défaut)
             
-            # Sélectionner un type de bâtiment
-            building_type = self._select_building_type(location, building_types)
+        Yields:
+            Tuples (buildings_chunk, timeseries_chunk)
+        """
+        self._validate_generation_parameters(num_buildings, start_date, end_date, frequency)
+        
+        seed = np.random.SeedSequence(seed).entropy
+        
+        # Nombre de bâtiments par morceau selon le nombre de timestamps
+        n_timestamps = len(pd.date_range(start=start_date, end=end_date, freq=frequency))
+        if max_records_per_chunk is None:
+            max_records_per_chunk = int(self._get_config_value('CHUNK_SIZE_TIMESERIES', 100000))
+        buildings_per_chunk = max(1, max_records_per_chunk // max(1, n_timestamps))
+        buildings_per_chunk = min(buildings_per_chunk, int(self._get_config_value('GENERATION_BATCH_SIZE', 10000)))
+        
+        self.logger.info(f"🧩 Génération par morceaux: {num_buildings} bâtiments, "
+                         f"{buildings_per_chunk} bâtiments/morceau (graine {seed})")
+        
+        for chunk_start in range(0, num_buildings, buildings_per_chunk):
+            chunk_size = min(buildings_per_chunk, num_buildings - chunk_start)
             
-            # Générer les caractéristiques du bâtiment
-            characteristics = self._generate_building_characteristics(building_type, location)
+            buildings_chunk = self.generate_building_metadata(
+                num_buildings=chunk_size,
+                location_filter=location_filter,
+                building_types=building_types,
+                seed=seed,
+                start_index=chunk_start
+            )
             
-            # Créer l'instance Building
-            building = Building(
-                unique_id=self._generate_unique_id(),
-                building_id=self._generate_building_id(location, i),
-                location=location,
-                building_type=building_type,
-                characteristics=characteristics,
-                osm_source=False,
-                validation_status='valid'
+            timeseries_chunk = self.generate_timeseries_data(
+                buildings_df=buildings_chunk,
+                start_date=start_date,
+                end_date=end_date,
+                frequency=frequency,
+                seed=seed
             )
             
-            # Convertir en dictionnaire pour le DataFrame
-            buildings_data.append(building.to_dict())
-        
-        buildings_df = pd.DataFrame(buildings_data)
-        self.logger.debug(f"✅ Métadonnées générées: {len(buildings_df)} bâtiments")
-        
-        return buildings_df
+            yield buildings_chunk, timeseries_chunk
     
     def generate_timeseries_data(self,
                                buildings_df: pd.DataFrame,
                                start_date: str,
                                end_date: str,
-                               frequency: str = 'D') -> pd.DataFrame:
+                               frequency: str = 'D',
+                               seed: Optional[int] = None) -> pd.DataFrame:
         """
         Génère les séries temporelles de consommation électrique.
         
+        La série de chaque bâtiment ne dépend que de (seed, unique_id): elle peut
+        être régénérée isolément, dans n'importe quel lot ou processus.
+        
         Args:
             buildings_df: DataFrame des bâtiments
             start_date: Date de début
             end_date: Date de fin
             frequency: Fréquence des données
+            seed: Graine de génération (optionnel)
             
         Returns:
             DataFrame des séries temporelles
@@ -192,35 +435,182 @@ class ElectricityDataGenerator:
         # Créer la plage temporelle
         date_range = pd.date_range(start=start_date, end=end_date, freq=frequency)
         
-        timeseries_data = []
+        # Un flux aléatoire indépendant par bâtiment
+        seed = np.random.SeedSequence(seed).entropy
+        rngs = [building_rng(seed, unique_id_key(unique_id), TIMESERIES_STREAM)
+                for unique_id in buildings_df['unique_id']]
+        
+        # Matrice (bâtiments × timestamps) calculée en une passe
+        consumption_matrix = self.generate_consumption_matrix(buildings_df, date_range, rngs=rngs)
+        
+        # Scores de qualité, tirés après le bruit dans le flux de chaque bâtiment
+        n_timestamps = len(date_range)
+        quality_scores = np.empty(consumption_matrix.shape)
+        for row_index, rng in enumerate(rngs):
+            quality_scores[row_index] = rng.uniform(95, 100, size=n_timestamps)  # Haute qualité pour données synthétiques
+        
+        # Assemblage colonnaire (sans objet TimeSeries par observation)
+        timeseries_df = build_timeseries_frame(
+            unique_ids=buildings_df['unique_id'].to_numpy(),
+            date_range=date_range,
+            consumption_matrix=consumption_matrix,
+            quality_scores=quality_scores,
+            anomaly_flags=None,
+            validation_status='valid'
+        )
+        self.logger.debug(f"✅ Séries temporelles générées: {len(timeseries_df)} observations")
         
-        for _, building in buildings_df.iterrows():
-            # Générer les patterns de consommation pour ce bâtiment
-            building_timeseries = self.pattern_generator.generate_consumption_pattern(
-                building_type=building['building_class'],
-                date_range=date_range,
-                location_data=building,
-                characteristics=building.get('characteristics', {})
-            )
+        return timeseries_df
+    
+    def generate_consumption_matrix(self,
+                                    buildings_df: pd.DataFrame,
+                                    date_range: pd.DatetimeIndex,
+                                    rows_per_chunk: Optional[int] = None,
+                                    rngs: Optional[List[np.random.Generator]] = None) -> np.ndarray:
+        """
+        Génère la consommation de tous les bâtiments en une seule matrice.
+        
+        Les scalaires par bâtiment (consommation de base, facteur bâtiment,
+        niveau de bruit) sont diffusés contre les vecteurs de facteurs
+        temporels partagés par type de bâtiment.
+        
+        Args:
+            buildings_df: DataFrame des bâtiments ('building_class', 'characteristics')
+            date_range: Plage temporelle
+            rows_per_chunk: Nombre de lignes traitées à la fois (None = toutes)
+            rngs: Un générateur aléatoire par bâtiment (optionnel, état global
+                  numpy par défaut)
             
-            # Convertir en observations TimeSeries
-            for timestamp, consumption in building_timeseries.items():
-                observation = TimeSeries(
-                    unique_id=building['unique_id'],
-                    timestamp=timestamp,
-                    consumption_kwh=consumption,
-                    quality_score=np.random.uniform(95, 100),  # Haute qualité pour données synthétiques
-                    anomaly_flag=False,
-                    validation_status='valid'
-                )
-                
-                timeseries_data.append(observation.to_dict())
-        
-        timeseries_df = pd.DataFrame(timeseries_data)
-        self.logger.debug(f"✅ Séries temporelles générées: {len(timeseries_df)} observations")
+        Returns:
+            Array float de forme (n_buildings, n_timestamps)
+        """
+        patterns = self.pattern_generator
+        n_buildings = len(buildings_df)
+        n_timestamps = len(date_range)
+        
+        # Types normalisés (fallback résidentiel comme le générateur de patterns)
+        building_types = [
+            building_type if building_type in patterns.base_patterns else 'residential'
+            for building_type in buildings_df['building_class']
+        ]
+        type_names = sorted(set(building_types))
+        type_codes = np.array([type_names.index(t) for t in building_types], dtype=np.intp)
+        
+        # Vecteurs temporels partagés: un par type présent, shape (n_types, n_timestamps)
+        type_factors = np.vstack([
+            patterns.get_timestamp_factors(building_type, date_range)
+            for building_type in type_names
+        ]) if type_names else np.empty((0, n_timestamps))
+        
+        # Scalaires par bâtiment
+        if 'characteristics' in buildings_df.columns:
+            characteristics_list = [
+                c if isinstance(c, dict) else {} for c in buildings_df['characteristics']
+            ]
+        else:
+            characteristics_list = [{}] * n_buildings
+        
+        base_kwh = np.array([
+            patterns.base_patterns[t]['base_consumption_kwh'] for t in building_types
+        ])
+        building_factors = np.array([
+            patterns._calculate_building_factors(c, t)
+            for c, t in zip(characteristics_list, building_types)
+        ])
+        noise_levels = np.array([patterns.noise_levels.get(t, 0.1) for t in building_types])
+        scale = base_kwh * building_factors
+        
+        # Calcul par blocs de lignes pour borner la mémoire temporaire
+        consumption_matrix = np.empty((n_buildings, n_timestamps))
+        step = rows_per_chunk or max(n_buildings, 1)
+        
+        for start in range(0, n_buildings, step):
+            rows = slice(start, min(start + step, n_buildings))
+            block = scale[rows, None] * type_factors[type_codes[rows]]
+            if rngs is None:
+                noise = np.random.normal(1.0, noise_levels[rows, None],
+                                         size=(rows.stop - rows.start, n_timestamps))
+            else:
+                noise = np.vstack([
+                    rngs[row].normal(1.0, noise_levels[row], size=n_timestamps)
+                    for row in range(rows.start, rows.stop)
+                ]) if rows.stop > rows.start else np.empty((0, n_timestamps))
+            block *= np.maximum(0.1, noise)  # Éviter les valeurs négatives
+            np.maximum(block, 0.0, out=consumption_matrix[rows])
+        
+        return consumption_matrix
+    
+    def _generate_timeseries_batches(self,
+                                     buildings_df: pd.DataFrame,
+                                     start_date: str,
+                                     end_date: str,
+                                     frequency: str,
+                                     seed: Optional[int] = None) -> pd.DataFrame:
+        """
+        Génère les séries temporelles par lots de bâtiments, en parallèle si configuré.
+        
+        Les lots sont concaténés dans l'ordre des bâtiments. Chaque bâtiment
+        ayant son propre flux aléatoire, la sortie est identique quel que soit
+        le nombre de workers ou la taille des lots.
+        
+        Args:
+            buildings_df: DataFrame des bâtiments
+            start_date: Date de début
+            end_date: Date de fin
+            frequency: Fréquence des données
+            seed: Graine de génération (optionnel)
+            
+        Returns:
+            DataFrame des séries temporelles
+        """
+        batch_size = max(1, int(self._get_config_value(
+            'GENERATION_BATCH_SIZE', self._get_config_value('CHUNK_SIZE_BUILDINGS', 10000))))
+        workers = max(1, int(self._get_config_value('GENERATION_PARALLEL_WORKERS', 1)))
+        
+        batches = [buildings_df.iloc[start:start + batch_size]
+                   for start in range(0, len(buildings_df), batch_size)]
+        seed = np.random.SeedSequence(seed).entropy
+        tasks = [(batch, start_date, end_date, frequency, seed) for batch in batches]
+        
+        if workers > 1 and len(tasks) > 1:
+            self.logger.info(f"⚡ Génération parallèle: {len(tasks)} lots sur {min(workers, len(tasks))} workers")
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                     initializer=_init_generation_worker) as executor:
+                frames = list(executor.map(_generate_timeseries_batch, tasks))
+        else:
+            frames = [self._generate_timeseries_batch(task) for task in tasks]
+        
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        
+        # Concaténation ordonnée en conservant des identifiants catégoriels
+        timeseries_df = pd.concat(frames, ignore_index=True)
+        timeseries_df['unique_id'] = pd.api.types.union_categoricals(
+            [frame['unique_id'] for frame in frames])
         
         return timeseries_df
     
+    def _generate_timeseries_batch(self, task: Tuple) -> pd.DataFrame:
+        """Génère les séries temporelles d'un lot (batch, dates, fréquence, graine)."""
+        batch, start_date, end_date, frequency, seed = task
+        return self.generate_timeseries_data(
+            buildings_df=batch,
+            start_date=start_date,
+            end_date=end_date,
+            frequency=frequency,
+            seed=seed
+        )
+    
+    def _get_config_value(self, key: str, default: Any) -> Any:
+        """Récupère une valeur de configuration (objet de config ou dictionnaire)."""
+        if self.config is None:
+            return default
+        if isinstance(self.config, dict):
+            return self.config.get(key, default)
+        return getattr(self.config, key, default)
+    
     def _validate_generation_parameters(self, num_buildings: int, start_date: str, 
                                       end_date: str, frequency: str):
         """
@@ -239,8 +629,9 @@ class ElectricityDataGenerator:
         if num_buildings <= 0:
             raise ValueError("Le nombre de bâtiments doit être positif")
         
-        if self.config and num_buildings > self.config.MAX_BUILDINGS:
-            raise ValueError(f"Nombre maximum de bâtiments: {self.config.MAX_BUILDINGS}")
+        max_buildings = self._get_config_value('MAX_BUILDINGS', None)
+        if max_buildings and num_buildings > max_buildings:
+            raise ValueError(f"Nombre maximum de bâtiments: {max_buildings}")
         
         # Validation des dates
         try:
@@ -254,145 +645,166 @@ class ElectricityDataGenerator:
         
         # Valider la période
         period_days = (end_dt - start_dt).days
-        if self.config and hasattr(self.config, 'MAX_PERIOD_DAYS') and period_days > self.config.MAX_PERIOD_DAYS:
-            raise ValueError(f"Période maximum: {self.config.MAX_PERIOD_DAYS} jours")
+        max_period_days = self._get_config_value('MAX_PERIOD_DAYS', None)
+        if max_period_days and period_days > max_period_days:
+            raise ValueError(f"Période maximum: {max_period_days} jours")
         
         # Valider la fréquence
-        if self.config and hasattr(self.config, 'SUPPORTED_FREQUENCIES') and frequency not in self.config.SUPPORTED_FREQUENCIES:
-            raise ValueError(f"Fréquences supportées: {self.config.SUPPORTED_FREQUENCIES}")
+        supported_frequencies = self._get_config_value('SUPPORTED_FREQUENCIES', None)
+        if supported_frequencies and frequency not in supported_frequencies:
+            raise ValueError(f"Fréquences supportées: {supported_frequencies}")
     
-    def _select_location(self, location_filter: Optional[Dict] = None) -> Location:
+    def _get_candidate_locations(self, location_filter: Optional[Dict] = None
+                                 ) -> Tuple[LocationSampler, List[Location]]:
         """
-        Sélectionne une localisation selon les filtres donnés.
+        Prépare les villes candidates et leur échantillonneur pondéré.
         
         Args:
             location_filter: Critères de filtrage
             
         Returns:
-            Instance Location
+            Tuple (échantillonneur compilé, instances Location par ville)
         """
-        # Obtenir les localisations disponibles
-        available_locations = self.malaysia_data.get_available_locations()
-        
-        # Appliquer les filtres si fournis
-        if location_filter:
-            available_locations = self.malaysia_data.filter_locations(
-                available_locations, 
-                location_filter
-            )
-        
-        # Sélectionner aléatoirement avec pondération par population
-        location_data = self.malaysia_data.select_weighted_location(available_locations)
+        # Échantillonneur compilé une fois par filtre (repli sur Kuala Lumpur)
+        sampler = self.malaysia_data.get_location_sampler(location_filter)
         
-        # Créer une instance Location
+        # Créer une instance Location par ville
         from app.models.location import create_location_from_dict
-        return create_location_from_dict(location_data)
+        locations = [create_location_from_dict({**data, 'city': city})
+                     for city, data in zip(sampler.cities, sampler.locations)]
+        
+        return sampler, locations
     
-    def _select_building_type(self, location: Location, building_types: Optional[List[str]] = None) -> str:
+    def _get_type_probabilities(self, locations: List[Location],
+                                building_types: Optional[List[str]] = None) -> np.ndarray:
         """
-        Sélectionne un type de bâtiment approprié pour la localisation.
+        Construit la matrice des probabilités de type par ville.
         
         Args:
-            location: Localisation du bâtiment
+            locations: Villes candidates
             building_types: Types autorisés (optionnel)
             
         Returns:
-            Type de bâtiment sélectionné
+            Array (n_villes, len(BUILDING_TYPES)) de probabilités
         """
-        # Obtenir la distribution des types selon la localisation
-        location_dict = location.to_dict() if hasattr(location, 'to_dict') else location.__dict__
-        type_distribution = self.malaysia_data.get_building_type_distribution(location_dict)
-        
-        # Filtrer selon les types autorisés
-        if building_types:
-            type_distribution = {
-                k: v for k, v in type_distribution.items() 
-                if k in building_types
-            }
+        probabilities = np.zeros((len(locations), len(BUILDING_TYPES)))
         
-        # Sélection pondérée
-        if not type_distribution:
-            return 'residential'  # Fallback
+        for row, location in enumerate(locations):
+            # Obtenir la distribution des types selon la localisation
+            type_distribution = self.malaysia_data.get_building_type_distribution(location.to_dict())
+            
+            for column, building_type in enumerate(BUILDING_TYPES):
+                if not building_types or building_type in building_types:
+                    probabilities[row, column] = type_distribution.get(building_type, 0.0)
             
-        types = list(type_distribution.keys())
-        weights = list(type_distribution.values())
+            total = probabilities[row].sum()
+            if total > 0:
+                probabilities[row] /= total  # Renormaliser après filtrage
+            else:
+                probabilities[row, BUILDING_TYPES.index('residential')] = 1.0  # Fallback
         
-        return np.random.choice(types, p=weights)
+        return probabilities
     
-    def _generate_building_characteristics(self, building_type: str, location: Location) -> Dict:
+    def _sample_building_characteristics(self, type_codes: np.ndarray, draws: np.ndarray) -> Dict[str, np.ndarray]:
         """
-        Génère les caractéristiques spécifiques d'un bâtiment.
+        Tire les caractéristiques de tous les bâtiments en colonnes.
         
         Args:
-            building_type: Type du bâtiment
-            location: Localisation
+            type_codes: Index du type de chaque bâtiment dans BUILDING_TYPES
+            draws: Uniformes [0, 1) de forme (n_bâtiments, 7): 5 caractéristiques
+                   communes puis 2 propres au type (colonnes 5 et 6 partagées)
             
         Returns:
-            Dictionnaire des caractéristiques
+            Dictionnaire {caractéristique: array}
         """
+        area_ranges = np.array([BUILDING_AREA_RANGES[t] for t in BUILDING_TYPES], dtype=float)[type_codes]
+        floor_ranges = np.array([BUILDING_FLOOR_RANGES[t] for t in BUILDING_TYPES])[type_codes]
+        
         characteristics = {
-            'building_type': building_type,
-            'construction_year': np.random.randint(1980, 2024),
-            'floor_area_sqm': self._generate_floor_area(building_type),
-            'floors': self._generate_floor_count(building_type),
-            'ac_installed': np.random.choice([True, False], p=[0.8, 0.2]),  # 80% ont la climatisation en Malaysia
-            'energy_efficiency': np.random.choice(['A', 'B', 'C', 'D'], p=[0.2, 0.3, 0.4, 0.1])
+            'construction_year': _sample_integers(draws[:, 0], 1980, 2024),
+            'floor_area_sqm': np.round(area_ranges[:, 0] + draws[:, 1] * (area_ranges[:, 1] - area_ranges[:, 0]), 1),
+            'floors': _sample_integers(draws[:, 2], floor_ranges[:, 0], floor_ranges[:, 1] + 1),
+            'ac_installed': draws[:, 3] < 0.8,  # 80% ont la climatisation en Malaysia
+            'energy_efficiency': _sample_choice(draws[:, 4], ENERGY_EFFICIENCY_CLASSES)
         }
         
-        # Ajustements selon le type de bâtiment
-        if building_type == 'residential':
-            characteristics.update({
-                'occupants': np.random.randint(1, 6),
-                'apartment_type': np.random.choice(['condo', 'terrace', 'semi-d', 'bungalow'], 
-                                                 p=[0.4, 0.3, 0.2, 0.1])
-            })
-        elif building_type == 'commercial':
-            characteristics.update({
-                'business_type': np.random.choice(['office', 'retail', 'restaurant', 'hotel'], 
-                                                p=[0.4, 0.3, 0.2, 0.1]),
-                'employees': np.random.randint(5, 200)
-            })
-        elif building_type == 'industrial':
-            characteristics.update({
-                'industry_type': np.random.choice(['manufacturing', 'warehouse', 'processing'], 
-                                                p=[0.5, 0.3, 0.2]),
-                'machinery_count': np.random.randint(10, 100)
-            })
+        # Caractéristiques propres au type (une seule famille s'applique par bâtiment)
+        characteristics.update({
+            'occupants': _sample_integers(draws[:, 5], 1, 6),
+            'apartment_type': _sample_choice(draws[:, 6], APARTMENT_TYPES),
+            'business_type': _sample_choice(draws[:, 6], BUSINESS_TYPES),
+            'employees': _sample_integers(draws[:, 5], 5, 200),
+            'industry_type': _sample_choice(draws[:, 6], INDUSTRY_TYPES),
+            'machinery_count': _sample_integers(draws[:, 5], 10, 100)
+        })
         
         return characteristics
     
-    def _generate_floor_area(self, building_type: str) -> float:
-        """Génère une superficie réaliste selon le type de bâtiment."""
-        area_ranges = {
-            'residential': (50, 300),
-            'commercial': (100, 2000),
-            'industrial': (500, 5000),
-            'public': (200, 1500)
-        }
-        
-        min_area, max_area = area_ranges.get(building_type, (100, 500))
-        return round(np.random.uniform(min_area, max_area), 1)
-    
-    def _generate_floor_count(self, building_type: str) -> int:
-        """Génère un nombre d'étages réaliste selon le type de bâtiment."""
-        floor_ranges = {
-            'residential': (1, 3),
-            'commercial': (1, 20),
-            'industrial': (1, 4),
-            'public': (1, 10)
-        }
+    def _build_characteristics_records(self, type_names: np.ndarray,
+                                       characteristics: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Assemble le dictionnaire de caractéristiques de chaque bâtiment.
         
-        min_floors, max_floors = floor_ranges.get(building_type, (1, 3))
-        return np.random.randint(min_floors, max_floors + 1)
+        Args:
+            type_names: Type de chaque bâtiment
+            characteristics: Colonnes retournées par _sample_building_characteristics
+            
+        Returns:
+            Liste de dictionnaires (colonne 'characteristics')
+        """
+        columns = {name: values.tolist() for name, values in characteristics.items()}
+        common_fields = ['construction_year', 'floor_area_sqm', 'floors', 'ac_installed', 'energy_efficiency']
+        
+        records = []
+        for row, building_type in enumerate(type_names.tolist()):
+            record = {'building_type': building_type}
+            for name in common_fields:
+                record[name] = columns[name][row]
+            for name in TYPE_SPECIFIC_CHARACTERISTICS[building_type]:
+                record[name] = columns[name][row]
+            records.append(record)
+        
+        return records
     
-    def _generate_unique_id(self) -> str:
+    def _calculate_baselines(self, type_codes: np.ndarray, floor_areas: np.ndarray,
+                             locations: List[Location], city_codes: np.ndarray) -> np.ndarray:
         """
-        Génère un identifiant unique de 16 caractères.
+        Calcule la consommation de base de tous les bâtiments.
+        
+        Reprend les règles de Building (profil par type, surface, population
+        et zone climatique de la ville) sous forme vectorisée.
         
+        Args:
+            type_codes: Index du type de chaque bâtiment dans BUILDING_TYPES
+            floor_areas: Surfaces en m²
+            locations: Villes candidates
+            city_codes: Index de la ville de chaque bâtiment
+            
         Returns:
-            Identifiant unique
+            Array des consommations de base en kWh
         """
-        return uuid.uuid4().hex[:16]
+        baseline = np.array([BASELINE_CONSUMPTION_KWH[t] for t in BUILDING_TYPES])[type_codes]
+        
+        # Surface
+        baseline = baseline * np.select([floor_areas > 1000, floor_areas < 100], [1.5, 0.7], default=1.0)
+        
+        # Localisation (facteur calculé une fois par ville)
+        city_factors = np.ones(len(locations))
+        for row, location in enumerate(locations):
+            if location.population:
+                # Grandes villes = consommation légèrement plus élevée
+                if location.population > 1000000:
+                    city_factors[row] *= 1.1
+                elif location.population < 100000:
+                    city_factors[row] *= 0.95
+            
+            # Zones climatiques plus chaudes = plus de climatisation
+            if location.climate_zone == 'tropical_hot':
+                city_factors[row] *= 1.15
+            elif location.climate_zone == 'tropical_moderate':
+                city_factors[row] *= 1.05
+        
+        return np.round(baseline * city_factors[city_codes], 2)
     
     def _generate_building_id(self, location: Location, index: int) -> str:
         """
@@ -469,5 +881,64 @@ class ElectricityDataGenerator:
         }
 
 
+# Fonctions utilitaires d'échantillonnage
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """Fonction de mélange splitmix64 appliquée élément par élément (arithmétique modulo 2^64)."""
+    with np.errstate(over='ignore'):
+        z = values + _SPLITMIX_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _sample_categorical(uniforms: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """
+    Convertit des uniformes en index de catégories par inversion de la fonction de répartition.
+    
+    `probabilities` est soit un vecteur commun, soit une ligne de probabilités par tirage.
+    """
+    cumulative = np.cumsum(probabilities, axis=-1)
+    if cumulative.ndim == 1:
+        codes = np.searchsorted(cumulative, uniforms, side='right')
+    else:
+        codes = (uniforms[:, None] >= cumulative).sum(axis=1)
+    return np.minimum(codes, cumulative.shape[-1] - 1)
+
+
+def _sample_integers(uniforms: np.ndarray, low, high) -> np.ndarray:
+    """Entiers uniformes dans [low, high) à partir d'uniformes [0, 1)."""
+    return (low + np.floor(uniforms * (np.asarray(high) - low))).astype(np.int64)
+
+
+def _sample_choice(uniforms: np.ndarray, choices: Tuple[List, List[float]]) -> np.ndarray:
+    """Choix pondéré parmi (valeurs, probabilités) à partir d'uniformes [0, 1)."""
+    values, probabilities = choices
+    return np.array(values, dtype=object)[_sample_categorical(uniforms, np.asarray(probabilities))]
+
+
+# Générateur propre à chaque processus worker (initialisé une fois par processus)
+_worker_generator: Optional[ElectricityDataGenerator] = None
+
+
+def _init_generation_worker():
+    """Initialise le générateur d'un processus worker du pool de génération."""
+    global _worker_generator
+    _worker_generator = ElectricityDataGenerator()
+
+
+def _generate_timeseries_batch(task: Tuple) -> pd.DataFrame:
+    """Point d'entrée picklable pour générer un lot dans un processus worker."""
+    if _worker_generator is None:
+        _init_generation_worker()
+    return _worker_generator._generate_timeseries_batch(task)
+
+
 # Export de la classe principale
-__all__ = ['ElectricityDataGenerator']
\ No newline at end of file
+__all__ = [
+    'ElectricityDataGenerator',
+    'building_rng',
+    'building_random_bits',
+    'building_uniforms',
+    'unique_id_key'
+]
\ No newline at end of file
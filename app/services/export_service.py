@@ -17,10 +17,12 @@ import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 import pandas as pd
 import numpy as np
 
+from app.models.timeseries import timeseries_frame_to_records
+
 
 class ExportService:
     """
@@ -156,6 +158,123 @@ class ExportService:
             self.export_statistics['failed_exports'] += 1
             raise
     
+    def export_dataset_chunks(self, chunks: Iterable[Tuple[pd.DataFrame, pd.DataFrame]],
+                              export_format: str = 'parquet',
+                              filename_prefix: str = 'malaysia_energy',
+                              compression: bool = True) -> Dict[str, Any]:
+        """
+        Exporte un dataset produit par morceaux (voir iter_dataset_chunks).
+        
+        Chaque morceau (buildings_chunk, timeseries_chunk) est ajouté aux
+        fichiers puis libéré: la mémoire utilisée dépend de la taille des
+        morceaux. Seuls les formats ajoutables sont supportés (Parquet, CSV).
+        
+        Args:
+            chunks: Itérable de tuples (buildings_chunk, timeseries_chunk)
+            export_format: Format d'export ('parquet' ou 'csv')
+            filename_prefix: Préfixe pour les noms de fichiers
+            compression: Activer la compression si supportée
+            
+        Returns:
+            Informations sur les fichiers créés
+        """
+        self.logger.info(f"📤 Export par morceaux en format {export_format}")
+        
+        if export_format not in ('parquet', 'csv'):
+            raise ValueError(f"Format non supporté pour l'export par morceaux: {export_format}")
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        format_config = self.supported_formats[export_format]
+        compression_type = format_config.get('compression') if compression else None
+        
+        table_names = ('buildings', 'timeseries')
+        filepaths = {
+            name: self.output_dir / f"{filename_prefix}_{name}_{timestamp}{format_config['extension']}"
+            for name in table_names
+        }
+        writers = {}
+        rows = {name: 0 for name in table_names}
+        columns = {name: 0 for name in table_names}
+        num_chunks = 0
+        
+        try:
+            for chunk in chunks:
+                for name, df in zip(table_names, chunk):
+                    if export_format == 'parquet':
+                        self._append_parquet_chunk(writers, name, filepaths[name], df, compression_type)
+                    else:
+                        df.to_csv(
+                            filepaths[name],
+                            mode='a',
+                            header=rows[name] == 0,
+                            index=False,
+                            encoding=format_config['encoding'],
+                            sep=format_config['separator']
+                        )
+                    rows[name] += len(df)
+                    columns[name] = len(df.columns)
+                num_chunks += 1
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors de l'export par morceaux: {e}")
+            self.export_statistics['total_exports'] += 1
+            self.export_statistics['failed_exports'] += 1
+            raise
+        finally:
+            for writer in writers.values():
+                writer.close()
+        
+        files_created = []
+        total_size = 0
+        for name in table_names:
+            if not filepaths[name].exists():
+                continue
+            file_size = filepaths[name].stat().st_size
+            files_created.append({
+                'name': filepaths[name].name,
+                'path': str(filepaths[name]),
+                'size_bytes': file_size,
+                'rows': rows[name],
+                'columns': columns[name]
+            })
+            total_size += file_size
+        
+        export_result = {
+            'format': export_format,
+            'files': files_created,
+            'total_size': total_size,
+            'chunks': num_chunks,
+            'success': True
+        }
+        if export_format == 'parquet':
+            export_result['compression'] = compression_type
+        
+        self._update_export_statistics(export_format, export_result)
+        
+        self.logger.info(f"✅ Export par morceaux réussi: {num_chunks} morceaux, {rows['timeseries']:,} observations")
+        return export_result
+    
+    def _append_parquet_chunk(self, writers: Dict[str, Any], name: str, filepath: Path,
+                              df: pd.DataFrame, compression_type: Optional[str]):
+        """
+        Ajoute un morceau à un fichier Parquet (schéma fixé par le premier morceau).
+        
+        Les colonnes de dictionnaires ('characteristics') sont écrites en JSON:
+        leurs clés varient selon le type de bâtiment, alors qu'un struct Arrow
+        fixé par le premier morceau perdrait les clés des morceaux suivants.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = pa.Table.from_pandas(_serialize_nested_columns(df), preserve_index=False)
+        
+        if name not in writers:
+            writers[name] = pq.ParquetWriter(filepath, table.schema, compression=compression_type or 'none')
+        else:
+            # Aligner les types (catégories, colonnes vides) sur le premier morceau
+            table = table.cast(writers[name].schema)
+        
+        writers[name].write_table(table)
+    
     def _export_parquet(self, dataset: Dict[str, pd.DataFrame], 
                        prefix: str, timestamp: str, compression: bool) -> Dict[str, Any]:
         """Exporte en format Parquet."""
@@ -266,7 +385,7 @@ class ExportService:
                     'column_names': df.columns.tolist(),
                     'export_timestamp': datetime.now().isoformat()
                 } if include_metadata else {},
-                'data': df.to_dict('records')
+                'data': timeseries_frame_to_records(df)  # Timestamps en ISO 8601
             }
             
             # Sauvegarde JSON
@@ -503,5 +622,25 @@ class ExportService:
         return files_info
 
 
+# Fonctions utilitaires
+
+def _serialize_nested_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convertit en chaînes JSON les colonnes contenant des dictionnaires ou des listes."""
+    nested = [
+        col for col in df.columns
+        if df[col].dtype == object and any(isinstance(value, (dict, list)) for value in df[col])
+    ]
+    if not nested:
+        return df
+    
+    df = df.copy()
+    for col in nested:
+        df[col] = [
+            json.dumps(value, ensure_ascii=False, default=str) if isinstance(value, (dict, list)) else value
+            for value in df[col]
+        ]
+    return df
+
+
 # Export de la classe principale
 __all__ = ['ExportService']
\ No newline at end of file
@@ -20,19 +20,33 @@ import json
 import time
 import hashlib
 import asyncio
-import aiohttp
-import concurrent.futures
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
-import requests
-import pandas as pd
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Tuple, Optional, Any
 from pathlib import Path
 import pickle
 import gzip
+import numpy as np
 
 from app.models.building import Building
 from app.models.location import Location
+from app.models.osm_building_store import OSMBuildingStore
 from app.utils.validators import validate_coordinates, validate_osm_data
+from app.utils.density_map import TileDensityMap, split_bounds
+from app.utils.endpoint_pool import OverpassEndpointPool, parse_retry_after
+from app.utils.geometry import polygon_metrics
+from app.utils.overpass_stream import OverpassFormatError, OverpassStreamParser
+
+# aiohttp n'est importé qu'à la première requête (voir _create_session)
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class TileSplitRequired(Exception):
+    """Tuile Overpass à subdiviser (réponse trop volumineuse, tronquée ou hors délai)."""
+    
+    def __init__(self, reason: str, building_count: int = 0):
+        super().__init__(reason)
+        self.building_count = building_count
 
 
 class OSMService:
@@ -51,21 +65,23 @@ class OSMService:
         self.logger = logging.getLogger(__name__)
         self.config = config
         
-        # URLs Overpass multiples pour load balancing
-        self.overpass_urls = [
+        # URLs Overpass multiples, routées selon leur santé (latence, erreurs, disjoncteur)
+        self.overpass_urls = list(self._get_config_value('OVERPASS_API_URLS', [
             'https://overpass-api.de/api/interpreter',
             'https://lz4.overpass-api.de/api/interpreter',
             'https://z.overpass-api.de/api/interpreter'
-        ]
-        self.current_url_index = 0
+        ]))
+        self.endpoint_pool = OverpassEndpointPool(self.overpass_urls)
         
         # Configuration ultra-optimisée
         self.timeout = self._get_config_value('OSM_REQUEST_TIMEOUT', 600)  # 10 minutes
         self.max_retries = self._get_config_value('OSM_MAX_RETRIES', 5)
         self.max_concurrent_requests = self._get_config_value('OSM_MAX_CONCURRENT', 10)
         self.chunk_size = self._get_config_value('OSM_CHUNK_SIZE', 0.1)  # Degrés de subdivision
-        self.cache_enabled = True
-        self.cache_duration = timedelta(hours=72)  # Cache 3 jours
+        self.batch_size = self._get_config_value('OSM_BATCH_SIZE', 1000)  # Bâtiments par lot
+        self.stream_read_size = 64 * 1024  # Octets lus par itération du flux HTTP
+        self.cache_enabled = self._get_config_value('OSM_CACHE_ENABLED', True)
+        self.cache_duration = timedelta(hours=self._get_config_value('OSM_CACHE_DURATION_HOURS', 72))  # Cache 3 jours
         
         # Zones Malaysia optimisées
         self.malaysia_bounds = {
@@ -97,6 +113,14 @@ class OSMService:
         self.cache_dir = Path(self.cache_dir) / 'osm_v4'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Subdivision adaptative: quadtree guidé par la densité observée (persistée entre exécutions)
+        self.adaptive_chunking = self._get_config_value('OSM_ENABLE_ADAPTIVE_CHUNKING', True)
+        self.max_buildings_per_request = self._get_config_value('OSM_MAX_BUILDINGS_PER_REQUEST', 50000)
+        self.tile_fill_target = 0.5  # Fraction de max_buildings_per_request visée par tuile planifiée
+        self.max_tile_area = 2.0  # Degrés carrés
+        self.min_tile_size = self.chunk_size / 4  # Côté minimal d'une tuile (degrés)
+        self.density_map = TileDensityMap(self.malaysia_bounds, path=self.cache_dir / 'density_map.npz')
+        
         # Statistiques
         self.reset_stats()
         
@@ -113,7 +137,8 @@ class OSMService:
             'total_buildings': 0,
             'start_time': None,
             'end_time': None,
-            'zones_processed': 0
+            'zones_processed': 0,
+            'tiles_split': 0
         }
     
     async def get_all_buildings_malaysia_async(self) -> List[Dict]:
@@ -121,6 +146,16 @@ class OSMService:
         🚀 MÉTHODE PRINCIPALE: Récupère TOUS les bâtiments de Malaysia.
         Utilise des requêtes parallèles asynchrones pour maximum de performance.
         """
+        store = await self.get_all_buildings_store_async()
+        return store.to_records()
+    
+    async def get_all_buildings_store_async(self) -> OSMBuildingStore:
+        """
+        Récupère TOUS les bâtiments de Malaysia sous forme colonnaire.
+        
+        Returns:
+            OSMBuildingStore dédupliqué par (type, id OSM)
+        """
         self.logger.info("🇲🇾 Début récupération EXHAUSTIVE des bâtiments Malaysia")
         self.reset_stats()
         self.stats['start_time'] = datetime.now()
@@ -134,18 +169,14 @@ class OSMService:
             self.stats['total_buildings'] = len(cached_result)
             return cached_result
         
-        all_buildings = []
-        
         # Méthode 1: Par états (plus rapide et plus fiable)
         buildings_by_states = await self._get_buildings_by_states_async()
-        all_buildings.extend(buildings_by_states)
         
         # Méthode 2: Zones supplémentaires (pour les zones non couvertes)
         additional_buildings = await self._get_buildings_additional_zones_async()
-        all_buildings.extend(additional_buildings)
         
         # Déduplication par OSM ID
-        unique_buildings = self._deduplicate_buildings(all_buildings)
+        unique_buildings = OSMBuildingStore.concat([buildings_by_states, additional_buildings]).deduplicate()
         
         # Sauvegarde en cache
         self._save_to_cache(cache_key, unique_buildings)
@@ -159,13 +190,13 @@ class OSMService:
         
         return unique_buildings
     
-    async def _get_buildings_by_states_async(self) -> List[Dict]:
+    async def _get_buildings_by_states_async(self) -> OSMBuildingStore:
         """Récupère les bâtiments par états Malaysia en parallèle."""
         self.logger.info("🏛️ Récupération par états Malaysia...")
         
         # Créer les tâches pour chaque état
         tasks = []
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+        async with self._create_session() as session:
             for state_name, bounds in self.malaysia_states.items():
                 task = self._get_buildings_for_bounds_async(session, state_name, bounds)
                 tasks.append(task)
@@ -183,13 +214,13 @@ class OSMService:
                 self.logger.error(f"❌ Échec état {state_name}: {result}")
                 self.stats['failed_requests'] += 1
             else:
-                all_buildings.extend(result)
+                all_buildings.append(result)
                 self.stats['zones_processed'] += 1
         
         self.logger.info(f"🏛️ États traités: {self.stats['zones_processed']}/{len(self.malaysia_states)}")
-        return all_buildings
+        return OSMBuildingStore.concat(all_buildings)
     
-    async def _get_buildings_additional_zones_async(self) -> List[Dict]:
+    async def _get_buildings_additional_zones_async(self) -> OSMBuildingStore:
         """Récupère les bâtiments dans les zones supplémentaires (zones maritimes, etc.)."""
         self.logger.info("🌊 Récupération zones supplémentaires...")
         
@@ -202,7 +233,7 @@ class OSMService:
         }
         
         tasks = []
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+        async with self._create_session() as session:
             for zone_name, bounds in additional_zones.items():
                 task = self._get_buildings_for_bounds_async(session, zone_name, bounds)
                 tasks.append(task)
@@ -211,19 +242,22 @@ class OSMService:
             limited_tasks = [self._limited_request(semaphore, task) for task in tasks]
             results = await asyncio.gather(*limited_tasks, return_exceptions=True)
         
-        all_buildings = []
-        for result in results:
-            if not isinstance(result, Exception):
-                all_buildings.extend(result)
+        all_buildings = [result for result in results if not isinstance(result, Exception)]
         
-        return all_buildings
+        return OSMBuildingStore.concat(all_buildings)
+    
+    def _create_session(self) -> 'aiohttp.ClientSession':
+        """Crée la session HTTP asynchrone (import d'aiohttp au premier usage)."""
+        import aiohttp
+        
+        return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
     
     async def _limited_request(self, semaphore, coro):
         """Limite la concurrence des requêtes."""
         async with semaphore:
             return await coro
     
-    async def _get_buildings_for_bounds_async(self, session: aiohttp.ClientSession, zone_name: str, bounds: Dict) -> List[Dict]:
+    async def _get_buildings_for_bounds_async(self, session: 'aiohttp.ClientSession', zone_name: str, bounds: Dict) -> OSMBuildingStore:
         """Récupère les bâtiments pour une zone donnée avec subdivision adaptative."""
         self.logger.debug(f"📍 Traitement zone: {zone_name}")
         
@@ -234,6 +268,15 @@ class OSMService:
             self.stats['cache_hits'] += 1
             return cached_result
         
+        if self.adaptive_chunking:
+            buildings, complete = await self._fetch_adaptive_async(session, zone_name, bounds)
+            self.density_map.save()
+            if complete:
+                self._save_to_cache(cache_key, buildings)
+            else:
+                self.logger.warning(f"⚠️ Zone {zone_name} incomplète (tuiles en échec): non mise en cache")
+            return buildings
+        
         # Calculer la taille de la zone
         area_size = (bounds['north'] - bounds['south']) * (bounds['east'] - bounds['west'])
         
@@ -247,7 +290,83 @@ class OSMService:
         
         return buildings
     
-    async def _subdivide_and_fetch_async(self, session: aiohttp.ClientSession, zone_name: str, bounds: Dict) -> List[Dict]:
+    async def _fetch_adaptive_async(self, session: 'aiohttp.ClientSession', zone_name: str,
+                                    bounds: Dict) -> Tuple[OSMBuildingStore, bool]:
+        """
+        Récupère une zone par tuiles adaptatives (quadtree).
+        
+        Le découpage initial suit la carte de densité: les zones peu denses
+        restent en grandes tuiles, les zones denses sont découpées d'avance.
+        
+        Returns:
+            (bâtiments de la zone, False si au moins une tuile a échoué)
+        """
+        tiles = self.density_map.plan_tiles(
+            bounds,
+            max_buildings=self.max_buildings_per_request * self.tile_fill_target,
+            max_area=self.max_tile_area,
+            min_size=self.min_tile_size
+        )
+        self.logger.debug(f"🧩 Zone {zone_name}: {len(tiles)} tuiles planifiées")
+        
+        tasks = [self._fetch_tile_async(session, f"{zone_name}_t{i}", tile) for i, tile in enumerate(tiles)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return self._merge_tile_results(zone_name, results)
+    
+    async def _fetch_tile_async(self, session: 'aiohttp.ClientSession', tile_name: str,
+                                bounds: Dict) -> Tuple[OSMBuildingStore, bool]:
+        """
+        Récupère une tuile, subdivisée récursivement en quatre si sa réponse
+        est trop volumineuse, tronquée ou hors délai.
+        
+        Returns:
+            (bâtiments de la tuile, False si elle ou une sous-tuile a échoué)
+        """
+        height = bounds['north'] - bounds['south']
+        width = bounds['east'] - bounds['west']
+        can_split = min(height, width) / 2 >= self.min_tile_size
+        
+        try:
+            buildings = await self._request_zone_async(session, tile_name, bounds, can_split=can_split)
+        except TileSplitRequired as e:
+            self.logger.info(f"✂️ Tuile {tile_name} subdivisée: {e}")
+            self.stats['tiles_split'] += 1
+            if e.building_count:
+                self.density_map.observe_minimum(bounds, e.building_count)
+            
+            tasks = [self._fetch_tile_async(session, f"{tile_name}_{i}", sub_bounds)
+                     for i, sub_bounds in enumerate(split_bounds(bounds))]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            return self._merge_tile_results(tile_name, results)
+        
+        if buildings is None:
+            return OSMBuildingStore.empty(), False
+        
+        self.density_map.observe(bounds, buildings.latitude, buildings.longitude)
+        return buildings, True
+    
+    def _merge_tile_results(self, zone_name: str, results: List) -> Tuple[OSMBuildingStore, bool]:
+        """
+        Fusionne les résultats de _fetch_tile_async (asyncio.gather avec return_exceptions).
+        
+        Returns:
+            (bâtiments fusionnés, False si une tuile a échoué ou levé une exception)
+        """
+        stores = []
+        complete = True
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ Tuile en échec dans {zone_name}: {type(result).__name__}: {result}")
+                complete = False
+                continue
+            buildings, tile_complete = result
+            stores.append(buildings)
+            complete = complete and tile_complete
+        
+        return OSMBuildingStore.concat(stores), complete
+    
+    async def _subdivide_and_fetch_async(self, session: 'aiohttp.ClientSession', zone_name: str, bounds: Dict) -> OSMBuildingStore:
         """Subdivise une zone trop grande et récupère en parallèle."""
         self.logger.debug(f"✂️ Subdivision zone: {zone_name}")
         
@@ -276,46 +395,111 @@ class OSMService:
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Consolider
-        all_buildings = []
-        for result in results:
-            if not isinstance(result, Exception):
-                all_buildings.extend(result)
+        all_buildings = [result for result in results if not isinstance(result, Exception)]
         
-        return all_buildings
+        return OSMBuildingStore.concat(all_buildings)
     
-    async def _fetch_single_zone_async(self, session: aiohttp.ClientSession, zone_name: str, bounds: Dict) -> List[Dict]:
+    async def _fetch_single_zone_async(self, session: 'aiohttp.ClientSession', zone_name: str, bounds: Dict) -> OSMBuildingStore:
         """Récupère les bâtiments pour une zone unique."""
+        buildings = await self._request_zone_async(session, zone_name, bounds)
+        return buildings if buildings is not None else OSMBuildingStore.empty()
+    
+    async def _request_zone_async(self, session: 'aiohttp.ClientSession', zone_name: str, bounds: Dict,
+                                  can_split: bool = False) -> Optional[OSMBuildingStore]:
+        """
+        Exécute la requête Overpass d'une zone, avec tentatives et backoff.
+        
+        Args:
+            session: Session HTTP
+            zone_name: Nom de la zone (logs)
+            bounds: Emprise de la zone
+            can_split: Abandonner au profit d'une subdivision si la réponse
+                dépasse max_buildings_per_request, est tronquée ou hors délai
+        
+        Returns:
+            Bâtiments de la zone, ou None si toutes les tentatives ont échoué
+        
+        Raises:
+            TileSplitRequired: Si can_split et la zone doit être subdivisée
+        """
         query = self._build_overpass_query(bounds)
+        gateway_timeouts = 0
         
         for attempt in range(self.max_retries):
+            backoff = None
             try:
-                url = self._get_next_overpass_url()
-                
-                async with session.post(url, data=query, headers={'Content-Type': 'text/plain'}) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        buildings = self._parse_overpass_response(data)
-                        
-                        self.stats['total_requests'] += 1
-                        if attempt > 0:
-                            self.stats['parallel_requests'] += 1
-                        
-                        self.logger.debug(f"✅ Zone {zone_name}: {len(buildings)} bâtiments")
-                        return buildings
-                    else:
-                        error_text = await response.text()
-                        self.logger.warning(f"⚠️ HTTP {response.status} pour {zone_name}: {error_text[:100]}")
+                with self.endpoint_pool.request() as call:
+                    if call.wait > 0:
+                        # Tous les miroirs sont en pause (429) ou disjonctés
+                        await asyncio.sleep(call.wait)
+                    async with session.post(call.url, data=query, headers={'Content-Type': 'text/plain'}) as response:
+                        call.status = response.status
                         
+                        if response.status == 200:
+                            # Lecture en flux: la réponse brute n'est jamais chargée entière,
+                            # chaque lot est converti en colonnes dès sa réception
+                            parser = OverpassStreamParser()
+                            batches = []
+                            received = 0
+                            async for batch in self._stream_buildings_async(response, parser):
+                                batches.append(OSMBuildingStore.from_records(batch))
+                                received += len(batch)
+                                if can_split and received > self.max_buildings_per_request:
+                                    call.succeeded = True  # Le miroir répond: c'est la tuile qui est trop dense
+                                    raise TileSplitRequired(f"plus de {self.max_buildings_per_request} bâtiments", received)
+                            
+                            call.succeeded = True
+                            
+                            # Remarque Overpass = erreur d'exécution, réponse partielle
+                            if can_split and parser.remark:
+                                raise TileSplitRequired(f"réponse tronquée ({parser.remark})", received)
+                            
+                            buildings = OSMBuildingStore.concat(batches)
+                            
+                            self.stats['total_requests'] += 1
+                            if attempt > 0:
+                                self.stats['parallel_requests'] += 1
+                            
+                            self.logger.debug(f"✅ Zone {zone_name}: {len(buildings)} bâtiments")
+                            return buildings
+                        elif response.status == 504 and can_split and gateway_timeouts > 0:
+                            # Second 504 (sur un autre miroir si possible): la tuile est trop lourde
+                            raise TileSplitRequired("HTTP 504 (délai dépassé côté serveur)")
+                        else:
+                            if response.status == 504:
+                                gateway_timeouts += 1
+                            call.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                            error_text = await response.text()
+                            self.logger.warning(f"⚠️ HTTP {response.status} pour {zone_name} ({call.url}): {error_text[:100]}")
+                            backoff = 2 ** attempt
+            
+            except TileSplitRequired:
+                raise
             except Exception as e:
+                # Délai dépassé ou flux tronqué: subdiviser plutôt que réessayer à l'identique
+                # (une page d'erreur servie en 200 est une défaillance du miroir: réessayer)
+                if (can_split and isinstance(e, (asyncio.TimeoutError, ValueError))
+                        and not isinstance(e, OverpassFormatError)):
+                    raise TileSplitRequired(f"réponse hors délai ou tronquée ({type(e).__name__})") from e
+                
                 self.logger.warning(f"⚠️ Tentative {attempt + 1} échec pour {zone_name}: {e}")
                 if attempt < self.max_retries - 1:
                     await asyncio.sleep(2 ** attempt)  # Backoff exponentiel
+            
+            # Hors du bloc `with`: l'attente ne compte pas dans la latence du miroir
+            if backoff is not None and attempt < self.max_retries - 1:
+                await asyncio.sleep(backoff)
         
         self.stats['failed_requests'] += 1
-        return []
+        return None
     
     def _build_overpass_query(self, bounds: Dict) -> str:
-        """Construit une requête Overpass optimisée pour récupérer TOUS les bâtiments."""
+        """
+        Construit une requête Overpass optimisée pour récupérer TOUS les bâtiments.
+        
+        `out geom` inclut la géométrie des ways: la récursion vers les nœuds
+        (._;>;) est inutile et multipliait la taille de la réponse.
+        """
         return f"""
         [out:json][timeout:600];
         (
@@ -326,42 +510,92 @@ class OSMService:
             {bounds['south']},{bounds['west']},{bounds['north']},{bounds['east']}
           );
         );
-        (._;>;);
         out geom meta;
         """
     
-    def _parse_overpass_response(self, data: Dict) -> List[Dict]:
-        """Parse une réponse Overpass et extrait les informations des bâtiments."""
-        buildings = []
+    async def _stream_buildings_async(self, response, parser: Optional[OverpassStreamParser] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Lit le corps d'une réponse Overpass en flux et produit les bâtiments par lots.
         
-        if 'elements' not in data:
-            return buildings
+        La mémoire utilisée reste bornée par la taille d'un morceau lu, d'un
+        élément en cours de décodage et d'un lot de bâtiments.
         
-        # Séparer les nœuds, chemins et relations
-        nodes = {elem['id']: elem for elem in data['elements'] if elem['type'] == 'node'}
-        ways = [elem for elem in data['elements'] if elem['type'] == 'way' and 'tags' in elem and 'building' in elem['tags']]
-        relations = [elem for elem in data['elements'] if elem['type'] == 'relation' and 'tags' in elem and 'building' in elem['tags']]
+        Args:
+            response: Réponse aiohttp (statut 200)
+            parser: Parseur à utiliser (pour consulter sa remarque après lecture)
         
-        # Traiter les ways (la majorité des bâtiments)
-        for way in ways:
-            building = self._parse_way_to_building(way, nodes)
+        Yields:
+            Listes d'au plus batch_size bâtiments (centroïde et surface calculés)
+        """
+        parser = parser or OverpassStreamParser()
+        nodes = {}
+        batch = []
+        
+        async for chunk in response.content.iter_chunked(self.stream_read_size):
+            for element in parser.feed(chunk):
+                building = self._element_to_building(element, nodes)
+                if building:
+                    batch.append(building)
+                    if len(batch) >= self.batch_size:
+                        yield self._apply_polygon_metrics(batch)
+                        batch = []
+        
+        for element in parser.close():
+            building = self._element_to_building(element, nodes)
             if building:
-                buildings.append(building)
+                batch.append(building)
         
-        # Traiter les relations
-        for relation in relations:
-            building = self._parse_relation_to_building(relation)
+        if batch:
+            yield self._apply_polygon_metrics(batch)
+    
+    def _parse_overpass_response(self, data: Dict) -> List[Dict]:
+        """Parse une réponse Overpass et extrait les informations des bâtiments."""
+        buildings = []
+        nodes = {}
+        
+        for element in data.get('elements', []):
+            building = self._element_to_building(element, nodes)
             if building:
                 buildings.append(building)
         
-        return buildings
+        return self._apply_polygon_metrics(buildings)
+    
+    def _element_to_building(self, element: Dict, nodes: Dict) -> Optional[Dict]:
+        """
+        Convertit un élément Overpass en bâtiment.
+        
+        Les nœuds ne sont pas des bâtiments: seules leurs coordonnées sont
+        conservées dans nodes, pour les ways reçus sans géométrie.
+        
+        Args:
+            element: Élément Overpass (node, way ou relation)
+            nodes: Coordonnées des nœuds déjà reçus, complétées en place
+        
+        Returns:
+            Dictionnaire du bâtiment ou None
+        """
+        element_type = element.get('type')
+        
+        if element_type == 'node':
+            if 'lat' in element and 'lon' in element:
+                nodes[element['id']] = {'lat': element['lat'], 'lon': element['lon']}
+            return None
+        
+        if 'building' not in element.get('tags', {}):
+            return None
+        
+        if element_type == 'way':
+            return self._parse_way_to_building(element, nodes)
+        if element_type == 'relation':
+            return self._parse_relation_to_building(element)
+        return None
     
     def _parse_way_to_building(self, way: Dict, nodes: Dict) -> Optional[Dict]:
         """Parse un way OSM en bâtiment."""
         try:
             tags = way.get('tags', {})
             
-            # Calculer le centroïde
+            # Géométrie inline (out geom) ou reconstruite depuis les nœuds
             if 'geometry' in way:
                 coords = way['geometry']
             else:
@@ -375,20 +609,14 @@ class OSMService:
             if not coords:
                 return None
             
-            # Centroïde
-            avg_lat = sum(c['lat'] for c in coords) / len(coords)
-            avg_lon = sum(c['lon'] for c in coords) / len(coords)
-            
-            # Estimation de la surface (approximative)
-            area_sqm = self._calculate_polygon_area(coords)
-            
+            # Centroïde et surface calculés par lot (voir _apply_polygon_metrics)
             return {
                 'osm_id': f"way/{way['id']}",
                 'osm_type': 'way',
-                'latitude': avg_lat,
-                'longitude': avg_lon,
+                'latitude': None,
+                'longitude': None,
                 'building_type': self._classify_building_type(tags),
-                'area_sqm': area_sqm,
+                'area_sqm': None,
                 'levels': self._parse_int_tag(tags.get('building:levels')),
                 'height': self._parse_float_tag(tags.get('height')),
                 'name': tags.get('name'),
@@ -400,7 +628,7 @@ class OSMService:
                 'geometry_type': 'polygon',
                 'coordinates': coords
             }
-            
+        
         except Exception as e:
             self.logger.debug(f"Erreur parsing way {way.get('id')}: {e}")
             return None
@@ -429,7 +657,7 @@ class OSMService:
                 'tags': tags,
                 'geometry_type': 'multipolygon'
             }
-            
+        
         except Exception as e:
             self.logger.debug(f"Erreur parsing relation {relation.get('id')}: {e}")
             return None
@@ -462,29 +690,35 @@ class OSMService:
         
         return type_mapping.get(building_tag.lower(), 'other')
     
-    def _calculate_polygon_area(self, coords: List[Dict]) -> float:
-        """Calcule l'aire approximative d'un polygone en m²."""
-        if len(coords) < 3:
-            return 0
+    def _apply_polygon_metrics(self, buildings: List[Dict]) -> List[Dict]:
+        """
+        Calcule centroïde et surface de tous les ways d'un lot en une passe vectorisée.
         
-        # Formule du lacet (shoelace) adaptée pour lat/lon
-        area = 0
-        n = len(coords)
+        Args:
+            buildings: Bâtiments parsés (modifiés en place)
         
-        for i in range(n):
-            j = (i + 1) % n
-            area += coords[i]['lon'] * coords[j]['lat']
-            area -= coords[j]['lon'] * coords[i]['lat']
+        Returns:
+            Les mêmes bâtiments
+        """
+        polygons = [building for building in buildings if building.get('coordinates')]
+        if not polygons:
+            return buildings
         
-        area = abs(area) / 2.0
+        counts = [len(building['coordinates']) for building in polygons]
+        total = sum(counts)
+        latitudes = np.fromiter((c['lat'] for b in polygons for c in b['coordinates']), dtype=np.float64, count=total)
+        longitudes = np.fromiter((c['lon'] for b in polygons for c in b['coordinates']), dtype=np.float64, count=total)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
         
-        # Conversion approximative en m² (dépend de la latitude)
-        # 1 degré ≈ 111 km au niveau de la Malaysia
-        avg_lat = sum(c['lat'] for c in coords) / len(coords)
-        lat_to_m = 111000
-        lon_to_m = 111000 * abs(math.cos(math.radians(avg_lat)))
+        metrics = polygon_metrics(latitudes, longitudes, offsets)
         
-        return area * lat_to_m * lon_to_m
+        for building, lat, lon, area in zip(polygons, metrics['centroid_lat'].tolist(),
+                                            metrics['centroid_lon'].tolist(), metrics['area_sqm'].tolist()):
+            building['latitude'] = lat
+            building['longitude'] = lon
+            building['area_sqm'] = area
+        
+        return buildings
     
     def _parse_int_tag(self, value: str) -> Optional[int]:
         """Parse un tag entier."""
@@ -506,33 +740,7 @@ class OSMService:
         except:
             return None
     
-    def _deduplicate_buildings(self, buildings: List[Dict]) -> List[Dict]:
-        """Supprime les doublons basés sur OSM ID."""
-        seen_ids = set()
-        unique_buildings = []
-        
-        for building in buildings:
-            osm_id = building.get('osm_id')
-            if osm_id and osm_id not in seen_ids:
-                seen_ids.add(osm_id)
-                unique_buildings.append(building)
-            elif not osm_id:
-                # Bâtiment sans ID, garder quand même
-                unique_buildings.append(building)
-        
-        removed_count = len(buildings) - len(unique_buildings)
-        if removed_count > 0:
-            self.logger.info(f"🔄 Déduplication: {removed_count} doublons supprimés")
-        
-        return unique_buildings
-    
-    def _get_next_overpass_url(self) -> str:
-        """Récupère la prochaine URL Overpass (load balancing)."""
-        url = self.overpass_urls[self.current_url_index]
-        self.current_url_index = (self.current_url_index + 1) % len(self.overpass_urls)
-        return url
-    
-    def _get_from_cache(self, cache_key: str) -> Optional[List[Dict]]:
+    def _get_from_cache(self, cache_key: str) -> Optional[OSMBuildingStore]:
         """Récupère des données du cache compressé."""
         if not self.cache_enabled:
             return None
@@ -546,13 +754,16 @@ class OSMService:
                 if datetime.now() - file_time < self.cache_duration:
                     with gzip.open(cache_file, 'rb') as f:
                         data = pickle.load(f)
+                    # Anciens caches: liste de dictionnaires
+                    if isinstance(data, list):
+                        data = OSMBuildingStore.from_records(data)
                     return data
         except Exception as e:
             self.logger.warning(f"Erreur lecture cache {cache_key}: {e}")
         
         return None
     
-    def _save_to_cache(self, cache_key: str, data: List[Dict]):
+    def _save_to_cache(self, cache_key: str, data: OSMBuildingStore):
         """Sauvegarde des données dans le cache compressé."""
         if not self.cache_enabled or not data:
             return
@@ -583,6 +794,7 @@ class OSMService:
         self.logger.info(f"   💾 Cache hits: {self.stats['cache_hits']}")
         self.logger.info(f"   ❌ Échecs: {self.stats['failed_requests']}")
         self.logger.info(f"   🗺️  Zones traitées: {self.stats['zones_processed']}")
+        self.logger.info(f"   ✂️ Tuiles subdivisées: {self.stats['tiles_split']}")
         
         if duration > 0:
             rate = self.stats['total_buildings'] / duration
@@ -593,6 +805,10 @@ class OSMService:
         """Version synchrone de la récupération exhaustive."""
         return asyncio.run(self.get_all_buildings_malaysia_async())
     
+    def get_all_buildings_store(self) -> OSMBuildingStore:
+        """Version synchrone de la récupération exhaustive (format colonnaire)."""
+        return asyncio.run(self.get_all_buildings_store_async())
+    
     def get_buildings_for_city(self, city: str, limit: Optional[int] = None) -> List[Dict]:
         """Récupère les bâtiments pour une ville spécifique."""
         if city.lower() == 'malaysia':
@@ -602,11 +818,16 @@ class OSMService:
         city_lower = city.lower().replace(' ', '_')
         if city_lower in self.malaysia_states:
             bounds = self.malaysia_states[city_lower]
-            return asyncio.run(self._get_buildings_for_bounds_async(None, city_lower, bounds))
+            return asyncio.run(self._get_buildings_for_state_async(city_lower, bounds)).to_records()
         
         # Sinon, requête classique par nom de ville
         return self._get_buildings_by_city_name(city, limit)
     
+    async def _get_buildings_for_state_async(self, state_name: str, bounds: Dict) -> OSMBuildingStore:
+        """Récupère les bâtiments d'un état avec sa propre session HTTP."""
+        async with self._create_session() as session:
+            return await self._get_buildings_for_bounds_async(session, state_name, bounds)
+    
     def _get_buildings_by_city_name(self, city: str, limit: Optional[int]) -> List[Dict]:
         """Récupération classique par nom de ville (fallback)."""
         # Cette méthode peut être implémentée pour les villes non définies
@@ -617,6 +838,10 @@ class OSMService:
         """Retourne les statistiques actuelles."""
         return self.stats.copy()
     
+    def get_endpoint_stats(self) -> List[Dict]:
+        """Retourne l'état de chaque miroir Overpass (latence, erreurs, disjoncteur)."""
+        return self.endpoint_pool.get_stats()
+    
     def clear_cache(self):
         """Vide le cache."""
         try:
@@ -636,5 +861,7 @@ class OSMService:
             'total_size_bytes': total_size,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'cache_enabled': self.cache_enabled,
-            'cache_duration_hours': self.cache_duration.total_seconds() / 3600
+            'cache_duration_hours': self.cache_duration.total_seconds() / 3600,
+            'adaptive_chunking': self.adaptive_chunking,
+            'density_map': self.density_map.get_info()
         }
\ No newline at end of file
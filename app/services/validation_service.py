@@ -17,7 +17,7 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 
 
 class ValidationService:
@@ -135,6 +135,76 @@ class ValidationService:
             validation_results['errors'].append(str(e))
             return validation_results
     
+    def validate_dataset_chunks(self, chunks: Iterable[Tuple[pd.DataFrame, pd.DataFrame]]) -> Dict:
+        """
+        Valide un dataset produit par morceaux (voir iter_dataset_chunks).
+        
+        Les indicateurs sont agrégés morceau par morceau (compteurs, sommes,
+        moyennes par heure/jour/mois) sans conserver les données, et le
+        résultat a la même structure que validate_complete_dataset. Chaque
+        morceau doit contenir toutes les observations de ses bâtiments.
+        Les anomalies sont détectées avec la moyenne et l'écart-type cumulés
+        jusqu'au morceau courant (approximation en une passe).
+        
+        Args:
+            chunks: Itérable de tuples (buildings_chunk, timeseries_chunk)
+            
+        Returns:
+            Dictionnaire avec les résultats de validation
+        """
+        self.logger.info("🔍 Validation du dataset par morceaux")
+        
+        validation_results = {
+            'validation_timestamp': datetime.now().isoformat(),
+            'overall_status': 'unknown',
+            'score': 0.0,
+            'buildings_validation': {},
+            'timeseries_validation': {},
+            'cross_validation': {},
+            'quality_metrics': {},
+            'recommendations': [],
+            'warnings': [],
+            'errors': []
+        }
+        
+        try:
+            accumulator = self._new_chunk_accumulator()
+            for buildings_chunk, timeseries_chunk in chunks:
+                self._accumulate_chunk(accumulator, buildings_chunk, timeseries_chunk)
+            
+            validation_results.update(self._finalize_chunk_accumulator(accumulator))
+            
+            overall_score = self._calculate_overall_score(validation_results)
+            validation_results['score'] = overall_score
+            
+            if overall_score >= 90:
+                validation_results['overall_status'] = 'excellent'
+            elif overall_score >= 75:
+                validation_results['overall_status'] = 'good'
+            elif overall_score >= 60:
+                validation_results['overall_status'] = 'acceptable'
+            else:
+                validation_results['overall_status'] = 'poor'
+            
+            validation_results['recommendations'] = self._generate_recommendations(validation_results)
+            
+            self.validation_stats['total_validations'] += 1
+            if overall_score >= 60:
+                self.validation_stats['passed_validations'] += 1
+            else:
+                self.validation_stats['failed_validations'] += 1
+            
+            self.logger.info(f"✅ Validation terminée ({accumulator['chunks']} morceaux) - "
+                             f"Score: {overall_score:.1f}% - Statut: {validation_results['overall_status']}")
+            
+            return validation_results
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors de la validation par morceaux: {e}")
+            validation_results['overall_status'] = 'error'
+            validation_results['errors'].append(str(e))
+            return validation_results
+    
     def validate_buildings_metadata(self, buildings_df: pd.DataFrame) -> Dict:
         """
         Valide les métadonnées des bâtiments.
@@ -559,6 +629,254 @@ class ValidationService:
         
         return patterns
     
+    def _new_chunk_accumulator(self) -> Dict:
+        """Crée l'accumulateur d'indicateurs pour la validation par morceaux."""
+        return {
+            'chunks': 0,
+            # Bâtiments
+            'buildings': 0,
+            'valid_buildings': 0,
+            'valid_coordinates': 0,
+            'malaysia_bounds': 0,
+            'building_cells': 0,
+            'building_nulls': {},
+            'type_counts': {},
+            'coordinates_seen': set(),
+            'duplicate_coordinates': 0,
+            'building_ids': set(),
+            'building_types': {},
+            # Séries temporelles
+            'observations': 0,
+            'valid_observations': 0,
+            'timeseries_cells': 0,
+            'timeseries_nulls': 0,
+            'timeseries_ids': set(),
+            'negative_values': 0,
+            'zero_values': 0,
+            'extreme_values': 0,
+            'non_numeric': False,
+            'duplicate_timestamps': 0,
+            'latest_timestamp': None,
+            'sum': 0.0,
+            'sum_squares': 0.0,
+            'anomalies': [],
+            'hour_sums': np.zeros(24), 'hour_counts': np.zeros(24),
+            'weekday_sums': np.zeros(7), 'weekday_counts': np.zeros(7),
+            'month_sums': np.zeros(13), 'month_counts': np.zeros(13),
+            'rule_observations': {},
+            'rule_violations': {}
+        }
+    
+    def _accumulate_chunk(self, acc: Dict, buildings_df: pd.DataFrame, timeseries_df: pd.DataFrame):
+        """Ajoute les indicateurs d'un morceau à l'accumulateur."""
+        thresholds = self.validation_thresholds
+        acc['chunks'] += 1
+        
+        # Bâtiments
+        acc['buildings'] += len(buildings_df)
+        acc['building_cells'] += buildings_df.size
+        for column, missing in buildings_df.isnull().sum().items():
+            acc['building_nulls'][column] = acc['building_nulls'].get(column, 0) + int(missing)
+        
+        coords_ok = (buildings_df['latitude'].between(-90, 90) &
+                     buildings_df['longitude'].between(-180, 180))
+        acc['valid_coordinates'] += int(coords_ok.sum())
+        acc['malaysia_bounds'] += int((coords_ok &
+                                       buildings_df['latitude'].between(0.5, 7.5) &
+                                       buildings_df['longitude'].between(99.0, 120.0)).sum())
+        for coordinates in zip(buildings_df['latitude'], buildings_df['longitude']):
+            if coordinates in acc['coordinates_seen']:
+                acc['duplicate_coordinates'] += 1
+            else:
+                acc['coordinates_seen'].add(coordinates)
+        
+        classes = buildings_df['building_class'] if 'building_class' in buildings_df.columns else pd.Series(dtype=object)
+        for building_type, count in classes.value_counts().items():
+            acc['type_counts'][building_type] = acc['type_counts'].get(building_type, 0) + int(count)
+        if 'building_class' in buildings_df.columns:
+            valid_mask = (coords_ok & buildings_df['unique_id'].notna() &
+                          classes.isin(['residential', 'commercial', 'industrial', 'public']))
+            acc['valid_buildings'] += int(valid_mask.sum())
+            acc['building_types'].update(zip(buildings_df['unique_id'], classes))
+        acc['building_ids'].update(buildings_df['unique_id'].unique())
+        
+        # Séries temporelles
+        consumption_col = 'y' if 'y' in timeseries_df.columns else 'consumption_kwh'
+        values = timeseries_df[consumption_col]
+        if not pd.api.types.is_numeric_dtype(values):
+            acc['non_numeric'] = True
+        values = values.to_numpy(dtype=float)
+        
+        acc['observations'] += len(timeseries_df)
+        acc['timeseries_cells'] += timeseries_df.size
+        acc['timeseries_nulls'] += int(timeseries_df.isnull().sum().sum())
+        acc['timeseries_ids'].update(timeseries_df['unique_id'].unique())
+        
+        in_range = (values >= thresholds['min_consumption_kwh']) & (values <= thresholds['max_consumption_kwh'])
+        acc['valid_observations'] += int((in_range & timeseries_df['unique_id'].notna().to_numpy()).sum())
+        acc['negative_values'] += int((values < 0).sum())
+        acc['zero_values'] += int((values == 0).sum())
+        acc['extreme_values'] += int((~in_range).sum())
+        acc['sum'] += float(values.sum())
+        acc['sum_squares'] += float(np.square(values).sum())
+        
+        # Anomalies (z-score sur les statistiques cumulées)
+        if len(acc['anomalies']) < 100 and acc['observations'] > 1:
+            mean = acc['sum'] / acc['observations']
+            std = np.sqrt(max(acc['sum_squares'] / acc['observations'] - mean ** 2, 0.0))
+            if std > 0:
+                z_scores = np.abs((values - mean) / std)
+                for position in np.flatnonzero(z_scores > thresholds['outlier_z_score'])[:100 - len(acc['anomalies'])]:
+                    row = timeseries_df.iloc[position]
+                    acc['anomalies'].append({
+                        'type': 'statistical_outlier',
+                        'unique_id': row['unique_id'],
+                        'timestamp': row.get('timestamp'),
+                        'value': values[position],
+                        'z_score': z_scores[position]
+                    })
+        
+        # Règles énergétiques par type de bâtiment
+        building_classes = timeseries_df['unique_id'].map(acc['building_types'])
+        for building_type, max_consumption in self.energy_rules.items():
+            type_mask = (building_classes == building_type).to_numpy()
+            count = int(type_mask.sum())
+            if count:
+                acc['rule_observations'][building_type] = acc['rule_observations'].get(building_type, 0) + count
+                acc['rule_violations'][building_type] = (acc['rule_violations'].get(building_type, 0) +
+                                                          int((values[type_mask] > max_consumption).sum()))
+        
+        # Cohérence temporelle et patterns
+        if 'timestamp' in timeseries_df.columns:
+            timestamps = pd.to_datetime(timeseries_df['timestamp'])
+            acc['duplicate_timestamps'] += int(timeseries_df.duplicated(subset=['unique_id', 'timestamp']).sum())
+            
+            chunk_latest = timestamps.max()
+            if acc['latest_timestamp'] is None or chunk_latest > acc['latest_timestamp']:
+                acc['latest_timestamp'] = chunk_latest
+            
+            for key, component, size in (('hour', timestamps.dt.hour, 24),
+                                         ('weekday', timestamps.dt.dayofweek, 7),
+                                         ('month', timestamps.dt.month, 13)):
+                component = component.to_numpy()
+                acc[f'{key}_sums'] += np.bincount(component, weights=values, minlength=size)
+                acc[f'{key}_counts'] += np.bincount(component, minlength=size)
+    
+    def _finalize_chunk_accumulator(self, acc: Dict) -> Dict:
+        """Convertit l'accumulateur en résultats de validation."""
+        n_buildings = acc['buildings']
+        n_observations = acc['observations']
+        
+        # Bâtiments
+        valid_types = {t: c for t, c in acc['type_counts'].items()
+                       if t in ['residential', 'commercial', 'industrial', 'public']}
+        type_distribution = {
+            'valid_types': valid_types,
+            'invalid_types': {t: c for t, c in acc['type_counts'].items() if t not in valid_types},
+            'distribution_score': 0.0
+        }
+        if valid_types:
+            type_percentages = [count / sum(valid_types.values()) for count in valid_types.values()]
+            type_distribution['distribution_score'] = max(0, 100 - (np.std(type_percentages) * 200))
+        
+        buildings_validation = {
+            'total_buildings': n_buildings,
+            'valid_buildings': acc['valid_buildings'],
+            'issues': [],
+            'completeness': {
+                column: {
+                    'percentage': ((n_buildings - missing) / n_buildings) * 100 if n_buildings > 0 else 0,
+                    'missing_count': missing
+                }
+                for column, missing in acc['building_nulls'].items()
+            },
+            'geographic_validation': {
+                'valid_coordinates': acc['valid_coordinates'],
+                'invalid_coordinates': n_buildings - acc['valid_coordinates'],
+                'malaysia_bounds_check': acc['malaysia_bounds'],
+                'duplicate_coordinates': acc['duplicate_coordinates']
+            },
+            'type_distribution': type_distribution
+        }
+        
+        # Séries temporelles
+        def _has_variation(sums, counts, threshold):
+            averages = sums[counts > 0] / counts[counts > 0]
+            return len(averages) > 1 and averages.mean() > 0 and averages.std(ddof=1) / averages.mean() > threshold
+        
+        timeseries_validation = {
+            'total_observations': n_observations,
+            'valid_observations': acc['valid_observations'],
+            'temporal_validation': {
+                'temporal_gaps': 0,
+                'duplicate_timestamps': acc['duplicate_timestamps'],
+                'chronological_order': True,
+                'frequency_consistency': True
+            },
+            'consumption_validation': {
+                'negative_values': acc['negative_values'],
+                'zero_values': acc['zero_values'],
+                'extreme_values': acc['extreme_values'],
+                'valid_range_percentage': ((n_observations - acc['extreme_values']) / n_observations) * 100
+                                          if n_observations > 0 else 0.0
+            },
+            'anomalies': acc['anomalies'],
+            'patterns_detected': {
+                'daily_pattern_detected': bool(_has_variation(acc['hour_sums'], acc['hour_counts'], 0.2)),
+                'weekly_pattern_detected': bool(_has_variation(acc['weekday_sums'], acc['weekday_counts'], 0.1)),
+                'seasonal_variation': bool((acc['month_counts'] > 0).sum() > 3 and
+                                           _has_variation(acc['month_sums'], acc['month_counts'], 0.15))
+            }
+        }
+        
+        # Références croisées
+        with_data = len(acc['building_ids'] & acc['timeseries_ids'])
+        cross_validation = {
+            'buildings_with_data': with_data,
+            'orphaned_timeseries': len(acc['timeseries_ids'] - acc['building_ids']),
+            'missing_buildings': list(acc['building_ids'] - acc['timeseries_ids']),
+            'reference_integrity': (with_data / len(acc['building_ids'])) * 100 if acc['building_ids'] else 100.0
+        }
+        
+        # Métriques de qualité
+        total_cells = acc['building_cells'] + acc['timeseries_cells']
+        null_cells = sum(acc['building_nulls'].values()) + acc['timeseries_nulls']
+        
+        consistency_score = 100.0
+        if acc['non_numeric']:
+            consistency_score -= 20
+        
+        accuracy_consumption = ((n_observations - acc['extreme_values']) / n_observations * 100
+                                if n_observations > 0 else 0.0)
+        accuracy_coords = acc['valid_coordinates'] / n_buildings * 100 if n_buildings > 0 else 0.0
+        
+        if acc['latest_timestamp'] is not None:
+            days_old = (datetime.now() - acc['latest_timestamp'].replace(tzinfo=None)).days
+            timeliness = max(0, 100 - (days_old / 30) * 10)
+        else:
+            timeliness = 100
+        
+        validity_score = 100.0
+        for building_type, observations in acc['rule_observations'].items():
+            violations = acc['rule_violations'].get(building_type, 0)
+            if violations > 0:
+                validity_score -= (violations / observations) * 20
+        
+        quality_metrics = {
+            'completeness': ((total_cells - null_cells) / total_cells) * 100 if total_cells > 0 else 0.0,
+            'consistency': max(0, consistency_score),
+            'accuracy': (accuracy_consumption + accuracy_coords) / 2,
+            'timeliness': timeliness,
+            'validity': max(0, validity_score)
+        }
+        
+        return {
+            'buildings_validation': buildings_validation,
+            'timeseries_validation': timeseries_validation,
+            'cross_validation': cross_validation,
+            'quality_metrics': quality_metrics
+        }
+    
     def _calculate_overall_score(self, validation_results: Dict) -> float:
         """Calcule le score global de validation."""
         scores = []
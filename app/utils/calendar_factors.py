@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CALENDRIER ÉNERGÉTIQUE - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/calendar_factors.py
+
+Facteurs calendaires (jours fériés, Ramadan, weekend, saisons) calculés une
+fois par plage temporelle et mis en cache. Ces facteurs ne dépendent que de
+la date: tous les bâtiments d'une requête, et les requêtes répétées sur la
+même période, réutilisent les mêmes vecteurs.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 3.0 - Patterns tropicaux
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+
+
+# Dates approximatives de Ramadan (se décale de ~11 jours chaque année)
+RAMADAN_PERIODS = {
+    2024: (datetime(2024, 3, 10), datetime(2024, 4, 9)),
+    2025: (datetime(2025, 2, 28), datetime(2025, 3, 30)),
+    2026: (datetime(2026, 2, 17), datetime(2026, 3, 19)),
+}
+
+# Jours fériés fixes approximatifs (mois, jour)
+FIXED_PUBLIC_HOLIDAYS = frozenset([
+    (1, 1),   # Nouvel An
+    (2, 1),   # Fête Fédérale
+    (5, 1),   # Fête du Travail
+    (6, 5),   # Anniversaire du Roi (approximatif)
+    (8, 31),  # Fête Nationale
+    (9, 16),  # Jour de la Malaysia
+    (12, 25), # Noël
+])
+
+# Effet d'un jour férié selon le type de bâtiment
+HOLIDAY_FACTORS = {
+    'commercial': 0.2,   # Magasins fermés
+    'public': 0.3,       # Services réduits
+    'residential': 1.1   # Plus à la maison
+}
+
+DEFAULT_CACHE_SIZE = 64
+
+
+class CalendarFactors:
+    """
+    Composant calendaire partagé par les générateurs de patterns.
+    
+    Deux niveaux de cache LRU:
+    - composantes de la plage (heure, mois, jour de semaine, masques
+      Ramadan et jours fériés), indépendantes du type de bâtiment
+    - vecteurs de facteurs par (plage, type de bâtiment)
+    
+    Les arrays retournés sont en lecture seule car partagés entre appels.
+    """
+    
+    def __init__(self, base_patterns: Dict[str, Dict], seasonal_variations: Dict[int, float],
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialise le calendrier.
+        
+        Args:
+            base_patterns: Patterns de base par type (weekend_factor, ramadan_factor)
+            seasonal_variations: Facteur saisonnier par mois (1-12)
+            cache_size: Nombre maximal de plages (et de couples plage/type) en cache
+        """
+        self.logger = logging.getLogger(__name__)
+        self.base_patterns = base_patterns
+        self.cache_size = cache_size
+        
+        # Facteur saisonnier indexé par numéro de mois
+        self._seasonal_lookup = np.ones(13)
+        for month, factor in seasonal_variations.items():
+            self._seasonal_lookup[month] = factor
+        
+        self._components_cache = OrderedDict()
+        self._factors_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+    
+    def get_components(self, date_range: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        """
+        Retourne les composantes calendaires d'une plage temporelle.
+        
+        Args:
+            date_range: Plage temporelle
+        
+        Returns:
+            Dictionnaire avec 'hours', 'months', 'weekdays', 'is_ramadan', 'is_holiday'
+        """
+        key = range_cache_key(date_range)
+        cached = self._cache_get(self._components_cache, key)
+        if cached is not None:
+            return cached
+        
+        # Comparaisons en heure locale (sans fuseau)
+        local_range = date_range.tz_localize(None) if date_range.tz is not None else date_range
+        
+        months = np.asarray(local_range.month)
+        month_day = months * 100 + np.asarray(local_range.day)
+        
+        is_ramadan = np.zeros(len(local_range), dtype=bool)
+        for start, end in RAMADAN_PERIODS.values():
+            is_ramadan |= np.asarray((local_range >= start) & (local_range <= end))
+        
+        components = {
+            'hours': np.asarray(local_range.hour),
+            'months': months,
+            'weekdays': np.asarray(local_range.dayofweek),
+            'is_ramadan': is_ramadan,
+            'is_holiday': np.isin(month_day, [month * 100 + day for month, day in FIXED_PUBLIC_HOLIDAYS])
+        }
+        
+        return self._cache_put(self._components_cache, key, components)
+    
+    def get_factors(self, building_type: str, date_range: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        """
+        Retourne les vecteurs de facteurs calendaires pour un type de bâtiment.
+        
+        Args:
+            building_type: Type de bâtiment
+            date_range: Plage temporelle
+        
+        Returns:
+            Dictionnaire avec 'seasonal', 'weekend', 'ramadan', 'holiday'
+            et 'special' (Ramadan × jours fériés)
+        """
+        if building_type not in self.base_patterns:
+            building_type = 'residential'  # Fallback
+        
+        key = (building_type, range_cache_key(date_range))
+        cached = self._cache_get(self._factors_cache, key)
+        if cached is not None:
+            return cached
+        
+        base_pattern = self.base_patterns[building_type]
+        components = self.get_components(date_range)
+        
+        ramadan = np.where(components['is_ramadan'], base_pattern['ramadan_factor'], 1.0)
+        holiday = np.where(components['is_holiday'], HOLIDAY_FACTORS.get(building_type, 1.0), 1.0)
+        
+        factors = {
+            'seasonal': self._seasonal_lookup[components['months']],
+            'weekend': np.where(components['weekdays'] >= 5, base_pattern['weekend_factor'], 1.0),
+            'ramadan': ramadan,
+            'holiday': holiday,
+            'special': ramadan * holiday
+        }
+        
+        return self._cache_put(self._factors_cache, key, factors)
+    
+    def clear_cache(self):
+        """Vide les caches du calendrier."""
+        with self._lock:
+            self._components_cache.clear()
+            self._factors_cache.clear()
+    
+    def get_cache_info(self) -> Dict[str, int]:
+        """Retourne l'état des caches."""
+        with self._lock:
+            return {
+                'hits': self.cache_stats['hits'],
+                'misses': self.cache_stats['misses'],
+                'ranges_cached': len(self._components_cache),
+                'factors_cached': len(self._factors_cache),
+                'max_size': self.cache_size
+            }
+    
+    def _cache_get(self, cache: OrderedDict, key: Hashable):
+        """Lit une entrée du cache LRU (None si absente)."""
+        with self._lock:
+            value = cache.get(key)
+            if value is None:
+                self.cache_stats['misses'] += 1
+                return None
+            cache.move_to_end(key)
+            self.cache_stats['hits'] += 1
+            return value
+    
+    def _cache_put(self, cache: OrderedDict, key: Hashable, value: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Ajoute une entrée au cache LRU en figeant ses arrays."""
+        for array in value.values():
+            array.setflags(write=False)
+        
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        
+        return value
+
+
+# Fonctions utilitaires
+
+def range_cache_key(date_range: pd.DatetimeIndex) -> Tuple:
+    """
+    Calcule une clé de cache pour une plage temporelle.
+    
+    Une plage régulière est identifiée par (début, longueur, fréquence,
+    dtype avec fuseau); une plage irrégulière par l'empreinte de ses timestamps.
+    
+    Args:
+        date_range: Plage temporelle
+    
+    Returns:
+        Tuple hashable
+    """
+    dtype = str(date_range.dtype)
+    if date_range.freq is not None and len(date_range) > 0:
+        return ('regular', int(date_range.asi8[0]), len(date_range), date_range.freqstr, dtype)
+    
+    digest = hashlib.blake2b(np.ascontiguousarray(date_range.asi8).tobytes(), digest_size=16).hexdigest()
+    return ('irregular', len(date_range), digest, dtype)
+
+
+# Export des classes et fonctions
+__all__ = [
+    'CalendarFactors',
+    'range_cache_key',
+    'RAMADAN_PERIODS',
+    'FIXED_PUBLIC_HOLIDAYS',
+    'HOLIDAY_FACTORS'
+]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CARTE DE DENSITÉ OSM - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/density_map.py
+
+Carte de densité des bâtiments apprise à partir des réponses Overpass, et
+découpage adaptatif (quadtree) des zones à récupérer. La carte est une
+grille régulière: pour chaque cellule, le nombre de bâtiments observés et la
+fraction de cellule couverte par les tuiles récupérées. Elle est sauvegardée
+entre deux exécutions pour planifier d'emblée des tuiles adaptées: grandes
+dans les zones peu denses, fines en ville.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 4.0 - Ultra-optimisé pour récupération complète
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+
+# Taille des cellules de la grille (degrés)
+DEFAULT_CELL_SIZE = 0.02
+
+# Poids des observations des exécutions précédentes au chargement
+HISTORY_DECAY = 0.5
+
+# Fraction minimale de la tuile couverte par des cellules connues pour estimer sa densité
+MIN_KNOWN_FRACTION = 0.5
+
+
+class TileDensityMap:
+    """
+    Grille de densité de bâtiments (bâtiments par cellule complète).
+    
+    Les observations s'accumulent: densité = bâtiments observés / couverture,
+    ce qui moyenne les tuiles qui se chevauchent (ex: Kuala Lumpur dans Selangor).
+    """
+    
+    def __init__(self, bounds: Dict[str, float], cell_size: float = DEFAULT_CELL_SIZE,
+                 path: Optional[Path] = None):
+        """
+        Initialise la carte (et recharge la sauvegarde si elle existe).
+        
+        Args:
+            bounds: Emprise de la grille (south, west, north, east)
+            cell_size: Taille des cellules en degrés
+            path: Fichier .npz de sauvegarde
+        """
+        self.logger = logging.getLogger(__name__)
+        self.bounds = dict(bounds)
+        self.cell_size = cell_size
+        self.path = Path(path) if path else None
+        
+        self.rows = int(np.ceil((bounds['north'] - bounds['south']) / cell_size))
+        self.cols = int(np.ceil((bounds['east'] - bounds['west']) / cell_size))
+        self.counts = np.zeros((self.rows, self.cols))
+        self.coverage = np.zeros((self.rows, self.cols))
+        
+        if self.path and self.path.exists():
+            self.load()
+    
+    def observe(self, bounds: Dict[str, float], latitudes, longitudes):
+        """
+        Enregistre une tuile récupérée entièrement.
+        
+        Args:
+            bounds: Emprise de la tuile
+            latitudes: Latitudes des bâtiments reçus
+            longitudes: Longitudes des bâtiments reçus
+        """
+        rows, cols, fractions = self._overlap(bounds)
+        if fractions is None:
+            return
+        
+        # Seuls les centroïdes dans la tuile comptent (Overpass renvoie aussi
+        # les bâtiments qui débordent de l'emprise)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        in_tile = ((latitudes >= bounds['south']) & (latitudes < bounds['north'])
+                   & (longitudes >= bounds['west']) & (longitudes < bounds['east']))
+        
+        row_index, col_index = self._cell_index(latitudes[in_tile], longitudes[in_tile])
+        inside = (row_index >= rows.start) & (row_index < rows.stop) & (col_index >= cols.start) & (col_index < cols.stop)
+        histogram = np.zeros(fractions.shape)
+        np.add.at(histogram, (row_index[inside] - rows.start, col_index[inside] - cols.start), 1)
+        
+        self.counts[rows, cols] += histogram
+        self.coverage[rows, cols] += fractions
+    
+    def observe_minimum(self, bounds: Dict[str, float], building_count: int):
+        """
+        Enregistre une borne inférieure (tuile abandonnée après building_count bâtiments).
+        
+        Les bâtiments sont répartis uniformément sur la tuile.
+        
+        Args:
+            bounds: Emprise de la tuile
+            building_count: Nombre de bâtiments déjà reçus
+        """
+        rows, cols, fractions = self._overlap(bounds)
+        if fractions is None:
+            return
+        
+        self.counts[rows, cols] += fractions * (building_count / fractions.sum())
+        self.coverage[rows, cols] += fractions
+    
+    def estimate(self, bounds: Dict[str, float]) -> Optional[float]:
+        """
+        Estime le nombre de bâtiments d'une tuile.
+        
+        Args:
+            bounds: Emprise de la tuile
+        
+        Returns:
+            Nombre estimé, ou None si la tuile est trop peu connue
+        """
+        rows, cols, fractions = self._overlap(bounds)
+        if fractions is None:
+            return 0.0
+        
+        coverage = self.coverage[rows, cols]
+        known = coverage > 0
+        known_fraction = fractions[known].sum() / fractions.sum()
+        if known_fraction < MIN_KNOWN_FRACTION:
+            return None
+        
+        density = self.counts[rows, cols][known] / coverage[known]
+        estimate = float((density * fractions[known]).sum())
+        
+        # Extrapolation aux cellules inconnues de la tuile
+        return estimate / known_fraction
+    
+    def plan_tiles(self, bounds: Dict[str, float], max_buildings: float, max_area: float,
+                   min_size: float) -> List[Dict[str, float]]:
+        """
+        Découpe une zone en tuiles (quadtree) selon la densité connue.
+        
+        Une tuile est divisée en quatre tant que son aire dépasse max_area ou
+        que son estimation dépasse max_buildings, sans descendre sous min_size.
+        Les zones peu denses restent ainsi regroupées en grandes tuiles.
+        
+        Args:
+            bounds: Zone à découper
+            max_buildings: Nombre de bâtiments visé par tuile
+            max_area: Aire maximale d'une tuile (degrés carrés)
+            min_size: Côté minimal d'une tuile (degrés)
+        
+        Returns:
+            Liste d'emprises
+        """
+        tiles = []
+        pending = [bounds]
+        
+        while pending:
+            tile = pending.pop()
+            height = tile['north'] - tile['south']
+            width = tile['east'] - tile['west']
+            
+            estimate = self.estimate(tile)
+            too_large = height * width > max_area or (estimate is not None and estimate > max_buildings)
+            
+            if too_large and min(height, width) / 2 >= min_size:
+                pending.extend(split_bounds(tile))
+            else:
+                tiles.append(tile)
+        
+        return tiles
+    
+    def load(self):
+        """Recharge la carte sauvegardée (observations anciennes atténuées)."""
+        try:
+            with np.load(self.path) as saved:
+                if saved['counts'].shape != self.counts.shape or float(saved['cell_size']) != self.cell_size:
+                    self.logger.warning("⚠️ Carte de densité incompatible ignorée")
+                    return
+                self.counts = saved['counts'] * HISTORY_DECAY
+                self.coverage = saved['coverage'] * HISTORY_DECAY
+            self.logger.info(f"🗺️ Carte de densité chargée: {int((self.coverage > 0).sum())} cellules connues")
+        except Exception as e:
+            self.logger.warning(f"Erreur lecture carte de densité: {e}")
+    
+    def save(self):
+        """Sauvegarde la carte."""
+        if not self.path:
+            return
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                np.savez_compressed(f, counts=self.counts, coverage=self.coverage, cell_size=self.cell_size)
+        except Exception as e:
+            self.logger.warning(f"Erreur écriture carte de densité: {e}")
+    
+    def get_info(self) -> Dict:
+        """Retourne un résumé de la carte."""
+        known = self.coverage > 0
+        return {
+            'cell_size_degrees': self.cell_size,
+            'cells': int(self.counts.size),
+            'known_cells': int(known.sum()),
+            'max_density_per_cell': round(float((self.counts[known] / self.coverage[known]).max()), 1) if known.any() else 0
+        }
+    
+    def _cell_index(self, latitudes: np.ndarray, longitudes: np.ndarray):
+        """Indices (ligne, colonne) des cellules contenant les points."""
+        rows = np.floor((latitudes - self.bounds['south']) / self.cell_size).astype(np.int64)
+        cols = np.floor((longitudes - self.bounds['west']) / self.cell_size).astype(np.int64)
+        return rows, cols
+    
+    def _overlap(self, bounds: Dict[str, float]):
+        """
+        Fractions de chaque cellule couvertes par une emprise.
+        
+        Returns:
+            Tuple (slice des lignes, slice des colonnes, fractions) ou
+            (None, None, None) si l'emprise est hors de la grille
+        """
+        row_fractions, rows = _axis_overlap(bounds['south'], bounds['north'], self.bounds['south'], self.cell_size, self.rows)
+        col_fractions, cols = _axis_overlap(bounds['west'], bounds['east'], self.bounds['west'], self.cell_size, self.cols)
+        if rows is None or cols is None:
+            return None, None, None
+        
+        fractions = np.outer(row_fractions, col_fractions)
+        if fractions.sum() <= 0:
+            return None, None, None
+        return rows, cols, fractions
+
+
+# Fonctions utilitaires
+
+def split_bounds(bounds: Dict[str, float]) -> List[Dict[str, float]]:
+    """
+    Divise une emprise en quatre quadrants.
+    
+    Args:
+        bounds: Emprise (south, west, north, east)
+    
+    Returns:
+        Quadrants sud-ouest, sud-est, nord-ouest, nord-est
+    """
+    middle_lat = (bounds['south'] + bounds['north']) / 2
+    middle_lon = (bounds['west'] + bounds['east']) / 2
+    return [
+        {'south': bounds['south'], 'west': bounds['west'], 'north': middle_lat, 'east': middle_lon},
+        {'south': bounds['south'], 'west': middle_lon, 'north': middle_lat, 'east': bounds['east']},
+        {'south': middle_lat, 'west': bounds['west'], 'north': bounds['north'], 'east': middle_lon},
+        {'south': middle_lat, 'west': middle_lon, 'north': bounds['north'], 'east': bounds['east']}
+    ]
+
+
+def _axis_overlap(low: float, high: float, origin: float, cell_size: float, size: int):
+    """Fractions des cellules d'un axe couvertes par [low, high] (et slice correspondante)."""
+    first = max(int(np.floor((low - origin) / cell_size)), 0)
+    last = min(int(np.ceil((high - origin) / cell_size)), size)
+    if last <= first:
+        return None, None
+    
+    edges = origin + np.arange(first, last + 1) * cell_size
+    fractions = (np.minimum(edges[1:], high) - np.maximum(edges[:-1], low)) / cell_size
+    return np.clip(fractions, 0.0, 1.0), slice(first, last)
+
+
+# Export des classes et fonctions
+__all__ = ['TileDensityMap', 'split_bounds', 'DEFAULT_CELL_SIZE']
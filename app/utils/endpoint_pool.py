@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+POOL DE MIROIRS OVERPASS - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/endpoint_pool.py
+
+Choix du miroir Overpass selon son état observé: latence moyenne (EWMA),
+taux d'erreur (EWMA), requêtes en cours, limitations de débit (HTTP 429)
+et délais dépassés (HTTP 504). Un miroir en échec répété est écarté par un
+disjoncteur (circuit breaker) pendant une durée croissante, puis réessayé
+avec une seule requête de test.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 4.0 - Ultra-optimisé pour récupération complète
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Poids de la dernière observation dans les moyennes mobiles exponentielles
+DEFAULT_EWMA_ALPHA = 0.3
+
+# Échecs consécutifs avant ouverture du disjoncteur
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Durée d'ouverture du disjoncteur (doublée à chaque réouverture, plafonnée)
+DEFAULT_OPEN_SECONDS = 30.0
+MAX_OPEN_SECONDS = 600.0
+
+# Pause par défaut après un HTTP 429 sans en-tête Retry-After
+DEFAULT_RATE_LIMIT_SECONDS = 30.0
+
+# Plancher de (1 - taux d'erreur) dans le score (évite la division par zéro)
+MIN_SUCCESS_RATE = 0.05
+
+
+class EndpointState:
+    """État observé d'un miroir."""
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.ewma_latency: Optional[float] = None  # secondes
+        self.error_rate = 0.0
+        self.in_flight = 0
+        
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.gateway_timeouts = 0
+        
+        self.circuit = 'closed'  # closed -> open -> half_open -> closed
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.opened_at = 0.0  # Dernière ouverture du disjoncteur (monotonic)
+        self.available_at = 0.0  # Disjoncteur ouvert ou pause 429 jusqu'à cet instant (monotonic)
+
+
+class EndpointCall:
+    """Requête en cours sur un miroir (renseignée par l'appelant)."""
+    
+    __slots__ = ('url', 'wait', 'status', 'retry_after', 'succeeded', 'started')
+    
+    def __init__(self, url: str, wait: float = 0.0):
+        self.url = url
+        self.wait = wait  # Attente avant d'envoyer la requête (miroir indisponible)
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+        self.succeeded = False
+        self.started = time.monotonic() + wait
+
+
+class OverpassEndpointPool:
+    """
+    Pool de miroirs Overpass avec routage selon la santé observée.
+    
+    Utilisation:
+        with pool.request() as call:
+            await asyncio.sleep(call.wait)
+            ... requête sur call.url ...
+            call.status = response.status
+            call.succeeded = True  # réponse lue entièrement
+    """
+    
+    def __init__(self, urls: List[str], ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 open_seconds: float = DEFAULT_OPEN_SECONDS):
+        """
+        Initialise le pool.
+        
+        Args:
+            urls: URLs des miroirs (ordre = préférence à état égal)
+            ewma_alpha: Poids de la dernière observation
+            failure_threshold: Échecs consécutifs avant ouverture du disjoncteur
+            open_seconds: Durée initiale d'ouverture du disjoncteur
+        """
+        if not urls:
+            raise ValueError("Au moins une URL Overpass est requise")
+        
+        self.logger = logging.getLogger(__name__)
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        
+        self._endpoints = [EndpointState(url) for url in urls]
+        self._by_url = {endpoint.url: endpoint for endpoint in self._endpoints}
+        self._lock = threading.Lock()
+    
+    @property
+    def urls(self) -> List[str]:
+        """URLs des miroirs."""
+        return [endpoint.url for endpoint in self._endpoints]
+    
+    def acquire(self) -> Tuple[str, float]:
+        """
+        Choisit le miroir le plus sain et le marque comme occupé.
+        
+        Score = latence EWMA × (1 + requêtes en cours) / (1 - taux d'erreur).
+        Les miroirs sans mesure reçoivent la meilleure latence connue, pour
+        être essayés. Si tous sont indisponibles, celui qui le redevient le
+        plus tôt est utilisé, après l'attente retournée.
+        
+        Returns:
+            (URL du miroir à libérer par record_success / record_failure,
+            secondes à attendre avant d'envoyer la requête)
+        """
+        with self._lock:
+            now = time.monotonic()
+            known = [endpoint.ewma_latency for endpoint in self._endpoints if endpoint.ewma_latency is not None]
+            default_latency = min(known) if known else 1.0
+            
+            candidates = []
+            for endpoint in self._endpoints:
+                if endpoint.available_at > now:
+                    continue
+                if endpoint.circuit == 'open':
+                    endpoint.circuit = 'half_open'
+                # Demi-ouvert: une seule requête de test à la fois
+                if endpoint.circuit == 'half_open' and endpoint.in_flight > 0:
+                    continue
+                candidates.append(endpoint)
+            
+            wait = 0.0
+            if candidates:
+                chosen = min(candidates, key=lambda endpoint: self._score(endpoint, default_latency))
+            else:
+                chosen = min(self._endpoints, key=lambda endpoint: endpoint.available_at)
+                wait = max(chosen.available_at - now, 0.0)
+                # Cette requête servira de test à la fin de l'ouverture
+                if chosen.circuit == 'open':
+                    chosen.circuit = 'half_open'
+            
+            chosen.in_flight += 1
+            chosen.requests += 1
+            return chosen.url, wait
+    
+    @contextmanager
+    def request(self) -> Iterator[EndpointCall]:
+        """
+        Réserve un miroir pour une requête et enregistre son résultat à la sortie.
+        
+        Yields:
+            EndpointCall: l'appelant attend call.wait, puis renseigne status,
+                retry_after et succeeded
+        """
+        call = EndpointCall(*self.acquire())
+        try:
+            yield call
+        finally:
+            latency = time.monotonic() - call.started
+            if call.succeeded:
+                self.record_success(call.url, latency)
+            else:
+                self.record_failure(call.url, latency, status=call.status, retry_after=call.retry_after,
+                                    started=call.started)
+    
+    def record_success(self, url: str, latency: float):
+        """
+        Enregistre une requête réussie.
+        
+        Args:
+            url: Miroir utilisé
+            latency: Durée de la requête (secondes)
+        """
+        with self._lock:
+            endpoint = self._by_url[url]
+            endpoint.in_flight = max(endpoint.in_flight - 1, 0)
+            self._update_latency(endpoint, latency)
+            endpoint.error_rate *= 1 - self.ewma_alpha
+            endpoint.consecutive_failures = 0
+            
+            if endpoint.circuit != 'closed':
+                self.logger.info(f"🟢 Miroir rétabli: {url}")
+            endpoint.circuit = 'closed'
+            endpoint.open_count = 0
+    
+    def record_failure(self, url: str, latency: Optional[float] = None, status: Optional[int] = None,
+                       retry_after: Optional[float] = None, started: Optional[float] = None):
+        """
+        Enregistre une requête en échec.
+        
+        Les échecs de requêtes parties avant la dernière ouverture du
+        disjoncteur, ou arrivant pendant qu'il est ouvert, ne le rouvrent pas
+        et ne prolongent pas son ouverture.
+        
+        Args:
+            url: Miroir utilisé
+            latency: Durée avant l'échec (secondes)
+            status: Code HTTP (None si erreur réseau ou délai dépassé)
+            retry_after: En-tête Retry-After d'une réponse 429 (secondes)
+            started: Début de la requête (time.monotonic)
+        """
+        with self._lock:
+            now = time.monotonic()
+            endpoint = self._by_url[url]
+            endpoint.in_flight = max(endpoint.in_flight - 1, 0)
+            if latency is not None:
+                self._update_latency(endpoint, latency)
+            endpoint.error_rate = self.ewma_alpha + (1 - self.ewma_alpha) * endpoint.error_rate
+            endpoint.failures += 1
+            
+            if status == 429:
+                # Limitation de débit: pause sans ouvrir le disjoncteur
+                endpoint.rate_limited += 1
+                pause = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_SECONDS
+                endpoint.available_at = max(endpoint.available_at, now + pause)
+                return
+            
+            if status == 504:
+                endpoint.gateway_timeouts += 1
+            
+            # Échec déjà pris en compte par l'ouverture en cours
+            if endpoint.circuit == 'open' or (started is not None and started < endpoint.opened_at):
+                return
+            
+            endpoint.consecutive_failures += 1
+            
+            if endpoint.circuit == 'half_open' or endpoint.consecutive_failures >= self.failure_threshold:
+                duration = min(self.open_seconds * 2 ** endpoint.open_count, MAX_OPEN_SECONDS)
+                endpoint.circuit = 'open'
+                endpoint.open_count += 1
+                endpoint.opened_at = now
+                endpoint.available_at = now + duration
+                self.logger.warning(f"🔴 Disjoncteur ouvert pour {url} ({duration:.0f}s)")
+    
+    def get_stats(self) -> List[Dict]:
+        """Retourne l'état de chaque miroir."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    'url': endpoint.url,
+                    'circuit': endpoint.circuit,
+                    'available_in_seconds': round(max(endpoint.available_at - now, 0.0), 1),
+                    'ewma_latency_ms': round(endpoint.ewma_latency * 1000, 1) if endpoint.ewma_latency is not None else None,
+                    'error_rate': round(endpoint.error_rate, 3),
+                    'in_flight': endpoint.in_flight,
+                    'requests': endpoint.requests,
+                    'failures': endpoint.failures,
+                    'rate_limited': endpoint.rate_limited,
+                    'gateway_timeouts': endpoint.gateway_timeouts
+                }
+                for endpoint in self._endpoints
+            ]
+    
+    def _update_latency(self, endpoint: EndpointState, latency: float):
+        """Met à jour la latence EWMA d'un miroir."""
+        if endpoint.ewma_latency is None:
+            endpoint.ewma_latency = latency
+        else:
+            endpoint.ewma_latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * endpoint.ewma_latency
+    
+    def _score(self, endpoint: EndpointState, default_latency: float) -> float:
+        """Score d'un miroir (plus bas = meilleur)."""
+        latency = endpoint.ewma_latency if endpoint.ewma_latency is not None else default_latency
+        return latency * (1 + endpoint.in_flight) / max(1 - endpoint.error_rate, MIN_SUCCESS_RATE)
+
+
+# Fonctions utilitaires
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convertit un en-tête Retry-After (secondes) en nombre.
+    
+    Args:
+        value: Valeur de l'en-tête
+    
+    Returns:
+        Secondes, ou None si absent ou au format date
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+# Export des classes et fonctions
+__all__ = ['OverpassEndpointPool', 'EndpointCall', 'parse_retry_after']
@@ -19,6 +19,23 @@ from typing import Dict, List, Any, Optional
 import numpy as np
 import pandas as pd
 
+from app.utils.calendar_factors import CalendarFactors, RAMADAN_PERIODS, FIXED_PUBLIC_HOLIDAYS, HOLIDAY_FACTORS
+
+
+# Température de base selon le mois (°C) - modèle simplifié pour Malaysia
+MONTHLY_BASE_TEMPERATURES = {
+    1: 26, 2: 27, 3: 29, 4: 30, 5: 30, 6: 29,
+    7: 28, 8: 28, 9: 29, 10: 29, 11: 28, 12: 26
+}
+
+# Variation journalière de température par heure (°C)
+HOURLY_TEMPERATURE_VARIATION = [
+    -3, -3, -3, -3, -3, -3,  # 00-05: Nuit fraîche
+    -1, -1, -1, 0, 0, 0,     # 06-11: Matin frais
+    0, 0, 3, 3, 3, 0,        # 12-17: Après-midi chaud
+    0, 0, 0, 0, -3, -3       # 18-23: Soirée, nuit fraîche
+]
+
 
 class EnergyPatternGenerator:
     """
@@ -44,6 +61,12 @@ class EnergyPatternGenerator:
         # Patterns journaliers par type
         self.daily_patterns = self._load_daily_patterns()
         
+        # Facteurs calendaires partagés (cache LRU par plage temporelle)
+        self.calendar = CalendarFactors(self.base_patterns, self.seasonal_variations)
+        
+        # Facteurs climatiques précalculés: type -> array (mois 0-12, heure 0-23)
+        self.climate_tables = self._compile_climate_tables()
+        
         # Facteurs de randomisation
         self.noise_levels = {
             'residential': 0.15,  # 15% de variation aléatoire
@@ -151,16 +174,21 @@ class EnergyPatternGenerator:
     
     def generate_consumption_pattern(self, building_type: str, location: str,
                                    date_range: pd.DatetimeIndex, frequency: str,
-                                   characteristics: Dict = None) -> np.ndarray:
+                                   characteristics: Dict = None,
+                                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """
         Génère un pattern de consommation réaliste pour un bâtiment.
         
+        Tous les facteurs sont calculés de manière vectorisée sur la plage
+        temporelle complète (pas de boucle Python par timestamp).
+        
         Args:
             building_type: Type de bâtiment
             location: Nom de la localisation
             date_range: Plage temporelle
             frequency: Fréquence des données
             characteristics: Caractéristiques du bâtiment
+            rng: Générateur aléatoire du bâtiment (optionnel, état global numpy par défaut)
             
         Returns:
             Array des valeurs de consommation
@@ -171,56 +199,98 @@ class EnergyPatternGenerator:
             building_type = 'residential'  # Fallback
         
         base_pattern = self.base_patterns[building_type]
-        daily_pattern = self.daily_patterns[building_type]
         
         # Caractéristiques par défaut
         if characteristics is None:
             characteristics = {}
         
-        consumption_values = []
+        # Facteurs temporels partagés (journalier, saisonnier, weekend, climat, spéciaux)
+        timestamp_factors = self.get_timestamp_factors(building_type, date_range)
         
-        for timestamp in date_range:
-            # Consommation de base
-            base_consumption = base_pattern['base_consumption_kwh']
-            
-            # Facteur journalier (selon l'heure)
-            hour = timestamp.hour
-            daily_factor = daily_pattern[hour]
-            
-            # Facteur saisonnier (selon le mois)
-            month = timestamp.month
-            seasonal_factor = self.seasonal_variations[month]
-            
-            # Facteur weekend
-            is_weekend = timestamp.weekday() >= 5
-            weekend_factor = base_pattern['weekend_factor'] if is_weekend else 1.0
-            
-            # Facteur climatique (température et humidité estimées)
-            climate_factor = self._calculate_climate_factor(timestamp, location, base_pattern)
-            
-            # Facteurs spéciaux (Ramadan, jours fériés, etc.)
-            special_factor = self._calculate_special_factors(timestamp, building_type)
-            
-            # Facteurs spécifiques au bâtiment
-            building_factor = self._calculate_building_factors(characteristics, building_type)
+        # Facteurs spécifiques au bâtiment (constants sur la période)
+        building_factor = self._calculate_building_factors(characteristics, building_type)
+        
+        # Calcul de la consommation
+        consumption = base_pattern['base_consumption_kwh'] * building_factor * timestamp_factors
+        
+        # Ajouter du bruit réaliste (un seul tirage pour toute la série)
+        noise_level = self.noise_levels.get(building_type, 0.1)
+        random_state = rng if rng is not None else np.random
+        noise = random_state.normal(1.0, noise_level, size=len(date_range))
+        consumption *= np.maximum(0.1, noise)  # Éviter les valeurs négatives
+        
+        return np.maximum(0.0, consumption)
+    
+    def get_timestamp_factors(self, building_type: str,
+                              date_range: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Calcule le produit des facteurs qui ne dépendent que du temps.
+        
+        Le vecteur retourné est commun à tous les bâtiments d'un même type et
+        peut être diffusé (broadcast) contre des scalaires par bâtiment.
+        
+        Args:
+            building_type: Type de bâtiment
+            date_range: Plage temporelle
             
-            # Calcul de la consommation
-            consumption = (base_consumption * 
-                          daily_factor * 
-                          seasonal_factor * 
-                          weekend_factor * 
-                          climate_factor * 
-                          special_factor * 
-                          building_factor)
+        Returns:
+            Array (n_timestamps,) des facteurs combinés
+        """
+        if building_type not in self.base_patterns:
+            building_type = 'residential'  # Fallback
+        
+        base_pattern = self.base_patterns[building_type]
+        
+        # Composantes et facteurs calendaires (mis en cache par plage)
+        components = self.calendar.get_components(date_range)
+        calendar_factors = self.calendar.get_factors(building_type, date_range)
+        hours = components['hours']
+        months = components['months']
+        
+        # Facteur journalier (selon l'heure) par indexation
+        daily_factors = np.asarray(self.daily_patterns[building_type])[hours]
+        
+        # Facteur climatique (température et humidité estimées)
+        climate_factors = self.climate_tables[building_type][months, hours]
+        
+        # Saisonnier, weekend et facteurs spéciaux (Ramadan, jours fériés)
+        return (daily_factors *
+                calendar_factors['seasonal'] *
+                calendar_factors['weekend'] *
+                climate_factors *
+                calendar_factors['special'])
+    
+    def _compile_climate_tables(self) -> Dict[str, np.ndarray]:
+        """
+        Compile les tables de facteurs climatiques (mois × heure) par type de bâtiment.
+        
+        Le facteur ne dépend que du mois, de l'heure et de la dépendance à la
+        climatisation: il est calculé une fois ici, puis lu par indexation
+        (table[months, hours]) par les appelants vectorisés.
+        
+        Returns:
+            Dictionnaire {type: array (13, 24)}, ligne 0 inutilisée
+        """
+        base_temps = np.array([MONTHLY_BASE_TEMPERATURES.get(month, 24) for month in range(13)], dtype=float)
+        estimated_temp = base_temps[:, None] + np.asarray(HOURLY_TEMPERATURE_VARIATION, dtype=float)[None, :]
+        
+        tables = {}
+        for building_type, base_pattern in self.base_patterns.items():
+            ac_dependency = base_pattern['ac_dependency']
             
-            # Ajouter du bruit réaliste
-            noise_level = self.noise_levels.get(building_type, 0.1)
-            noise = np.random.normal(1.0, noise_level)
-            consumption *= max(0.1, noise)  # Éviter les valeurs négatives
+            climate_factors = np.select(
+                [estimated_temp >= 30, estimated_temp >= 27, estimated_temp >= 24],
+                [1.0 + (estimated_temp - 30) * ac_dependency * 0.05,
+                 1.0 + (estimated_temp - 27) * ac_dependency * 0.03,
+                 1.0],
+                default=1.0 - (24 - estimated_temp) * ac_dependency * 0.02
+            )
             
-            consumption_values.append(max(0.0, consumption))
+            table = np.maximum(0.5, climate_factors)  # Minimum 50% de la consommation
+            table.setflags(write=False)
+            tables[building_type] = table
         
-        return np.array(consumption_values)
+        return tables
     
     def _calculate_climate_factor(self, timestamp: datetime, location: str, 
                                 base_pattern: Dict) -> float:
@@ -236,28 +306,8 @@ class EnergyPatternGenerator:
             Facteur climatique (multiplicateur)
         """
         # Température estimée pour Malaysia (modèle simplifié)
-        month = timestamp.month
-        hour = timestamp.hour
-        
-        # Température de base selon le mois (°C)
-        base_temps = {
-            1: 26, 2: 27, 3: 29, 4: 30, 5: 30, 6: 29,
-            7: 28, 8: 28, 9: 29, 10: 29, 11: 28, 12: 26
-        }
-        
-        base_temp = base_temps[month]
-        
-        # Variation journalière (-3°C la nuit, +3°C l'après-midi)
-        if 6 <= hour <= 8:
-            temp_variation = -1  # Matin frais
-        elif 14 <= hour <= 16:
-            temp_variation = 3   # Après-midi chaud
-        elif 22 <= hour or hour <= 5:
-            temp_variation = -3  # Nuit fraîche
-        else:
-            temp_variation = 0
-        
-        estimated_temp = base_temp + temp_variation
+        estimated_temp = (MONTHLY_BASE_TEMPERATURES[timestamp.month] +
+                          HOURLY_TEMPERATURE_VARIATION[timestamp.hour])
         
         # Facteur de climatisation selon la température
         ac_dependency = base_pattern['ac_dependency']
@@ -298,12 +348,7 @@ class EnergyPatternGenerator:
         
         # Jours fériés malaysiens approximatifs
         if self._is_public_holiday(timestamp):
-            if building_type == 'commercial':
-                special_factor *= 0.2  # Magasins fermés
-            elif building_type == 'public':
-                special_factor *= 0.3  # Services réduits
-            elif building_type == 'residential':
-                special_factor *= 1.1  # Plus à la maison
+            special_factor *= HOLIDAY_FACTORS.get(building_type, 1.0)
         
         return special_factor
     
@@ -348,7 +393,9 @@ class EnergyPatternGenerator:
         if 'energy_efficiency' in characteristics:
             efficiency = characteristics['energy_efficiency']
             # efficiency entre 0.5 (inefficace) et 1.5 (très efficace)
-            factor *= (2.0 - efficiency)
+            # (les classes lettrées 'A'-'D' du générateur sont ignorées)
+            if isinstance(efficiency, (int, float)):
+                factor *= (2.0 - efficiency)
         
         # Facteur selon le nombre d'occupants (résidentiel)
         if building_type == 'residential' and 'avg_occupancy' in characteristics:
@@ -372,36 +419,15 @@ class EnergyPatternGenerator:
         # En réalité, Ramadan se décale de ~11 jours chaque année
         year = timestamp.year
         
-        # Dates approximatives de Ramadan pour différentes années
-        ramadan_periods = {
-            2024: (datetime(2024, 3, 10), datetime(2024, 4, 9)),
-            2025: (datetime(2025, 2, 28), datetime(2025, 3, 30)),
-            2026: (datetime(2026, 2, 17), datetime(2026, 3, 19)),
-        }
-        
-        if year in ramadan_periods:
-            start, end = ramadan_periods[year]
+        if year in RAMADAN_PERIODS:
+            start, end = RAMADAN_PERIODS[year]
             return start <= timestamp <= end
         
         return False
     
     def _is_public_holiday(self, timestamp: datetime) -> bool:
         """Vérifie si c'est un jour férié malaysien approximatif."""
-        month = timestamp.month
-        day = timestamp.day
-        
-        # Jours fériés fixes approximatifs
-        fixed_holidays = [
-            (1, 1),   # Nouvel An
-            (2, 1),   # Fête Fédérale
-            (5, 1),   # Fête du Travail
-            (6, 5),   # Anniversaire du Roi (approximatif)
-            (8, 31),  # Fête Nationale
-            (9, 16),  # Jour de la Malaysia
-            (12, 25), # Noël
-        ]
-        
-        return (month, day) in fixed_holidays
+        return (timestamp.month, timestamp.day) in FIXED_PUBLIC_HOLIDAYS
     
     def generate_weather_context(self, timestamp: datetime, location: str) -> Dict[str, Any]:
         """
@@ -417,25 +443,10 @@ class EnergyPatternGenerator:
         month = timestamp.month
         hour = timestamp.hour
         
-        # Température de base selon le mois
-        base_temps = {
-            1: 26, 2: 27, 3: 29, 4: 30, 5: 30, 6: 29,
-            7: 28, 8: 28, 9: 29, 10: 29, 11: 28, 12: 26
-        }
-        
-        base_temp = base_temps[month]
-        
-        # Variation journalière
-        if 6 <= hour <= 8:
-            temp_variation = -1
-        elif 14 <= hour <= 16:
-            temp_variation = 3
-        elif 22 <= hour or hour <= 5:
-            temp_variation = -3
-        else:
-            temp_variation = 0
-        
-        temperature = base_temp + temp_variation + np.random.normal(0, 1)
+        # Température de base selon le mois et variation journalière
+        temperature = (MONTHLY_BASE_TEMPERATURES[month] +
+                       HOURLY_TEMPERATURE_VARIATION[hour] +
+                       np.random.normal(0, 1))
         
         # Humidité (toujours élevée en Malaysia)
         base_humidity = 80
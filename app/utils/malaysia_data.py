@@ -12,11 +12,127 @@ Date: 2025
 Version: 3.0 - Données structurées
 """
 
+import bisect
 import logging
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Any, Mapping
 import random
 import numpy as np
 
+from app.utils.spatial_index import HaversineIndex
+
+
+# Critères reconnus par filter_locations (les autres clés sont ignorées)
+LOCATION_FILTER_KEYS = ('state', 'region', 'type', 'urban_level', 'min_population', 'city')
+
+# Critères d'égalité servis par les index inversés
+INDEXED_LOCATION_FIELDS = ('state', 'region', 'type', 'urban_level')
+
+# Nombre maximal d'entrées (échantillonneurs, requêtes) conservées en cache
+QUERY_CACHE_SIZE = 256
+
+
+class LocationSampler:
+    """
+    Échantillonneur pondéré compilé pour un ensemble de villes.
+    
+    Les poids (log de la population) et la table d'alias de Walker/Vose sont
+    calculés une seule fois: chaque tirage coûte O(1), N tirages se font en
+    un seul appel vectorisé.
+    """
+    
+    def __init__(self, locations: Mapping[str, Dict]):
+        """
+        Compile l'échantillonneur.
+        
+        Args:
+            locations: Localisations candidates {ville: données} (non vide)
+        """
+        if not locations:
+            raise ValueError("Aucune localisation candidate")
+        
+        self.cities = list(locations.keys())
+        self.city_array = np.array(self.cities, dtype=object)
+        self.locations = [locations[city] for city in self.cities]
+        
+        # Pondération par population (log pour éviter trop de déséquilibre)
+        weights = np.log(np.array([location['population'] for location in self.locations], dtype=float) + 1)
+        if weights.sum() > 0:
+            self.probabilities = weights / weights.sum()
+        else:
+            self.probabilities = np.full(len(self.cities), 1.0 / len(self.cities))
+        
+        self._alias_probabilities, self._aliases = _build_alias_table(self.probabilities)
+        for array in (self.probabilities, self._alias_probabilities, self._aliases):
+            array.setflags(write=False)
+    
+    def __len__(self) -> int:
+        return len(self.cities)
+    
+    def codes_from_uniforms(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Convertit des uniformes [0, 1) en index de villes (méthode des alias).
+        
+        Un seul uniforme par tirage: sa partie entière (× nombre de villes)
+        choisit la colonne, sa partie fractionnaire décide entre la ville et
+        son alias.
+        
+        Args:
+            uniforms: Uniformes dans [0, 1)
+        
+        Returns:
+            Index des villes (int64)
+        """
+        scaled = np.asarray(uniforms, dtype=float) * len(self.cities)
+        columns = np.minimum(scaled.astype(np.int64), len(self.cities) - 1)
+        keep = (scaled - columns) < self._alias_probabilities[columns]
+        return np.where(keep, columns, self._aliases[columns])
+    
+    def sample_codes(self, size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Tire `size` index de villes.
+        
+        Args:
+            size: Nombre de tirages
+            rng: Générateur aléatoire (optionnel, état global numpy par défaut)
+        
+        Returns:
+            Index des villes (int64)
+        """
+        random_state = rng if rng is not None else np.random
+        return self.codes_from_uniforms(random_state.random(size))
+    
+    def sample(self, size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Tire `size` noms de villes.
+        
+        Args:
+            size: Nombre de tirages
+            rng: Générateur aléatoire (optionnel)
+        
+        Returns:
+            Noms des villes (array d'objets)
+        """
+        return self.city_array[self.sample_codes(size, rng)]
+    
+    def select(self, rng: Optional[np.random.Generator] = None) -> Dict:
+        """
+        Tire une localisation.
+        
+        Args:
+            rng: Générateur aléatoire (optionnel)
+        
+        Returns:
+            Copie des données de la ville, avec la clé 'city'
+        """
+        code = int(self.sample_codes(1, rng)[0])
+        location_data = self.locations[code].copy()
+        location_data['city'] = self.cities[code]
+        return location_data
+
 
 class MalaysiaLocationData:
     """
@@ -33,6 +149,13 @@ class MalaysiaLocationData:
         self._building_type_distributions = self._load_building_distributions()
         self._climate_zones = self._load_climate_zones()
         
+        self._locations_view = MappingProxyType(self._malaysia_locations)
+        self._build_indexes()
+        
+        # Échantillonneurs et résultats de requêtes par filtre normalisé (LRU)
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
         self.logger.info(f"✅ Données Malaysia chargées: {len(self._malaysia_locations)} villes")
     
     def _load_malaysia_locations(self) -> Dict[str, Dict]:
@@ -384,9 +507,44 @@ class MalaysiaLocationData:
             }
         }
     
-    def get_available_locations(self) -> Dict[str, Dict]:
-        """Retourne toutes les localisations disponibles."""
-        return self._malaysia_locations.copy()
+    def _build_indexes(self):
+        """
+        Construit les index des localisations.
+        
+        - index inversés {critère: {valeur: ensemble de villes}}
+        - villes triées par population décroissante et populations croissantes
+          (les villes de population >= seuil forment un préfixe, trouvé par bisection)
+        """
+        self._city_positions = {city: position for position, city in enumerate(self._malaysia_locations)}
+        
+        self._location_indexes = {field: {} for field in INDEXED_LOCATION_FIELDS}
+        for city, data in self._malaysia_locations.items():
+            for field, index in self._location_indexes.items():
+                index.setdefault(data.get(field), set()).add(city)
+        self._location_indexes = {
+            field: {value: frozenset(cities) for value, cities in index.items()}
+            for field, index in self._location_indexes.items()
+        }
+        
+        self._cities_by_population = sorted(self._malaysia_locations,
+                                            key=lambda city: self._malaysia_locations[city]['population'],
+                                            reverse=True)
+        self._ascending_populations = [self._malaysia_locations[city]['population']
+                                       for city in reversed(self._cities_by_population)]
+        
+        # Index spatial (Haversine) des villes et attributs alignés sur l'ordre des données
+        self._city_names = np.array(list(self._malaysia_locations), dtype=object)
+        self._city_populations = np.array([data['population'] for data in self._malaysia_locations.values()])
+        self._city_economic_levels = np.array([data.get('economic_level', 'medium')
+                                               for data in self._malaysia_locations.values()], dtype=object)
+        self._city_index = HaversineIndex(
+            [data['latitude'] for data in self._malaysia_locations.values()],
+            [data['longitude'] for data in self._malaysia_locations.values()]
+        )
+    
+    def get_available_locations(self) -> Mapping[str, Dict]:
+        """Retourne toutes les localisations disponibles (vue en lecture seule, sans copie)."""
+        return self._locations_view
     
     def filter_locations(self, locations: Dict[str, Dict], 
                         location_filter: Dict) -> Dict[str, Dict]:
@@ -396,59 +554,43 @@ class MalaysiaLocationData:
         Args:
             locations: Dictionnaire des localisations
             location_filter: Critères de filtrage
-            
+        
         Returns:
             Localisations filtrées
         """
-        filtered = locations.copy()
-        
-        # Filtrage par état
-        if 'state' in location_filter:
-            target_state = location_filter['state']
-            filtered = {k: v for k, v in filtered.items() 
-                       if v['state'] == target_state}
-        
-        # Filtrage par région
-        if 'region' in location_filter:
-            target_region = location_filter['region']
-            filtered = {k: v for k, v in filtered.items() 
-                       if v['region'] == target_region}
-        
-        # Filtrage par type de ville
-        if 'type' in location_filter:
-            target_type = location_filter['type']
-            filtered = {k: v for k, v in filtered.items() 
-                       if v['type'] == target_type}
-        
-        # Filtrage par niveau urbain
-        if 'urban_level' in location_filter:
-            target_level = location_filter['urban_level']
-            filtered = {k: v for k, v in filtered.items() 
-                       if v['urban_level'] == target_level}
-        
-        # Filtrage par population minimale
-        if 'min_population' in location_filter:
-            min_pop = location_filter['min_population']
-            filtered = {k: v for k, v in filtered.items() 
-                       if v['population'] >= min_pop}
+        # Localisations complètes: intersection des index (résultat en cache)
+        if locations is self._locations_view or locations is self._malaysia_locations:
+            return {city: self._malaysia_locations[city] for city in self.query_cities(location_filter)}
         
         # Filtrage par ville spécifique
         if 'city' in location_filter:
-            target_city = location_filter['city']
-            if target_city in filtered:
-                filtered = {target_city: filtered[target_city]}
-            else:
-                filtered = {}
+            candidates = {city: locations[city] for city in _filter_values(location_filter['city']) if city in locations}
+        else:
+            candidates = locations
+        
+        # Critères d'égalité (état, région, type de ville, niveau urbain), une liste valant union
+        equality_criteria = [(key, _filter_values(location_filter[key])) for key in INDEXED_LOCATION_FIELDS
+                             if key in location_filter]
+        min_pop = location_filter.get('min_population')
+        
+        # Un seul passage, sans copie intermédiaire
+        filtered = {
+            city: data for city, data in candidates.items()
+            if all(data[key] in values for key, values in equality_criteria)
+            and (min_pop is None or data['population'] >= min_pop)
+        }
         
         return filtered
     
-    def select_weighted_location(self, available_locations: Dict[str, Dict]) -> Dict:
+    def select_weighted_location(self, available_locations: Dict[str, Dict],
+                                 rng: Optional[np.random.Generator] = None) -> Dict:
         """
         Sélectionne une localisation avec pondération selon la population.
         
         Args:
             available_locations: Localisations disponibles
-            
+            rng: Générateur aléatoire (optionnel, état global numpy par défaut)
+        
         Returns:
             Données de la localisation sélectionnée
         """
@@ -456,26 +598,128 @@ class MalaysiaLocationData:
             # Fallback sur Kuala Lumpur
             return self._malaysia_locations['Kuala Lumpur']
         
-        # Calculer les poids basés sur la population (log pour éviter trop de déséquilibre)
-        cities = list(available_locations.keys())
-        weights = [np.log(available_locations[city]['population'] + 1) 
-                  for city in cities]
+        # Clé = villes et populations (les poids); les données renvoyées sont celles de l'appelant
+        key = ('sampler_cities',) + tuple((city, data['population']) for city, data in available_locations.items())
+        sampler = self._get_cached(key, lambda: LocationSampler(available_locations))
+        city = sampler.cities[int(sampler.sample_codes(1, rng)[0])]
+        location_data = available_locations[city].copy()
+        location_data['city'] = city
+        return location_data
+    
+    def get_location_sampler(self, location_filter: Optional[Dict] = None) -> LocationSampler:
+        """
+        Retourne l'échantillonneur compilé pour un filtre de localisations.
         
-        # Normaliser les poids
-        total_weight = sum(weights)
-        if total_weight > 0:
-            probabilities = [w / total_weight for w in weights]
-        else:
-            probabilities = [1.0 / len(cities)] * len(cities)
+        Les échantillonneurs sont mis en cache par filtre normalisé: deux
+        filtres équivalents (même critères, ordre des clés ou clés inconnues
+        différents) partagent le même échantillonneur. Un filtre sans
+        résultat se replie sur Kuala Lumpur.
         
-        # Sélection aléatoire pondérée
-        selected_city = np.random.choice(cities, p=probabilities)
+        Args:
+            location_filter: Critères de filtrage (optionnel)
         
-        # Retourner les données avec le nom de la ville ajouté
-        location_data = available_locations[selected_city].copy()
-        location_data['city'] = selected_city
+        Returns:
+            LocationSampler
+        """
+        key = ('sampler',) + normalize_location_filter(location_filter)
         
-        return location_data
+        def compile_sampler():
+            locations = self._malaysia_locations
+            if location_filter:
+                locations = self.filter_locations(locations, location_filter)
+            return LocationSampler(locations or {'Kuala Lumpur': self._malaysia_locations['Kuala Lumpur']})
+        
+        return self._get_cached(key, compile_sampler)
+    
+    def query_cities(self, location_filter: Optional[Dict] = None) -> Tuple[str, ...]:
+        """
+        Retourne les villes satisfaisant un filtre, via les index.
+        
+        Les critères d'égalité sont des intersections d'ensembles, la
+        population minimale une bisection dans les populations triées.
+        
+        Args:
+            location_filter: Critères de filtrage (optionnel)
+        
+        Returns:
+            Noms des villes, dans l'ordre des données
+        """
+        key = ('cities',) + normalize_location_filter(location_filter)
+        return self._get_cached(key, lambda: self._intersect_indexes(location_filter or {}))
+    
+    def list_cities(self, location_filter: Optional[Dict] = None,
+                    detailed: bool = False) -> Tuple[Dict, ...]:
+        """
+        Retourne les descriptions des villes d'un filtre, par population décroissante.
+        
+        Le résultat est mis en cache par (filtre normalisé, format) et ne doit
+        pas être modifié.
+        
+        Args:
+            location_filter: Critères de filtrage (optionnel)
+            detailed: Format détaillé (coordonnées, type, niveau urbain...)
+        
+        Returns:
+            Tuple de dictionnaires {city, state, population, ...}
+        """
+        key = ('list', detailed) + normalize_location_filter(location_filter)
+        
+        def describe():
+            selected = set(self.query_cities(location_filter))
+            return tuple(
+                _describe_city(city, self._malaysia_locations[city], detailed)
+                for city in self._cities_by_population if city in selected
+            )
+        
+        return self._get_cached(key, describe)
+    
+    def _intersect_indexes(self, location_filter: Dict) -> Tuple[str, ...]:
+        """
+        Intersecte les index inversés pour un filtre (sans cache).
+        
+        Une liste de valeurs pour un critère (ex: {'state': ['Johor', 'Perak']})
+        sélectionne l'union de leurs index.
+        """
+        candidate_sets = [
+            frozenset().union(*(self._location_indexes[field].get(value, frozenset())
+                                for value in _filter_values(location_filter[field])))
+            for field in INDEXED_LOCATION_FIELDS if field in location_filter
+        ]
+        
+        if 'city' in location_filter:
+            candidate_sets.append(frozenset(
+                city for city in _filter_values(location_filter['city']) if city in self._malaysia_locations
+            ))
+        
+        if 'min_population' in location_filter:
+            # Villes de population >= seuil = préfixe de la liste décroissante
+            below = bisect.bisect_left(self._ascending_populations, location_filter['min_population'])
+            count = len(self._ascending_populations) - below
+            candidate_sets.append(frozenset(self._cities_by_population[:count]))
+        
+        if not candidate_sets:
+            return tuple(self._malaysia_locations)
+        
+        candidate_sets.sort(key=len)
+        selected = candidate_sets[0].intersection(*candidate_sets[1:])
+        return tuple(sorted(selected, key=self._city_positions.__getitem__))
+    
+    def _get_cached(self, key: Tuple, factory):
+        """Lit ou calcule une entrée du cache LRU des requêtes."""
+        with self._query_cache_lock:
+            value = self._query_cache.get(key)
+            if value is not None:
+                self._query_cache.move_to_end(key)
+                return value
+        
+        value = factory()
+        
+        with self._query_cache_lock:
+            self._query_cache[key] = value
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        
+        return value
     
     def get_building_type_distribution(self, location_data: Dict) -> Dict[str, float]:
         """
@@ -483,7 +727,7 @@ class MalaysiaLocationData:
         
         Args:
             location_data: Données de la localisation
-            
+        
         Returns:
             Distribution des types de bâtiments
         """
@@ -509,7 +753,7 @@ class MalaysiaLocationData:
         
         Args:
             location_data: Données de la localisation
-            
+        
         Returns:
             Caractéristiques climatiques
         """
@@ -527,7 +771,7 @@ class MalaysiaLocationData:
         
         Args:
             location_data: Données de la localisation
-            
+        
         Returns:
             Multiplicateur énergétique
         """
@@ -554,7 +798,7 @@ class MalaysiaLocationData:
         Args:
             target_city: Ville de référence
             radius_km: Rayon de recherche en km
-            
+        
         Returns:
             Liste des villes proches
         """
@@ -562,29 +806,70 @@ class MalaysiaLocationData:
             return []
         
         target_location = self._malaysia_locations[target_city]
-        target_lat = target_location['latitude']
-        target_lon = target_location['longitude']
+        offsets, indices, distances = self._city_index.query_radius(
+            target_location['latitude'], target_location['longitude'], radius_km
+        )
         
+        # Déjà triées par distance
         nearby_cities = []
-        
-        for city, location in self._malaysia_locations.items():
+        for index, distance in zip(indices.tolist(), distances.tolist()):
+            city = self._city_names[index]
             if city != target_city:
-                # Calcul de distance approximatif
-                lat_diff = target_lat - location['latitude']
-                lon_diff = target_lon - location['longitude']
-                distance_approx = np.sqrt(lat_diff**2 + lon_diff**2) * 111  # Approximation en km
-                
-                if distance_approx <= radius_km:
-                    city_info = location.copy()
-                    city_info['city'] = city
-                    city_info['distance_km'] = round(distance_approx, 1)
-                    nearby_cities.append(city_info)
-        
-        # Trier par distance
-        nearby_cities.sort(key=lambda x: x['distance_km'])
+                city_info = self._malaysia_locations[city].copy()
+                city_info['city'] = city
+                city_info['distance_km'] = round(distance, 1)
+                nearby_cities.append(city_info)
         
         return nearby_cities
     
+    def nearest_cities(self, latitudes, longitudes, k: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Villes connues les plus proches de coordonnées quelconques (vectorisé).
+        
+        Args:
+            latitudes: Latitudes (degrés décimaux)
+            longitudes: Longitudes (degrés décimaux)
+            k: Nombre de villes par point
+        
+        Returns:
+            Dictionnaire d'arrays 'city', 'population', 'economic_level',
+            'distance_km' de forme (n,) si k == 1, (n, k) sinon
+        """
+        distances, indices = self._city_index.query_nearest(latitudes, longitudes, k)
+        if k == 1:
+            distances, indices = distances[:, 0], indices[:, 0]
+        
+        return {
+            'city': self._city_names[indices],
+            'population': self._city_populations[indices],
+            'economic_level': self._city_economic_levels[indices],
+            'distance_km': distances
+        }
+    
+    def attach_nearest_city(self, frame, latitude_column: str = 'latitude',
+                            longitude_column: str = 'longitude'):
+        """
+        Associe à chaque ligne (ex: centroïdes de bâtiments OSM) sa ville la plus proche.
+        
+        Args:
+            frame: DataFrame avec des colonnes de coordonnées
+            latitude_column: Nom de la colonne de latitude
+            longitude_column: Nom de la colonne de longitude
+        
+        Returns:
+            Copie du DataFrame avec les colonnes 'city', 'population',
+            'economic_level' et 'city_distance_km'
+        """
+        nearest = self.nearest_cities(frame[latitude_column].to_numpy(dtype=float),
+                                      frame[longitude_column].to_numpy(dtype=float))
+        
+        return frame.assign(
+            city=nearest['city'],
+            population=nearest['population'],
+            economic_level=nearest['economic_level'],
+            city_distance_km=np.round(nearest['distance_km'], 3)
+        )
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Retourne les statistiques des données Malaysia."""
         
@@ -626,5 +911,95 @@ class MalaysiaLocationData:
         }
 
 
-# Export de la classe principale
-__all__ = ['MalaysiaLocationData']
+# Fonctions utilitaires
+
+def normalize_location_filter(location_filter: Optional[Dict]) -> Tuple:
+    """
+    Normalise un filtre de localisations en clé hashable.
+    
+    Args:
+        location_filter: Critères de filtrage (optionnel)
+    
+    Returns:
+        Tuple trié des critères reconnus
+    """
+    if not location_filter:
+        return ()
+    
+    def normalize(value):
+        if isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return tuple(sorted(repr(item) for item in value))
+        return repr(value)
+    
+    return tuple(
+        (key, normalize(location_filter[key]))
+        for key in sorted(LOCATION_FILTER_KEYS) if key in location_filter
+    )
+
+
+def _filter_values(value) -> Tuple:
+    """Valeurs admises par un critère de filtre (une valeur ou une liste de valeurs)."""
+    values = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+    # Une valeur non hashable (dict, liste imbriquée) ne correspond à aucune ville
+    return tuple(item for item in values if isinstance(item, Hashable))
+
+
+def _describe_city(city: str, data: Dict, detailed: bool = False) -> Dict:
+    """Description d'une ville pour l'API (format simple ou détaillé)."""
+    if not detailed:
+        return {
+            'city': city,
+            'state': data['state'],
+            'population': data['population']
+        }
+    
+    return {
+        'city': city,
+        'state': data['state'],
+        'state_code': data.get('state_code'),
+        'region': data['region'],
+        'population': data['population'],
+        'coordinates': {
+            'latitude': data['latitude'],
+            'longitude': data['longitude']
+        },
+        'urban_level': data.get('urban_level'),
+        'type': data.get('type'),
+        'timezone': data.get('timezone'),
+        'economic_level': data.get('economic_level')
+    }
+
+
+def _build_alias_table(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Construit la table d'alias (méthode de Vose).
+    
+    Args:
+        probabilities: Probabilités normalisées
+    
+    Returns:
+        Tuple (probabilités de conserver la colonne, alias de chaque colonne)
+    """
+    n = len(probabilities)
+    scaled = np.asarray(probabilities, dtype=float) * n
+    keep = np.ones(n)
+    aliases = np.arange(n, dtype=np.int64)
+    
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    
+    while small and large:
+        less, more = small.pop(), large.pop()
+        keep[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    
+    # Les colonnes restantes (erreurs d'arrondi) sont conservées à 100%
+    return keep, aliases
+
+
+# Export des classes et fonctions
+__all__ = ['MalaysiaLocationData', 'LocationSampler', 'normalize_location_filter']
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PARSEUR OVERPASS EN FLUX - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/overpass_stream.py
+
+Lecture incrémentale des réponses JSON de l'API Overpass. Le corps de la
+réponse est fourni par morceaux d'octets; chaque élément du tableau
+"elements" est décodé dès qu'il est complet, sans jamais charger la réponse
+entière en mémoire. Seul l'élément en cours de réception est conservé.
+
+Un élément incomplet n'est redécodé qu'une fois le texte en attente doublé
+depuis la dernière tentative: un très grand élément (relation de plusieurs
+Mo) coûte un temps linéaire, et non quadratique, en sa taille.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 4.0 - Ultra-optimisé pour récupération complète
+"""
+
+import codecs
+import json
+import logging
+import re
+from typing import Dict, List, Optional
+
+
+# Début du tableau des éléments dans la réponse Overpass
+_ELEMENTS_START = re.compile(r'"elements"\s*:\s*\[')
+
+# Séparateurs entre deux éléments du tableau
+_ELEMENT_SEPARATORS = re.compile(r'[\s,]*')
+
+# Remarque éventuelle après les éléments (ex: timeout côté serveur)
+_REMARK = re.compile(r'"remark"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Taille maximale (caractères) d'un élément en attente de décodage
+DEFAULT_MAX_ELEMENT_CHARS = 64 * 1024 * 1024
+
+# Taille conservée de l'en-tête / de la fin de réponse pendant la recherche
+_HEADER_TAIL_CHARS = 64
+_TRAILER_MAX_CHARS = 64 * 1024
+
+
+class OverpassFormatError(ValueError):
+    """Réponse qui n'est pas un résultat Overpass (ex: page d'erreur HTML servie en 200)."""
+
+
+class OverpassStreamParser:
+    """
+    Parseur incrémental du tableau "elements" d'une réponse Overpass.
+    
+    Utilisation:
+        parser = OverpassStreamParser()
+        for chunk in chunks:
+            for element in parser.feed(chunk):
+                ...
+        remaining = parser.close()
+    """
+    
+    def __init__(self, max_element_chars: int = DEFAULT_MAX_ELEMENT_CHARS):
+        """
+        Initialise le parseur.
+        
+        Args:
+            max_element_chars: Taille maximale d'un élément non encore décodé
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_element_chars = max_element_chars
+        
+        self._json_decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pending: List[str] = []  # Morceaux reçus depuis la dernière tentative
+        self._pending_chars = 0
+        self._retry_chars = 0  # Taille du tampon à atteindre avant de redécoder
+        self._state = 'header'  # header -> elements -> trailer
+        
+        self.elements_parsed = 0
+        self.bytes_received = 0
+        self.remark: Optional[str] = None
+    
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """
+        Ajoute un morceau de la réponse.
+        
+        Args:
+            chunk: Octets reçus
+        
+        Returns:
+            Éléments complets décodés grâce à ce morceau
+        """
+        self.bytes_received += len(chunk)
+        text = self._text_decoder.decode(chunk)
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        
+        buffered = len(self._buffer) + self._pending_chars
+        if buffered < self._retry_chars and buffered <= self.max_element_chars:
+            return []
+        
+        self._join_pending()
+        return self._drain(final=False)
+    
+    def close(self) -> List[Dict]:
+        """
+        Termine la lecture.
+        
+        Returns:
+            Derniers éléments décodés
+        
+        Raises:
+            OverpassFormatError: Si la réponse ne contient pas de tableau "elements"
+            ValueError: Si la réponse est tronquée ou invalide
+        """
+        self._pending.append(self._text_decoder.decode(b'', final=True))
+        self._join_pending()
+        elements = self._drain(final=True)
+        
+        if self._state == 'header':
+            # Page d'erreur (HTML, JSON sans résultat): ne pas la prendre pour une zone vide
+            raise OverpassFormatError("Réponse Overpass sans tableau \"elements\"")
+        
+        if self._state == 'elements':
+            raise ValueError(f"Réponse Overpass tronquée après {self.elements_parsed} éléments")
+        
+        if self._state == 'trailer':
+            match = _REMARK.search(self._buffer)
+            if match:
+                self.remark = json.loads(f'"{match.group(1)}"')
+                self.logger.warning(f"⚠️ Remarque Overpass: {self.remark}")
+        
+        self._buffer = ''
+        return elements
+    
+    def _join_pending(self):
+        """Ajoute au tampon les morceaux reçus depuis la dernière tentative."""
+        if self._pending:
+            self._buffer += ''.join(self._pending)
+            self._pending = []
+            self._pending_chars = 0
+    
+    def _drain(self, final: bool) -> List[Dict]:
+        """Décode tous les éléments complets présents dans le tampon."""
+        elements = []
+        buffer = self._buffer
+        position = 0
+        self._retry_chars = 0
+        
+        if self._state == 'header':
+            match = _ELEMENTS_START.search(buffer)
+            if match is None:
+                # Garder la fin du tampon au cas où la clé serait coupée entre deux morceaux
+                self._buffer = buffer[-_HEADER_TAIL_CHARS:]
+                return elements
+            position = match.end()
+            self._state = 'elements'
+        
+        while self._state == 'elements':
+            position = _ELEMENT_SEPARATORS.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            
+            if buffer[position] == ']':
+                self._state = 'trailer'
+                position += 1
+                break
+            
+            try:
+                element, position = self._json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Élément incomplet: attendre la suite (sauf en fin de flux)
+                if final:
+                    raise ValueError(f"Élément Overpass invalide: {e}") from e
+                if len(buffer) - position > self.max_element_chars:
+                    raise ValueError(f"Élément Overpass de plus de {self.max_element_chars} caractères")
+                # Nouvelle tentative quand l'élément en attente aura doublé
+                self._retry_chars = 2 * (len(buffer) - position)
+                break
+            
+            elements.append(element)
+        
+        self.elements_parsed += len(elements)
+        
+        if self._state == 'trailer':
+            self._buffer = buffer[position:position + _TRAILER_MAX_CHARS]
+        else:
+            self._buffer = buffer[position:]
+        
+        return elements
+
+
+# Fonctions utilitaires
+
+def iter_overpass_elements(chunks, max_element_chars: int = DEFAULT_MAX_ELEMENT_CHARS):
+    """
+    Itère sur les éléments d'une réponse Overpass fournie par morceaux (synchrone).
+    
+    Args:
+        chunks: Itérable d'octets (ex: response.iter_content(), fichier lu par blocs)
+        max_element_chars: Taille maximale d'un élément non encore décodé
+    
+    Yields:
+        Éléments (dictionnaires) dans l'ordre de la réponse
+    """
+    parser = OverpassStreamParser(max_element_chars=max_element_chars)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+# Export des classes et fonctions
+__all__ = ['OverpassStreamParser', 'OverpassFormatError', 'iter_overpass_elements']
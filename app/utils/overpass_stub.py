@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SERVEUR OVERPASS LOCAL (STUB) - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/overpass_stub.py
+
+Serveur HTTP minimal imitant l'API Overpass pour tester la récupération OSM
+hors ligne. Les bâtiments sont synthétiques mais déterministes: chaque
+cellule de la grille globale produit toujours les mêmes bâtiments, si bien
+qu'une zone et ses sous-tuiles renvoient des résultats cohérents. Latence et
+erreurs (429, 504...) peuvent être injectées pour tester le pool de miroirs.
+
+Utilisation:
+    python -m app.utils.overpass_stub --port 8089 --latency 0.2 --error-rate 0.1 --error-status 429
+    OVERPASS_API_URLS=http://localhost:8089/api/interpreter python run.py
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 4.0 - Ultra-optimisé pour récupération complète
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+# Emprise (south, west, north, east) dans une requête Overpass
+_BBOX_PATTERN = re.compile(r'\(\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*\)')
+
+# Taille des cellules de génération (degrés)
+STUB_CELL_SIZE = 0.01
+
+# Types de bâtiments OSM générés
+STUB_BUILDING_TAGS = ['house', 'residential', 'apartments', 'commercial', 'retail', 'office', 'school', 'industrial']
+
+
+class OverpassStubHandler(BaseHTTPRequestHandler):
+    """Répond aux requêtes POST /api/interpreter comme un miroir Overpass."""
+    
+    # Paramètres partagés, définis par run_stub_server
+    latency = 0.0
+    error_rate = 0.0
+    error_status = 429
+    buildings_per_cell = 5
+    
+    def do_POST(self):
+        query = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8', errors='replace')
+        
+        if self.latency > 0:
+            time.sleep(self.latency)
+        
+        if self.error_rate > 0 and random.random() < self.error_rate:
+            body = f"Erreur simulée {self.error_status}".encode('utf-8')
+            self.send_response(self.error_status)
+            if self.error_status == 429:
+                self.send_header('Retry-After', '1')
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        match = _BBOX_PATTERN.search(query)
+        if not match:
+            self.send_error(400, "Emprise introuvable dans la requête")
+            return
+        
+        bounds = tuple(float(value) for value in match.groups())
+        body = json.dumps({
+            'version': 0.6,
+            'generator': 'Overpass stub',
+            'elements': generate_stub_buildings(bounds, self.buildings_per_cell)
+        }).encode('utf-8')
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug(format % args)
+
+
+# Fonctions utilitaires
+
+def generate_stub_buildings(bounds: Tuple[float, float, float, float], buildings_per_cell: int) -> List[Dict]:
+    """
+    Génère les ways de bâtiments synthétiques d'une emprise.
+    
+    Args:
+        bounds: (south, west, north, east)
+        buildings_per_cell: Bâtiments par cellule de STUB_CELL_SIZE degrés
+    
+    Returns:
+        Éléments Overpass (ways avec géométrie inline)
+    """
+    south, west, north, east = bounds
+    elements = []
+    
+    for row in range(int(south // STUB_CELL_SIZE), int(north // STUB_CELL_SIZE) + 1):
+        for col in range(int(west // STUB_CELL_SIZE), int(east // STUB_CELL_SIZE) + 1):
+            cell_random = random.Random(row * 1_000_003 + col)
+            for index in range(buildings_per_cell):
+                lat = (row + cell_random.random()) * STUB_CELL_SIZE
+                lon = (col + cell_random.random()) * STUB_CELL_SIZE
+                tag = cell_random.choice(STUB_BUILDING_TAGS)
+                if not (south <= lat <= north and west <= lon <= east):
+                    continue
+                
+                size = 0.0001 + 0.0002 * cell_random.random()
+                elements.append({
+                    'type': 'way',
+                    'id': (abs(row) * 100_000 + abs(col)) * 1000 + index,
+                    'tags': {'building': tag},
+                    'geometry': [
+                        {'lat': lat, 'lon': lon},
+                        {'lat': lat, 'lon': lon + size},
+                        {'lat': lat + size, 'lon': lon + size},
+                        {'lat': lat + size, 'lon': lon},
+                        {'lat': lat, 'lon': lon}
+                    ]
+                })
+    
+    return elements
+
+
+def run_stub_server(host: str = '127.0.0.1', port: int = 8089, latency: float = 0.0,
+                    error_rate: float = 0.0, error_status: int = 429,
+                    buildings_per_cell: int = 5) -> ThreadingHTTPServer:
+    """
+    Crée le serveur stub (à lancer avec serve_forever).
+    
+    Args:
+        host: Adresse d'écoute
+        port: Port d'écoute
+        latency: Délai ajouté à chaque réponse (secondes)
+        error_rate: Probabilité de répondre par error_status
+        error_status: Code HTTP des erreurs simulées
+        buildings_per_cell: Densité des bâtiments synthétiques
+    
+    Returns:
+        ThreadingHTTPServer
+    """
+    handler = type('ConfiguredOverpassStubHandler', (OverpassStubHandler,), {
+        'latency': latency,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'buildings_per_cell': buildings_per_cell
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Serveur Overpass local pour tests hors ligne")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help="Délai par réponse (secondes)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Probabilité d'erreur simulée")
+    parser.add_argument('--error-status', type=int, default=429, help="Code HTTP des erreurs simulées")
+    parser.add_argument('--buildings-per-cell', type=int, default=5)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    server = run_stub_server(args.host, args.port, args.latency, args.error_rate,
+                             args.error_status, args.buildings_per_cell)
+    print(f"🧪 Stub Overpass: http://{args.host}:{args.port}/api/interpreter")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+# Export des classes et fonctions
+__all__ = ['OverpassStubHandler', 'generate_stub_buildings', 'run_stub_server']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+INDEX SPATIAL - GÉNÉRATEUR MALAYSIA
+Fichier: app/utils/spatial_index.py
+
+Index spatial (ball-tree) en distance de Haversine, en NumPy pur.
+Les coordonnées sont projetées sur la sphère unité: la distance de corde
+(euclidienne 3D) est une fonction croissante de la distance de grand cercle,
+ce qui permet d'élaguer l'arbre avec l'inégalité triangulaire. Les requêtes
+(rayon, k plus proches voisins) sont traitées par lots, de façon vectorisée.
+
+Auteur: Équipe Développement
+Date: 2025
+Version: 3.0 - Données structurées
+"""
+
+import logging
+from typing import Tuple
+import numpy as np
+
+
+# Rayon de la Terre (km) pour la formule de Haversine
+EARTH_RADIUS_KM = 6371.0
+
+# Nombre maximal de points par feuille de l'arbre
+DEFAULT_LEAF_SIZE = 32
+
+# Nombre de requêtes traitées par lot (borne la mémoire des paires candidates)
+DEFAULT_QUERY_BATCH_SIZE = 65536
+
+# En dessous de cette taille, les k plus proches voisins sont calculés par force brute
+BRUTE_FORCE_MAX_POINTS = 256
+
+
+class HaversineIndex:
+    """
+    Ball-tree sur des coordonnées géographiques.
+    
+    Chaque nœud couvre une plage contiguë de points (après permutation) et
+    stocke une boule englobante (centre, rayon de corde). Les requêtes sont
+    traitées par lots: les paires (requête, nœud) dont la boule peut contenir
+    un point dans le rayon sont descendues niveau par niveau, puis les points
+    des feuilles retenues sont évalués en bloc.
+    """
+    
+    def __init__(self, latitudes, longitudes, leaf_size: int = DEFAULT_LEAF_SIZE):
+        """
+        Construit l'index.
+        
+        Args:
+            latitudes: Latitudes des points (degrés décimaux)
+            longitudes: Longitudes des points (degrés décimaux)
+            leaf_size: Nombre maximal de points par feuille
+        """
+        self.logger = logging.getLogger(__name__)
+        
+        points = to_unit_vectors(latitudes, longitudes)
+        self.size = len(points)
+        self.leaf_size = max(1, int(leaf_size))
+        
+        # Construction (itérative) des nœuds: plage [start, end) de la permutation
+        order = np.arange(self.size)
+        starts, ends, lefts, rights = [0], [self.size], [-1], [-1]
+        pending = [0] if self.size > self.leaf_size else []
+        
+        while pending:
+            node = pending.pop()
+            start, end = starts[node], ends[node]
+            subset = points[order[start:end]]
+            
+            # Coupe à la médiane selon l'axe de plus grande étendue
+            axis = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+            middle = (end - start) // 2
+            partition = np.argpartition(subset[:, axis], middle)
+            order[start:end] = order[start:end][partition]
+            
+            for child_start, child_end in ((start, start + middle), (start + middle, end)):
+                child = len(starts)
+                starts.append(child_start)
+                ends.append(child_end)
+                lefts.append(-1)
+                rights.append(-1)
+                if child_end - child_start > self.leaf_size:
+                    pending.append(child)
+            lefts[node], rights[node] = len(starts) - 2, len(starts) - 1
+        
+        self._order = order
+        self._points = points[order]
+        self._starts = np.array(starts, dtype=np.int64)
+        self._ends = np.array(ends, dtype=np.int64)
+        self._lefts = np.array(lefts, dtype=np.int64)
+        self._rights = np.array(rights, dtype=np.int64)
+        
+        # Boules englobantes (centre = barycentre, rayon = point le plus éloigné)
+        n_nodes = len(starts)
+        self._centers = np.zeros((n_nodes, 3))
+        self._radii = np.zeros(n_nodes)
+        for node in range(n_nodes):
+            members = self._points[starts[node]:ends[node]]
+            if len(members):
+                center = members.mean(axis=0)
+                self._centers[node] = center
+                self._radii[node] = np.sqrt(((members - center) ** 2).sum(axis=1).max())
+        
+        self.logger.debug(f"🌐 Index spatial: {self.size} points, {n_nodes} nœuds")
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def query_radius(self, latitudes, longitudes, radius_km,
+                     batch_size: int = DEFAULT_QUERY_BATCH_SIZE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Points situés à moins de `radius_km` de chaque requête.
+        
+        Args:
+            latitudes: Latitudes des requêtes
+            longitudes: Longitudes des requêtes
+            radius_km: Rayon en km (scalaire ou un par requête)
+            batch_size: Nombre de requêtes par lot
+        
+        Returns:
+            Tuple (offsets, indices, distances_km) au format CSR: les voisins
+            de la requête i sont indices[offsets[i]:offsets[i+1]], triés par
+            distance croissante
+        """
+        queries = to_unit_vectors(latitudes, longitudes)
+        chords = np.broadcast_to(km_to_chord(np.asarray(radius_km, dtype=float)), (len(queries),))
+        
+        query_ids, point_ids, distances = self._query_chord_radius(queries, chords, batch_size)
+        
+        offsets = np.zeros(len(queries) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(query_ids, minlength=len(queries)), out=offsets[1:])
+        
+        return offsets, self._order[point_ids], chord_to_km(distances)
+    
+    def query_nearest(self, latitudes, longitudes, k: int = 1,
+                      batch_size: int = DEFAULT_QUERY_BATCH_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        K plus proches voisins de chaque requête.
+        
+        Le rayon de recherche de chaque requête est borné par la k-ième
+        distance aux points du plus petit nœud (sur son chemin de descente)
+        contenant au moins k points, puis une recherche par rayon sélectionne
+        les k plus proches. Les petits index (villes) sont traités par force
+        brute (produit matriciel).
+        
+        Args:
+            latitudes: Latitudes des requêtes
+            longitudes: Longitudes des requêtes
+            k: Nombre de voisins (borné par la taille de l'index)
+            batch_size: Nombre de requêtes par lot
+        
+        Returns:
+            Tuple (distances_km, indices) de forme (n_requêtes, k), triés par distance
+        """
+        if self.size == 0:
+            raise ValueError("Index spatial vide")
+        
+        k = min(int(k), self.size)
+        queries = to_unit_vectors(latitudes, longitudes)
+        n_queries = len(queries)
+        
+        results = [self._query_nearest_batch(queries[start:start + batch_size], k)
+                   for start in range(0, n_queries, batch_size)]
+        if not results:
+            return np.empty((0, k)), np.empty((0, k), dtype=np.int64)
+        distances, indices = (np.concatenate(parts) for parts in zip(*results))
+        return distances, indices
+    
+    def _query_nearest_batch(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """K plus proches voisins pour un lot de requêtes."""
+        n_queries = len(queries)
+        
+        if self.size <= BRUTE_FORCE_MAX_POINTS:
+            # |q - p|² = 2 - 2 q·p sur la sphère unité
+            chords = np.sqrt(np.maximum(2.0 - 2.0 * (queries @ self._points.T), 0.0))
+            nearest = np.argpartition(chords, k - 1, axis=1)[:, :k] if k < self.size else \
+                np.broadcast_to(np.arange(self.size), (n_queries, self.size))
+            nearest_chords = np.take_along_axis(chords, nearest, axis=1)
+            order = np.argsort(nearest_chords, axis=1, kind='stable')
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            return chord_to_km(np.take_along_axis(nearest_chords, order, axis=1)), self._order[nearest]
+        
+        # Descente vers le nœud le plus proche tant qu'il contient au moins k points
+        nodes = np.zeros(n_queries, dtype=np.int64)
+        active = np.flatnonzero(self._lefts[nodes] >= 0)
+        while len(active):
+            current = nodes[active]
+            left, right = self._lefts[current], self._rights[current]
+            left_closer = (_squared_norm(queries[active] - self._centers[left]) <=
+                           _squared_norm(queries[active] - self._centers[right]))
+            child = np.where(left_closer, left, right)
+            descend = (self._ends[child] - self._starts[child]) >= k
+            nodes[active[descend]] = child[descend]
+            active = active[descend]
+            active = active[self._lefts[nodes[active]] >= 0]
+        
+        # Borne du k-ième voisin: k-ième distance parmi les points de ce nœud
+        starts, lengths = self._starts[nodes], self._ends[nodes] - self._starts[nodes]
+        width = int(lengths.max())
+        positions = starts[:, None] + np.arange(width)
+        padded = positions < (starts + lengths)[:, None]
+        positions = np.where(padded, positions, 0)
+        local = np.sqrt(((queries[:, None, :] - self._points[positions]) ** 2).sum(axis=2))
+        local = np.where(padded, local, np.inf)
+        bounds = np.partition(local, k - 1, axis=1)[:, k - 1]
+        bounds = bounds * (1 + 1e-9) + 1e-12
+        
+        query_ids, point_ids, distances = self._query_chord_radius_batch(queries, bounds, 0)
+        
+        # Les k premiers de chaque requête (résultats triés par requête puis distance)
+        counts = np.bincount(query_ids, minlength=n_queries)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        take = offsets[:, None] + np.arange(k)
+        
+        return chord_to_km(distances[take]), self._order[point_ids[take]]
+    
+    def _query_chord_radius(self, queries: np.ndarray, chords: np.ndarray,
+                            batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Recherche par rayon de corde, par lots de requêtes.
+        
+        Returns:
+            Tuple (requêtes, points permutés, distances de corde) trié par requête
+            puis distance
+        """
+        results = [self._query_chord_radius_batch(queries[start:start + batch_size],
+                                                  chords[start:start + batch_size], start)
+                   for start in range(0, len(queries), batch_size)]
+        if not results:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([])
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+    
+    def _query_chord_radius_batch(self, queries: np.ndarray, chords: np.ndarray,
+                                  first_query: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Recherche par rayon pour un lot de requêtes."""
+        pair_queries = np.arange(len(queries), dtype=np.int64)
+        pair_nodes = np.zeros(len(queries), dtype=np.int64)
+        leaf_queries, leaf_nodes = [], []
+        
+        # Descente des paires (requête, nœud) dont la boule intersecte le rayon
+        while len(pair_queries):
+            gaps = np.sqrt(_squared_norm(queries[pair_queries] - self._centers[pair_nodes])) - self._radii[pair_nodes]
+            keep = gaps <= chords[pair_queries]
+            pair_queries, pair_nodes = pair_queries[keep], pair_nodes[keep]
+            
+            is_leaf = self._lefts[pair_nodes] < 0
+            leaf_queries.append(pair_queries[is_leaf])
+            leaf_nodes.append(pair_nodes[is_leaf])
+            
+            inner_queries, inner_nodes = pair_queries[~is_leaf], pair_nodes[~is_leaf]
+            pair_queries = np.concatenate((inner_queries, inner_queries))
+            pair_nodes = np.concatenate((self._lefts[inner_nodes], self._rights[inner_nodes]))
+        
+        leaf_queries, leaf_nodes = np.concatenate(leaf_queries), np.concatenate(leaf_nodes)
+        
+        # Évaluation en bloc des points des feuilles retenues
+        lengths = self._ends[leaf_nodes] - self._starts[leaf_nodes]
+        candidate_queries = np.repeat(leaf_queries, lengths)
+        pair_offsets = np.cumsum(lengths) - lengths
+        candidate_points = (np.repeat(self._starts[leaf_nodes] - pair_offsets, lengths)
+                            + np.arange(int(lengths.sum())))
+        
+        distances = np.sqrt(_squared_norm(queries[candidate_queries] - self._points[candidate_points]))
+        within = distances <= chords[candidate_queries]
+        candidate_queries, candidate_points, distances = (
+            candidate_queries[within], candidate_points[within], distances[within])
+        
+        order = np.lexsort((distances, candidate_queries))
+        return candidate_queries[order] + first_query, candidate_points[order], distances[order]
+
+
+# Fonctions utilitaires
+
+def to_unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """Projette des coordonnées (degrés) sur la sphère unité, forme (n, 3)."""
+    lat = np.radians(np.atleast_1d(np.asarray(latitudes, dtype=float)))
+    lon = np.radians(np.atleast_1d(np.asarray(longitudes, dtype=float)))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def km_to_chord(distance_km):
+    """Convertit une distance de grand cercle (km) en longueur de corde sur la sphère unité."""
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def chord_to_km(chord):
+    """Convertit une longueur de corde (sphère unité) en distance de grand cercle (km)."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0.0, 1.0))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Distance de Haversine vectorisée (km).
+    
+    Args:
+        lat1, lon1: Coordonnées de départ (degrés, scalaires ou arrays)
+        lat2, lon2: Coordonnées d'arrivée (degrés, scalaires ou arrays)
+    
+    Returns:
+        Distances en km
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _squared_norm(vectors: np.ndarray) -> np.ndarray:
+    """Carré de la norme euclidienne de chaque ligne."""
+    return np.einsum('ij,ij->i', vectors, vectors)
+
+
+# Export des classes et fonctions
+__all__ = [
+    'HaversineIndex',
+    'haversine_km',
+    'to_unit_vectors',
+    'km_to_chord',
+    'chord_to_km',
+    'EARTH_RADIUS_KM'
+]
@@ -80,6 +80,14 @@ def validate_generation_request(data: Dict[str, Any], config: Any) -> Dict[str,
         if not types_validation['valid']:
             validation_result['errors'].extend(types_validation['errors'])
     
+    # Validation de la graine (optionnelle)
+    seed = data.get('seed')
+    if seed is not None:
+        if not isinstance(seed, int) or isinstance(seed, bool):
+            validation_result['errors'].append("seed doit être un entier")
+        elif seed < 0:
+            validation_result['errors'].append("seed doit être positif ou nul")
+    
     # Validation du format d'export
     export_format = data.get('export_format', 'parquet')
     format_validation = validate_export_format(export_format, config)
@@ -510,8 +518,9 @@ def validate_location_filter(location_filter: Dict) -> Dict[str, Any]:
             'Pahang', 'Penang', 'Perak', 'Perlis', 'Selangor',
             'Terengganu', 'Sabah', 'Sarawak', 'Federal Territory'
         ]
-        if state not in malaysia_states:
-            validation_result['warnings'].append(f"État non reconnu: {state}")
+        for value in (state if isinstance(state, list) else [state]):
+            if value not in malaysia_states:
+                validation_result['warnings'].append(f"État non reconnu: {value}")
     
     if 'region' in location_filter:
         region = location_filter['region']
@@ -519,8 +528,9 @@ def validate_location_filter(location_filter: Dict) -> Dict[str, Any]:
             'Northern Peninsula', 'Central Peninsula', 'Southern Peninsula',
             'East Coast', 'Sabah', 'Sarawak'
         ]
-        if region not in malaysia_regions:
-            validation_result['warnings'].append(f"Région non reconnue: {region}")
+        for value in (region if isinstance(region, list) else [region]):
+            if value not in malaysia_regions:
+                validation_result['warnings'].append(f"Région non reconnue: {value}")
     
     if 'coordinates' in location_filter:
         coords_validation = validate_coordinates_dict(location_filter['coordinates'])
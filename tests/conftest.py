@@ -0,0 +1,12 @@
+# ===== tests/conftest.py =====
+"""
+Configuration pytest du générateur Malaysia.
+Rend le package 'app' importable quel que soit le répertoire de lancement.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,21 @@
+# ===== tests/test_building_table.py =====
+"""
+Tests du modèle BuildingTable (construction depuis des données OSM).
+"""
+
+from app.models.building_table import BuildingTable
+
+
+def test_osm_records_without_tags_get_independent_dicts():
+    table = BuildingTable.from_osm_records([
+        {'osm_id': 1, 'latitude': 3.139, 'longitude': 101.687, 'building_type': 'residential'},
+        {'osm_id': 2, 'latitude': 3.140, 'longitude': 101.688, 'building_type': 'commercial'},
+        {'osm_id': 3, 'latitude': 3.141, 'longitude': 101.689, 'building_type': 'residential',
+         'tags': {'building': 'house'}}
+    ])
+    
+    characteristics = table.to_dataframe()['characteristics'].tolist()
+    characteristics[0]['osm_tags']['name'] = 'Menara'
+    
+    assert characteristics[1]['osm_tags'] == {}
+    assert characteristics[2]['osm_tags'] == {'building': 'house'}
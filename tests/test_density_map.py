@@ -0,0 +1,113 @@
+# ===== tests/test_density_map.py =====
+"""
+Tests de la carte de densité et du découpage adaptatif (quadtree).
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.density_map import HISTORY_DECAY, TileDensityMap, split_bounds
+
+
+GRID = {'south': 0.0, 'west': 0.0, 'north': 1.0, 'east': 1.0}
+QUADRANTS = split_bounds(GRID)  # Sud-ouest, sud-est, nord-ouest, nord-est
+
+
+def _dense_map(path=None):
+    """Carte 10 × 10 cellules: 1 bâtiment par cellule, 1000 dans la cellule (0.8, 0.8)."""
+    density_map = TileDensityMap(GRID, cell_size=0.1, path=path)
+    centers = np.arange(10) * 0.1 + 0.05
+    lat, lon = (grid.ravel() for grid in np.meshgrid(centers, centers, indexing='ij'))
+    rng = np.random.default_rng(0)
+    lat = np.concatenate((lat, rng.uniform(0.8, 0.9, 1000)))
+    lon = np.concatenate((lon, rng.uniform(0.8, 0.9, 1000)))
+    density_map.observe(GRID, lat, lon)
+    return density_map
+
+
+def _area(tile):
+    return (tile['north'] - tile['south']) * (tile['east'] - tile['west'])
+
+
+def _contains(tile, lat, lon):
+    return tile['south'] <= lat < tile['north'] and tile['west'] <= lon < tile['east']
+
+
+def test_estimate_follows_observations():
+    density_map = _dense_map()
+    
+    assert density_map.estimate(GRID) == pytest.approx(1100)
+    assert density_map.estimate(QUADRANTS[0]) == pytest.approx(25)
+    assert density_map.estimate(QUADRANTS[3]) == pytest.approx(1025)
+    # Centroïdes hors de la tuile observée ignorés
+    density_map.observe({'south': 0.0, 'west': 0.0, 'north': 0.1, 'east': 0.1}, [0.05, 0.5], [0.05, 0.5])
+    assert density_map.estimate({'south': 0.0, 'west': 0.0, 'north': 0.1, 'east': 0.1}) == pytest.approx(1)
+
+
+def test_unknown_area_is_split_by_area_only():
+    density_map = TileDensityMap(GRID, cell_size=0.1)
+    
+    assert density_map.estimate(GRID) is None
+    tiles = density_map.plan_tiles(GRID, max_buildings=10, max_area=0.3, min_size=0.01)
+    
+    assert sorted(map(_area, tiles)) == [0.25] * 4
+
+
+def test_dense_cell_forces_split_and_sparse_area_stays_whole():
+    density_map = _dense_map()
+    
+    tiles = density_map.plan_tiles(GRID, max_buildings=200, max_area=2.0, min_size=0.05)
+    
+    assert sum(map(_area, tiles)) == pytest.approx(1.0)
+    # Quadrants peu denses: une seule tuile chacun
+    for quadrant in QUADRANTS[:3]:
+        assert quadrant in tiles
+    # La cellule dense est découpée jusqu'à respecter l'objectif
+    dense_tiles = [tile for tile in tiles if _contains(tile, 0.85, 0.85)]
+    assert len(dense_tiles) == 1 and _area(dense_tiles[0]) < 0.25
+    for tile in tiles:
+        assert min(tile['north'] - tile['south'], tile['east'] - tile['west']) >= 0.05
+        estimate = density_map.estimate(tile)
+        can_split = min(tile['north'] - tile['south'], tile['east'] - tile['west']) / 2 >= 0.05
+        assert estimate <= 200 or not can_split
+
+
+def test_min_size_floor_is_respected():
+    density_map = _dense_map()
+    
+    tiles = density_map.plan_tiles(GRID, max_buildings=200, max_area=2.0, min_size=0.3)
+    
+    # Les quadrants (0.5) ne peuvent être redivisés (0.25 < 0.3), même trop denses
+    assert sorted(tiles, key=lambda tile: (tile['south'], tile['west'])) == \
+        sorted(QUADRANTS, key=lambda tile: (tile['south'], tile['west']))
+    assert density_map.estimate(QUADRANTS[3]) > 200
+
+
+def test_observe_minimum_marks_abandoned_tile_as_dense():
+    density_map = TileDensityMap(GRID, cell_size=0.1)
+    
+    density_map.observe_minimum(QUADRANTS[3], 5000)
+    
+    assert density_map.estimate(QUADRANTS[3]) == pytest.approx(5000)
+    tiles = density_map.plan_tiles(QUADRANTS[3], max_buildings=1000, max_area=2.0, min_size=0.05)
+    assert len(tiles) > 4
+    assert sum(map(_area, tiles)) == pytest.approx(0.25)
+
+
+def test_save_and_load_decay_history(tmp_path):
+    path = tmp_path / 'density_map.npz'
+    density_map = _dense_map(path)
+    density_map.save()
+    
+    reloaded = TileDensityMap(GRID, cell_size=0.1, path=path)
+    
+    np.testing.assert_allclose(reloaded.counts, density_map.counts * HISTORY_DECAY)
+    np.testing.assert_allclose(reloaded.coverage, density_map.coverage * HISTORY_DECAY)
+    # La densité (bâtiments / couverture) est conservée, son poids est réduit
+    assert reloaded.estimate(GRID) == pytest.approx(density_map.estimate(GRID))
+    reloaded.observe(QUADRANTS[0], [], [])
+    assert reloaded.estimate(QUADRANTS[0]) < density_map.estimate(QUADRANTS[0])
+    
+    # Grille incompatible: sauvegarde ignorée
+    other = TileDensityMap(GRID, cell_size=0.05, path=path)
+    assert other.coverage.sum() == 0
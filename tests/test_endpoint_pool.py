@@ -0,0 +1,112 @@
+# ===== tests/test_endpoint_pool.py =====
+"""
+Tests du pool de miroirs Overpass (routage, disjoncteur, pauses 429).
+"""
+
+import time
+
+import pytest
+
+from app.utils.endpoint_pool import OverpassEndpointPool, parse_retry_after
+
+
+FAST = 'http://fast/api/interpreter'
+SLOW = 'http://slow/api/interpreter'
+
+
+def _endpoint(pool, url):
+    return next(stats for stats in pool.get_stats() if stats['url'] == url)
+
+
+def test_acquire_prefers_lowest_latency():
+    pool = OverpassEndpointPool([SLOW, FAST])
+    pool.record_success(SLOW, 2.0)
+    pool.record_success(FAST, 0.1)
+    
+    url, wait = pool.acquire()
+    
+    assert url == FAST
+    assert wait == 0.0
+
+
+def test_circuit_opens_after_threshold_and_routes_away():
+    pool = OverpassEndpointPool([SLOW, FAST], failure_threshold=3, open_seconds=30)
+    pool.record_success(FAST, 1.0)
+    for _ in range(3):
+        pool.record_failure(SLOW, 0.1, status=500)
+    
+    assert _endpoint(pool, SLOW)['circuit'] == 'open'
+    assert _endpoint(pool, SLOW)['available_in_seconds'] == pytest.approx(30, abs=0.5)
+    assert [pool.acquire()[0] for _ in range(3)] == [FAST] * 3
+
+
+def test_in_flight_failures_do_not_reopen_or_extend_circuit():
+    pool = OverpassEndpointPool([SLOW], failure_threshold=2, open_seconds=30)
+    calls = [pool.acquire() for _ in range(5)]
+    started = time.monotonic()
+    assert all(url == SLOW for url, _ in calls)
+    
+    pool.record_failure(SLOW, status=500, started=started)
+    pool.record_failure(SLOW, status=500, started=started)
+    opened = pool._by_url[SLOW]
+    available_at = opened.available_at
+    
+    # Les requêtes parties avant l'ouverture échouent à leur tour
+    for _ in range(3):
+        pool.record_failure(SLOW, status=500, started=started)
+    
+    assert opened.circuit == 'open'
+    assert opened.open_count == 1
+    assert opened.available_at == available_at
+    assert opened.in_flight == 0
+
+
+def test_stale_failure_after_half_open_is_ignored():
+    pool = OverpassEndpointPool([SLOW], failure_threshold=1, open_seconds=30)
+    stale_start = time.monotonic()
+    pool.acquire()
+    pool.acquire()
+    pool.record_failure(SLOW, status=500, started=stale_start)
+    endpoint = pool._by_url[SLOW]
+    endpoint.available_at = time.monotonic()  # Fin de l'ouverture
+    
+    url, wait = pool.acquire()
+    assert (url, wait) == (SLOW, 0.0)
+    assert endpoint.circuit == 'half_open'
+    
+    # Échec d'une requête antérieure à l'ouverture: la sonde reste seule juge
+    pool.record_failure(SLOW, status=500, started=stale_start)
+    assert endpoint.circuit == 'half_open'
+    assert endpoint.open_count == 1
+    
+    # Échec de la sonde: réouverture avec durée doublée
+    pool.record_failure(SLOW, status=500, started=time.monotonic())
+    assert endpoint.circuit == 'open'
+    assert endpoint.open_count == 2
+    assert endpoint.available_at - time.monotonic() == pytest.approx(60, abs=0.5)
+
+
+def test_rate_limited_single_mirror_returns_retry_after_wait():
+    pool = OverpassEndpointPool([SLOW])
+    url, _ = pool.acquire()
+    pool.record_failure(url, 0.1, status=429, retry_after=parse_retry_after('5'))
+    
+    with pool.request() as call:
+        assert call.url == SLOW
+        assert call.wait == pytest.approx(5, abs=0.5)
+        call.succeeded = True
+    
+    # Circuit non ouvert par une limitation de débit
+    assert _endpoint(pool, SLOW)['circuit'] == 'closed'
+    assert _endpoint(pool, SLOW)['rate_limited'] == 1
+
+
+def test_request_latency_excludes_wait():
+    pool = OverpassEndpointPool([SLOW])
+    pool.record_failure(pool.acquire()[0], status=429, retry_after=0.2)
+    
+    with pool.request() as call:
+        time.sleep(call.wait)
+        call.succeeded = True
+    
+    assert _endpoint(pool, SLOW)['ewma_latency_ms'] < 100
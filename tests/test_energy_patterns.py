@@ -0,0 +1,63 @@
+# ===== tests/test_energy_patterns.py =====
+"""
+Tests du noyau vectorisé d'EnergyPatternGenerator.generate_consumption_pattern.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.energy_patterns import EnergyPatternGenerator
+
+
+def _reference_pattern(generator, building_type, date_range, characteristics, rng):
+    """Boucle par timestamp de la version scalaire (même ordre de tirages)."""
+    base_pattern = generator.base_patterns[building_type]
+    building_factor = generator._calculate_building_factors(characteristics, building_type)
+    noise_level = generator.noise_levels.get(building_type, 0.1)
+    
+    values = []
+    for timestamp in date_range:
+        consumption = (base_pattern['base_consumption_kwh'] *
+                       generator.daily_patterns[building_type][timestamp.hour] *
+                       generator.seasonal_variations[timestamp.month] *
+                       (base_pattern['weekend_factor'] if timestamp.weekday() >= 5 else 1.0) *
+                       generator._calculate_climate_factor(timestamp, 'Kuala Lumpur', base_pattern) *
+                       generator._calculate_special_factors(timestamp, building_type) *
+                       building_factor)
+        consumption *= max(0.1, rng.normal(1.0, noise_level))
+        values.append(max(0.0, consumption))
+    return np.array(values)
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return EnergyPatternGenerator()
+
+
+@pytest.mark.parametrize('building_type', ['residential', 'commercial', 'industrial', 'public'])
+def test_vectorized_pattern_matches_scalar_loop(generator, building_type):
+    # Année bissextile complète: Ramadan, jours fériés, weekends et toutes les heures
+    date_range = pd.date_range('2024-01-01', '2024-12-31 23:00', freq='h')
+    characteristics = {'floor_area_sqm': 250, 'building_age': 25}
+    
+    vectorized = generator.generate_consumption_pattern(
+        building_type, 'Kuala Lumpur', date_range, 'h', characteristics, rng=np.random.default_rng(42)
+    )
+    reference = _reference_pattern(generator, building_type, date_range, characteristics, np.random.default_rng(42))
+    
+    np.testing.assert_allclose(vectorized, reference, rtol=1e-12)
+
+
+def test_noise_distribution(generator):
+    date_range = pd.date_range('2024-03-04', periods=20000, freq='h')
+    factors = generator.base_patterns['residential']['base_consumption_kwh'] * \
+        generator.get_timestamp_factors('residential', date_range)
+    
+    consumption = generator.generate_consumption_pattern(
+        'residential', 'Kuala Lumpur', date_range, 'h', {}, rng=np.random.default_rng(0)
+    )
+    noise = consumption / factors
+    
+    assert abs(noise.mean() - 1.0) < 0.01
+    assert abs(noise.std() - generator.noise_levels['residential']) < 0.01
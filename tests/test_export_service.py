@@ -0,0 +1,65 @@
+# ===== tests/test_export_service.py =====
+"""
+Tests de l'export par morceaux (ExportService.export_dataset_chunks).
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from app.services.data_generator import ElectricityDataGenerator
+from app.services.export_service import ExportService
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return ElectricityDataGenerator()
+
+
+def _chunk(generator, building_type, start_index):
+    buildings = generator.generate_building_metadata(
+        num_buildings=4, building_types=[building_type], seed=7, start_index=start_index
+    )
+    timeseries = generator.generate_timeseries_data(buildings, '2024-01-01', '2024-01-03', 'D', seed=7)
+    return buildings, timeseries
+
+
+@pytest.mark.parametrize('export_format', ['parquet', 'csv'])
+def test_chunked_export_keeps_rows(tmp_path, generator, export_format):
+    chunks = [_chunk(generator, 'residential', 0), _chunk(generator, 'industrial', 4)]
+    
+    result = ExportService(output_dir=str(tmp_path)).export_dataset_chunks(chunks, export_format=export_format)
+    
+    assert result['success'] and result['chunks'] == 2
+    rows = {f['name'].split('_')[2]: f['rows'] for f in result['files']}
+    assert rows == {'buildings': 8, 'timeseries': 24}
+
+
+def test_parquet_chunks_keep_characteristics_of_every_type(tmp_path, generator):
+    residential = _chunk(generator, 'residential', 0)
+    industrial = _chunk(generator, 'industrial', 4)
+    
+    result = ExportService(output_dir=str(tmp_path)).export_dataset_chunks([residential, industrial])
+    
+    path = next(f['path'] for f in result['files'] if '_buildings_' in f['name'])
+    exported = pd.read_parquet(path)
+    characteristics = [json.loads(value) for value in exported['characteristics']]
+    expected = list(residential[0]['characteristics']) + list(industrial[0]['characteristics'])
+    
+    assert characteristics == expected
+    assert {'occupants', 'apartment_type'} <= set(characteristics[0])
+    assert {'industry_type', 'machinery_count'} <= set(characteristics[-1])
+
+
+def test_json_export_writes_iso_timestamps(tmp_path, generator):
+    buildings, timeseries = _chunk(generator, 'residential', 0)
+    
+    result = ExportService(output_dir=str(tmp_path)).export_dataset(
+        {'buildings': buildings, 'timeseries': timeseries}, export_format='json'
+    )
+    
+    path = next(f['path'] for f in result['files'] if '_timeseries_' in f['name'])
+    with open(path, encoding='utf-8') as f:
+        records = json.load(f)['data']
+    assert records[0]['timestamp'] == '2024-01-01T00:00:00+08:00'
@@ -0,0 +1,31 @@
+# ===== tests/test_generation_routes.py =====
+"""
+Tests des routes de génération (/generate).
+"""
+
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture(scope='module')
+def client():
+    app = create_app('testing')
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def test_generate_returns_iso_timestamps_with_offset(client):
+    response = client.post('/generate/', json={
+        'num_buildings': 2,
+        'start_date': '2024-01-01',
+        'end_date': '2024-01-03',
+        'frequency': 'D',
+        'seed': 42
+    })
+    
+    assert response.status_code == 200
+    timeseries = response.get_json()['data']['timeseries']
+    assert len(timeseries) == 6
+    assert timeseries[0]['timestamp'] == '2024-01-01T00:00:00+08:00'
+    assert timeseries[-1]['timestamp'] == '2024-01-03T00:00:00+08:00'
@@ -0,0 +1,96 @@
+# ===== tests/test_geometry.py =====
+"""
+Tests des calculs géométriques par lots (surface, centroïde, emprise).
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.geometry import EARTH_RADIUS_M, polygon_metrics
+
+
+UNIT = 0.001  # Degrés
+ORIGIN_LAT, ORIGIN_LON = 3.1, 101.7
+
+
+def _ring(points):
+    """Convertit des sommets (x, y) en unités de UNIT en (latitudes, longitudes)."""
+    points = np.asarray(points, dtype=float)
+    return ORIGIN_LAT + points[:, 1] * UNIT, ORIGIN_LON + points[:, 0] * UNIT
+
+
+def _rectangle_area(x0, y0, x1, y1):
+    """Surface exacte sur la sphère d'un rectangle en latitude/longitude."""
+    south, north = np.radians(ORIGIN_LAT + y0 * UNIT), np.radians(ORIGIN_LAT + y1 * UNIT)
+    return EARTH_RADIUS_M ** 2 * np.radians((x1 - x0) * UNIT) * (np.sin(north) - np.sin(south))
+
+
+def _metrics(*rings):
+    latitudes = np.concatenate([ring[0] for ring in rings]) if rings else np.array([])
+    longitudes = np.concatenate([ring[1] for ring in rings]) if rings else np.array([])
+    offsets = np.concatenate(([0], np.cumsum([len(ring[0]) for ring in rings]))).astype(np.int64)
+    return polygon_metrics(latitudes, longitudes, offsets)
+
+
+SQUARE = _ring([(0, 0), (1, 0), (1, 1), (0, 1)])
+L_SHAPE = _ring([(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)])
+
+
+def test_square_area_and_centroid():
+    metrics = _metrics(SQUARE)
+    
+    assert metrics['area_sqm'][0] == pytest.approx(_rectangle_area(0, 0, 1, 1), rel=1e-9)
+    assert metrics['area_sqm'][0] == pytest.approx(111.2 ** 2 * np.cos(np.radians(ORIGIN_LAT)), rel=1e-3)
+    assert metrics['centroid_lat'][0] == pytest.approx(ORIGIN_LAT + UNIT / 2, abs=1e-9)
+    assert metrics['centroid_lon'][0] == pytest.approx(ORIGIN_LON + UNIT / 2, abs=1e-9)
+    assert (metrics['south'][0], metrics['west'][0]) == (ORIGIN_LAT, ORIGIN_LON)
+    assert (metrics['north'][0], metrics['east'][0]) == (ORIGIN_LAT + UNIT, ORIGIN_LON + UNIT)
+
+
+def test_l_shape_centroid_lies_outside_vertex_mean():
+    metrics = _metrics(L_SHAPE)
+    
+    expected_area = _rectangle_area(0, 0, 2, 1) + _rectangle_area(0, 1, 1, 2)
+    assert metrics['area_sqm'][0] == pytest.approx(expected_area, rel=1e-9)
+    # Centroïde vrai (5/6, 5/6), différent de la moyenne des sommets (1, 5/6)
+    assert metrics['centroid_lat'][0] == pytest.approx(ORIGIN_LAT + 5 / 6 * UNIT, abs=1e-8)
+    assert metrics['centroid_lon'][0] == pytest.approx(ORIGIN_LON + 5 / 6 * UNIT, abs=1e-8)
+
+
+def test_explicitly_closed_ring_matches_open_ring():
+    closed = tuple(np.append(coordinates, coordinates[0]) for coordinates in L_SHAPE)
+    reversed_ring = tuple(coordinates[::-1] for coordinates in L_SHAPE)
+    
+    metrics = _metrics(L_SHAPE, closed, reversed_ring)
+    
+    for key in ('area_sqm', 'centroid_lat', 'centroid_lon'):
+        np.testing.assert_allclose(metrics[key], metrics[key][0], rtol=1e-12)
+
+
+def test_degenerate_and_empty_polygons_in_one_batch():
+    segment = _ring([(0, 0), (2, 1)])
+    empty = (np.array([]), np.array([]))
+    
+    metrics = _metrics(SQUARE, empty, segment, L_SHAPE, empty)
+    
+    np.testing.assert_allclose(metrics['area_sqm'][[0, 3]],
+                               [_rectangle_area(0, 0, 1, 1), _metrics(L_SHAPE)['area_sqm'][0]], rtol=1e-9)
+    
+    # Moins de 3 sommets: surface nulle, centroïde = moyenne des sommets
+    assert metrics['area_sqm'][2] == 0.0
+    assert metrics['centroid_lat'][2] == pytest.approx(ORIGIN_LAT + 0.5 * UNIT, abs=1e-9)
+    assert metrics['centroid_lon'][2] == pytest.approx(ORIGIN_LON + 1.0 * UNIT, abs=1e-9)
+    
+    # Polygones sans sommet: NaN, sans perturber leurs voisins
+    for index in (1, 4):
+        assert metrics['area_sqm'][index] == 0.0
+        for key in ('centroid_lat', 'centroid_lon', 'south', 'west', 'north', 'east'):
+            assert np.isnan(metrics[key][index])
+    assert metrics['centroid_lat'][3] == pytest.approx(ORIGIN_LAT + 5 / 6 * UNIT, abs=1e-8)
+    assert metrics['east'][3] == ORIGIN_LON + 2 * UNIT
+
+
+def test_empty_batch():
+    metrics = polygon_metrics(np.array([]), np.array([]), np.array([0]))
+    
+    assert all(len(values) == 0 for values in metrics.values())
@@ -0,0 +1,43 @@
+# ===== tests/test_import_time.py =====
+"""
+Budget de temps d'import: les dépendances lourdes et les services ne
+doivent être chargés qu'à leur première utilisation.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Temps maximal pour "import app" dans un interpréteur neuf (secondes)
+IMPORT_BUDGET_SECONDS = 2.0
+
+LAZY_MODULES = ['faker', 'aiohttp', 'app.services.osm_service']
+
+
+def _run_isolated(statement: str) -> dict:
+    """Exécute statement dans un nouvel interpréteur et retourne durée et modules chargés."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_app_within_budget():
+    result = _run_isolated("import app")
+    
+    assert result['loaded'] == []
+    assert result['elapsed'] < IMPORT_BUDGET_SECONDS
+
+
+def test_create_app_does_not_load_lazy_services():
+    result = _run_isolated("import app\napp.create_app('testing')")
+    
+    assert result['loaded'] == []
@@ -0,0 +1,67 @@
+# ===== tests/test_malaysia_data.py =====
+"""
+Tests des index de localisations de MalaysiaLocationData.
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.malaysia_data import MalaysiaLocationData
+
+
+@pytest.fixture(scope='module')
+def malaysia_data():
+    return MalaysiaLocationData()
+
+
+def _cities(malaysia_data, **criteria):
+    return set(malaysia_data.query_cities(criteria))
+
+
+def test_list_values_select_union_of_indexes(malaysia_data):
+    selangor = _cities(malaysia_data, state='Selangor')
+    johor = _cities(malaysia_data, state='Johor')
+    
+    assert selangor and johor
+    assert _cities(malaysia_data, state=['Selangor']) == selangor
+    assert _cities(malaysia_data, state=['Selangor', 'Johor']) == selangor | johor
+    assert _cities(malaysia_data, state=[{'name': 'Selangor'}]) == set()
+
+
+def test_list_values_match_scan_on_custom_locations(malaysia_data):
+    locations = dict(malaysia_data.get_available_locations())
+    location_filter = {'state': ['Selangor', 'Johor'], 'min_population': 100000}
+    
+    scanned = malaysia_data.filter_locations(locations, location_filter)
+    
+    assert set(scanned) == _cities(malaysia_data, **location_filter)
+
+
+def test_generate_accepts_state_list():
+    from app import create_app
+    
+    client = create_app('testing').test_client()
+    response = client.post('/generate/', json={
+        'num_buildings': 5, 'start_date': '2024-01-01', 'end_date': '2024-01-02',
+        'frequency': 'D', 'seed': 1, 'location_filter': {'state': ['Selangor']}
+    })
+    
+    assert response.status_code == 200
+    assert {b['state'] for b in response.get_json()['data']['buildings']} == {'Selangor'}
+
+
+def test_weighted_selection_uses_callers_data_and_populations(malaysia_data):
+    rng = np.random.default_rng(0)
+    first = {'X': {'population': 10, 'tag': 'first'}, 'Y': {'population': 1e9, 'tag': 'first'}}
+    second = {'X': {'population': 1e9, 'tag': 'second'}, 'Y': {'population': 10, 'tag': 'second'}}
+    
+    first_draws = [malaysia_data.select_weighted_location(first, rng) for _ in range(200)]
+    second_draws = [malaysia_data.select_weighted_location(second, rng) for _ in range(200)]
+    
+    assert sum(draw['city'] == 'Y' for draw in first_draws) > 150
+    assert sum(draw['city'] == 'X' for draw in second_draws) > 150
+    assert {draw['tag'] for draw in second_draws} == {'second'}
+    
+    # Copies: modifier un tirage ne touche pas les données de l'appelant
+    second_draws[0]['tag'] = 'modifié'
+    assert second['X']['tag'] == second['Y']['tag'] == 'second'
@@ -0,0 +1,149 @@
+# ===== tests/test_osm_building_store.py =====
+"""
+Tests du stockage colonnaire OSMBuildingStore (conversions, fusion, sélection).
+"""
+
+import numpy as np
+import pytest
+
+from app.models.osm_building_store import TAG_FIELDS, OSMBuildingStore
+
+
+def _record(osm_type, osm_id, building_type='residential', tags=None, coordinates=None,
+            levels=None, height=None, area_sqm=None):
+    """Bâtiment au format du parseur Overpass (celui que restitue to_records)."""
+    tags = tags or {}
+    coordinates = coordinates or []
+    record = {
+        'osm_id': f"{osm_type}/{osm_id}",
+        'osm_type': osm_type,
+        'latitude': 3.0 + osm_id * 1e-3,
+        'longitude': 101.0 + osm_id * 1e-3,
+        'building_type': building_type,
+        'area_sqm': area_sqm,
+        'levels': levels,
+        'height': height
+    }
+    for field, key in TAG_FIELDS.items():
+        record[field] = tags.get(key)
+    record['tags'] = tags
+    record['geometry_type'] = 'multipolygon' if osm_type == 'relation' else 'polygon'
+    if coordinates:
+        record['coordinates'] = coordinates
+    return record
+
+
+def _square(osm_id, vertices=4):
+    return [{'lat': 3.0 + osm_id * 1e-3 + i * 1e-5, 'lon': 101.0 + i * 1e-5} for i in range(vertices)]
+
+
+RECORDS = [
+    _record('way', 1, tags={'building': 'house', 'name': 'Rumah 1', 'addr:city': 'Kuala Lumpur'},
+            coordinates=_square(1), levels=2, height=7.5, area_sqm=120.0),
+    _record('way', 2, 'commercial', tags={'building': 'retail', 'addr:street': 'Jalan Ampang'},
+            coordinates=_square(2, 6), area_sqm=800.0),
+    _record('relation', 3, 'industrial', tags={'building': 'industrial'}),
+    _record('way', 4),
+    _record('way', 5, 'commercial', tags={'building': 'retail', 'name': 'Kedai'},
+            coordinates=_square(5, 3), levels=1, height=4.0)
+]
+
+
+def test_records_round_trip():
+    store = OSMBuildingStore.from_records(RECORDS)
+    
+    assert len(store) == len(RECORDS)
+    assert store.to_records() == RECORDS
+    assert store.geometry_sizes.tolist() == [4, 6, 0, 0, 3]
+    assert store.building_type_counts() == {'residential': 2, 'commercial': 2, 'industrial': 1}
+    assert store.tag_column('name').tolist() == ['Rumah 1', None, None, None, 'Kedai']
+    assert all('coordinates' not in record for record in store.to_records(include_geometry=False))
+
+
+def test_empty_store_round_trip():
+    store = OSMBuildingStore.empty()
+    
+    assert len(store) == 0
+    assert store.to_records() == []
+    assert len(OSMBuildingStore.concat([store, store])) == 0
+
+
+def test_concat_merges_dictionaries_then_deduplicates():
+    first = OSMBuildingStore.from_records(RECORDS[:2])
+    second = OSMBuildingStore.from_records([
+        _record('way', 9, 'public', tags={'amenity': 'school', 'building': 'school'}, coordinates=_square(9)),
+        RECORDS[0],  # Doublon de way/1
+        _record('relation', 1, 'industrial', tags={'building': 'warehouse'})  # Même id, autre type
+    ])
+    # Dictionnaires différents d'un stockage à l'autre
+    assert first.building_types.tolist() != second.building_types.tolist()
+    assert first.tag_key_dictionary.tolist() != second.tag_key_dictionary.tolist()
+    
+    merged = OSMBuildingStore.concat([first, second])
+    
+    assert merged.to_records() == first.to_records() + second.to_records()
+    assert sorted(merged.building_types.tolist()) == ['commercial', 'industrial', 'public', 'residential']
+    
+    unique = merged.deduplicate()
+    
+    assert [record['osm_id'] for record in unique.to_records()] == ['way/1', 'way/2', 'way/9', 'relation/1']
+    assert unique.to_records() == merged.to_records()[:3] + merged.to_records()[4:]
+
+
+def test_select_over_ragged_columns():
+    store = OSMBuildingStore.from_records(RECORDS)
+    records = store.to_records()
+    
+    for rows, expected in [
+        ([4, 2, 0], [records[4], records[2], records[0]]),
+        (np.array([False, True, True, False, True]), [records[1], records[2], records[4]]),
+        (slice(1, 4), records[1:4]),
+        ([3, 3], [records[3], records[3]]),
+        ([], [])
+    ]:
+        selected = store.select(rows)
+        assert selected.to_records() == expected
+        assert selected.coord_offsets[-1] == len(selected.coord_lat) == selected.geometry_sizes.sum()
+        assert selected.tag_offsets[-1] == len(selected.tag_keys) == len(selected.tag_values)
+
+
+def test_dataframe_round_trip_without_copies():
+    records = [_record('way', i, 'residential' if i % 2 else 'commercial',
+                       tags={'building': 'yes', 'name': f"B{i}"}, coordinates=_square(i),
+                       levels=i % 3, height=3.0 * (i % 3), area_sqm=100.0 + i)
+               for i in range(1, 51)]
+    store = OSMBuildingStore.from_records(records)
+    
+    df = store.to_dataframe()
+    
+    assert len(df) == len(store)
+    assert df['building_type'].tolist() == [record['building_type'] for record in records]
+    for name in ('osm_id', 'latitude', 'longitude', 'area_sqm', 'levels', 'height'):
+        assert np.shares_memory(df[name].to_numpy(), getattr(store, name)), name
+    
+    restored = OSMBuildingStore.from_dataframe(df)
+    
+    assert restored.to_records() == records
+    for name in ('osm_id', 'latitude', 'longitude', 'area_sqm', 'levels', 'height',
+                 'coord_offsets', 'coord_lat', 'coord_lon', 'tag_offsets', 'tag_keys', 'tag_values'):
+        assert np.shares_memory(getattr(restored, name), getattr(store, name)), name
+
+
+def test_dataframe_round_trip_with_missing_values():
+    store = OSMBuildingStore.from_records(RECORDS)
+    
+    restored = OSMBuildingStore.from_dataframe(store.to_dataframe())
+    
+    # Colonnes avec NaN (valeurs nulles côté Arrow): copiées, mais valeurs identiques
+    assert restored.to_records() == RECORDS
+    np.testing.assert_array_equal(restored.height, store.height)
+
+
+@pytest.mark.parametrize('include_geometry', [True, False])
+def test_arrow_round_trip(include_geometry):
+    store = OSMBuildingStore.from_records(RECORDS)
+    
+    restored = OSMBuildingStore.from_arrow(store.to_arrow())
+    
+    assert restored.to_records(include_geometry) == store.to_records(include_geometry)
+    assert np.shares_memory(restored.coord_lat, store.coord_lat)
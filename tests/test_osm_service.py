@@ -0,0 +1,170 @@
+# ===== tests/test_osm_service.py =====
+"""
+Tests du service OSM (configuration, routage des miroirs Overpass).
+
+Les miroirs sont simulés par app/utils/overpass_stub.py.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app import create_app
+from app.services.osm_service import OSMService
+from app.utils.overpass_stub import generate_stub_buildings, run_stub_server
+
+
+def test_create_app_passes_config_to_osm_service():
+    app = create_app('testing')
+    app.config['OVERPASS_API_URLS'] = ['http://127.0.0.1:1/api/interpreter']
+    app.config['OSM_MAX_CONCURRENT'] = 3
+    
+    service = app.osm_service.get_instance()
+    
+    assert service.overpass_urls == ['http://127.0.0.1:1/api/interpreter']
+    assert service.timeout == app.config['OSM_REQUEST_TIMEOUT']
+    assert service.max_concurrent_requests == app.config['OSM_MAX_CONCURRENT']
+    assert service.cache_enabled == app.config['OSM_CACHE_ENABLED']
+    assert service.cache_dir == Path(app.config['CACHE_DIR']) / 'osm_v4'
+
+
+@pytest.fixture
+def stub_server():
+    """Démarre des serveurs Overpass stub sur des ports libres; retourne leur URL."""
+    servers = []
+    
+    def start(**kwargs):
+        server = run_stub_server(port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/api/interpreter"
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _service(tmp_path, urls, **config):
+    return OSMService({
+        'OVERPASS_API_URLS': urls,
+        'CACHE_DIR': tmp_path,
+        'OSM_REQUEST_TIMEOUT': 20,
+        'OSM_MAX_RETRIES': 4,
+        **config
+    })
+
+
+def _request_zones(service, zones):
+    async def run():
+        async with service._create_session() as session:
+            return await asyncio.gather(*[
+                service._request_zone_async(session, name, bounds) for name, bounds in zones
+            ])
+    return asyncio.run(run())
+
+
+def _zones(count):
+    return [(f"z{i}", {'south': 3.0, 'west': 101.0 + i * 0.01, 'north': 3.01, 'east': 101.01 + i * 0.01})
+            for i in range(count)]
+
+
+def _endpoint_stats(service, url):
+    return next(stats for stats in service.get_endpoint_stats() if stats['url'] == url)
+
+
+def test_pool_routes_requests_to_fast_mirror(tmp_path, stub_server):
+    slow = stub_server(latency=0.3)
+    fast = stub_server()
+    service = _service(tmp_path, [slow, fast])
+    
+    # Première vague: mesure des deux miroirs, puis requêtes séquentielles
+    _request_zones(service, _zones(2))
+    for zone in _zones(6):
+        assert _request_zones(service, [zone])[0] is not None
+    
+    assert _endpoint_stats(service, fast)['requests'] >= 6
+    assert _endpoint_stats(service, slow)['requests'] <= 2
+
+
+def test_failing_mirror_circuit_opens(tmp_path, stub_server):
+    failing = stub_server(error_rate=1.0, error_status=500)
+    healthy = stub_server()
+    service = _service(tmp_path, [failing, healthy])
+    
+    results = _request_zones(service, _zones(8))
+    
+    assert all(result is not None and len(result) > 0 for result in results)
+    assert _endpoint_stats(service, failing)['circuit'] == 'open'
+    assert _endpoint_stats(service, healthy)['failures'] == 0
+    assert service.stats['failed_requests'] == 0
+
+
+def test_retry_after_pause_is_honoured(tmp_path, stub_server):
+    limited = stub_server(error_rate=1.0, error_status=429)
+    service = _service(tmp_path, [limited], OSM_MAX_RETRIES=2)
+    
+    start = time.monotonic()
+    results = _request_zones(service, _zones(3))
+    elapsed = time.monotonic() - start
+    
+    # Retry-After: 1 renvoyé par le stub: aucune seconde tentative avant 1 s
+    assert results == [None, None, None]
+    assert elapsed >= 1.0
+    stats = _endpoint_stats(service, limited)
+    assert stats['rate_limited'] == 6
+    assert stats['circuit'] == 'closed'
+
+
+def test_state_download_against_two_stub_mirrors(tmp_path, stub_server):
+    failing = stub_server(error_rate=1.0, error_status=500)
+    healthy = stub_server(latency=0.05)
+    service = _service(tmp_path, [failing, healthy], OSM_MAX_BUILDINGS_PER_REQUEST=5000)
+    bounds = service.malaysia_states['perlis']
+    
+    buildings = asyncio.run(service._get_buildings_for_state_async('perlis', bounds))
+    
+    expected = generate_stub_buildings((bounds['south'], bounds['west'], bounds['north'], bounds['east']), 5)
+    assert len(buildings) == len(expected)
+    assert set(buildings.osm_id.tolist()) == {element['id'] for element in expected}
+    assert service.stats['tiles_split'] >= 1
+    assert _endpoint_stats(service, failing)['circuit'] == 'open'
+    
+    # Deuxième appel servi par le cache (dans tmp_path)
+    assert list((tmp_path / 'osm_v4').glob('zone_perlis_*.pkl.gz'))
+    cached = asyncio.run(service._get_buildings_for_state_async('perlis', bounds))
+    assert len(cached) == len(expected)
+    assert service.stats['cache_hits'] == 1
+
+
+def test_incomplete_zone_is_not_cached(tmp_path, stub_server, caplog):
+    failing = stub_server(error_rate=1.0, error_status=500)
+    service = _service(tmp_path, [failing], OSM_MAX_RETRIES=1)
+    bounds = service.malaysia_states['perlis']
+    
+    with caplog.at_level('WARNING', logger='app.services.osm_service'):
+        buildings = asyncio.run(service._get_buildings_for_state_async('perlis', bounds))
+    
+    assert len(buildings) == 0
+    assert not list((tmp_path / 'osm_v4').glob('zone_perlis_*.pkl.gz'))
+    assert 'non mise en cache' in caplog.text
+
+
+def test_tile_exceptions_are_logged_and_zone_not_cached(tmp_path, monkeypatch, caplog):
+    service = _service(tmp_path, ['http://127.0.0.1:1/api/interpreter'])
+    bounds = service.malaysia_states['perlis']
+    
+    async def broken_request(session, zone_name, zone_bounds, can_split=False):
+        raise RuntimeError("réponse illisible")
+    
+    monkeypatch.setattr(service, '_request_zone_async', broken_request)
+    
+    with caplog.at_level('WARNING', logger='app.services.osm_service'):
+        buildings = asyncio.run(service._get_buildings_for_state_async('perlis', bounds))
+    
+    assert len(buildings) == 0
+    assert 'RuntimeError: réponse illisible' in caplog.text
+    assert not list((tmp_path / 'osm_v4').glob('zone_perlis_*.pkl.gz'))
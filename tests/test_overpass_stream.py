@@ -0,0 +1,76 @@
+# ===== tests/test_overpass_stream.py =====
+"""
+Tests du parseur incrémental des réponses Overpass.
+"""
+
+import json
+import time
+
+import pytest
+
+from app.utils.overpass_stream import OverpassFormatError, OverpassStreamParser, iter_overpass_elements
+
+
+def _response(elements, remark=None):
+    data = {'version': 0.6, 'generator': 'test', 'elements': elements}
+    if remark:
+        data['remark'] = remark
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _chunks(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+ELEMENTS = [
+    {'type': 'way', 'id': i, 'tags': {'building': 'yes', 'name': f'Bâtiment {i} "é"'},
+     'geometry': [{'lat': 3.1 + i * 1e-4, 'lon': 101.6}] * 5}
+    for i in range(300)
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000, 1 << 20])
+def test_stream_matches_full_parse(chunk_size):
+    body = _response(ELEMENTS)
+    
+    assert list(iter_overpass_elements(_chunks(body, chunk_size))) == ELEMENTS
+
+
+def test_remark_and_truncation():
+    parser = OverpassStreamParser()
+    elements = parser.feed(_response(ELEMENTS[:3], remark='runtime error: timeout'))
+    elements += parser.close()
+    assert elements == ELEMENTS[:3]
+    assert parser.remark == 'runtime error: timeout'
+    
+    with pytest.raises(ValueError):
+        list(iter_overpass_elements([_response(ELEMENTS)[:-40]]))
+
+
+@pytest.mark.parametrize('body', [
+    b'<html><body>Server busy</body></html>',
+    b'{"error": "rate limited"}',
+    b''
+])
+def test_response_without_elements_is_an_error(body):
+    with pytest.raises(OverpassFormatError):
+        list(iter_overpass_elements([body]))
+
+
+def test_large_element_is_linear_in_chunks():
+    relation = {'type': 'relation', 'id': 1, 'tags': {'building': 'yes'},
+                'members': [{'type': 'way', 'ref': i, 'role': 'outer',
+                             'geometry': [{'lat': 3.1, 'lon': 101.6}] * 10} for i in range(20000)]}
+    body = _response([relation, ELEMENTS[0]])
+    assert len(body) > 5_000_000
+    
+    start = time.perf_counter()
+    whole = list(iter_overpass_elements([body]))
+    whole_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    chunked = list(iter_overpass_elements(_chunks(body, 64 * 1024)))
+    chunked_seconds = time.perf_counter() - start
+    
+    assert chunked == whole == [relation, ELEMENTS[0]]
+    assert chunked_seconds < 5 * whole_seconds + 0.5
@@ -0,0 +1,91 @@
+# ===== tests/test_spatial_index.py =====
+"""
+Tests de l'index spatial HaversineIndex (parité avec la force brute).
+"""
+
+import numpy as np
+import pytest
+
+from app.utils.spatial_index import BRUTE_FORCE_MAX_POINTS, HaversineIndex, haversine_km
+
+
+def _random_points(rng, n):
+    # Emprise de la Malaysia (et un peu au-delà)
+    return rng.uniform(0.5, 7.5, n), rng.uniform(99.5, 119.5, n)
+
+
+def _brute_force_distances(lat, lon, query_lat, query_lon):
+    return haversine_km(query_lat[:, None], query_lon[:, None], lat[None, :], lon[None, :])
+
+
+@pytest.mark.parametrize('n_points', [5, BRUTE_FORCE_MAX_POINTS, BRUTE_FORCE_MAX_POINTS + 1, 5000])
+@pytest.mark.parametrize('k', [1, 4, 40])
+def test_query_nearest_matches_brute_force(n_points, k):
+    rng = np.random.default_rng(n_points + k)
+    lat, lon = _random_points(rng, n_points)
+    query_lat, query_lon = _random_points(rng, 300)
+    index = HaversineIndex(lat, lon, leaf_size=16)
+    
+    distances, indices = index.query_nearest(query_lat, query_lon, k=k, batch_size=128)
+    
+    expected = _brute_force_distances(lat, lon, query_lat, query_lon)
+    expected_indices = np.argsort(expected, axis=1, kind='stable')[:, :min(k, n_points)]
+    assert distances.shape == indices.shape == (300, min(k, n_points))
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(distances, np.take_along_axis(expected, expected_indices, axis=1), atol=1e-6)
+
+
+@pytest.mark.parametrize('n_points', [5, BRUTE_FORCE_MAX_POINTS, 5000])
+def test_query_radius_matches_brute_force(n_points):
+    rng = np.random.default_rng(n_points)
+    lat, lon = _random_points(rng, n_points)
+    query_lat, query_lon = _random_points(rng, 200)
+    radii = rng.uniform(0, 300, 200)
+    index = HaversineIndex(lat, lon, leaf_size=16)
+    
+    offsets, indices, distances = index.query_radius(query_lat, query_lon, radii, batch_size=64)
+    
+    expected = _brute_force_distances(lat, lon, query_lat, query_lon)
+    assert offsets[0] == 0 and offsets[-1] == len(indices) == len(distances)
+    for i in range(200):
+        found = indices[offsets[i]:offsets[i + 1]]
+        found_distances = distances[offsets[i]:offsets[i + 1]]
+        assert set(found.tolist()) == set(np.flatnonzero(expected[i] <= radii[i]).tolist())
+        assert np.all(np.diff(found_distances) >= 0)
+        np.testing.assert_allclose(found_distances, expected[i, found], atol=1e-6)
+
+
+def test_scalar_radius_applies_to_every_query():
+    rng = np.random.default_rng(1)
+    lat, lon = _random_points(rng, 1000)
+    index = HaversineIndex(lat, lon)
+    
+    offsets, indices, _ = index.query_radius(lat[:10], lon[:10], 50.0)
+    
+    expected = _brute_force_distances(lat, lon, lat[:10], lon[:10]) <= 50.0
+    np.testing.assert_array_equal(np.diff(offsets), expected.sum(axis=1))
+    # Chaque point est son propre voisin à distance nulle
+    assert all(indices[offsets[i]] == i for i in range(10))
+
+
+def test_empty_index():
+    index = HaversineIndex([], [])
+    
+    assert len(index) == 0
+    offsets, indices, distances = index.query_radius([3.1, 4.0], [101.7, 102.0], 100.0)
+    np.testing.assert_array_equal(offsets, [0, 0, 0])
+    assert len(indices) == len(distances) == 0
+    with pytest.raises(ValueError):
+        index.query_nearest([3.1], [101.7])
+
+
+def test_empty_query():
+    rng = np.random.default_rng(2)
+    index = HaversineIndex(*_random_points(rng, 500))
+    
+    offsets, indices, distances = index.query_radius([], [], 10.0)
+    np.testing.assert_array_equal(offsets, [0])
+    assert len(indices) == len(distances) == 0
+    
+    distances, indices = index.query_nearest([], [], k=3)
+    assert distances.shape == indices.shape == (0, 3)
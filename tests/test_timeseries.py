@@ -0,0 +1,118 @@
+# ===== tests/test_timeseries.py =====
+"""
+Tests du modèle TimeSeriesCollection (colonnes triées, ajouts incrémentaux).
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.timeseries import TimeSeries, TimeSeriesCollection, VALIDATION_STATUSES
+
+
+START = datetime(2024, 1, 1)
+
+
+def _observation(hour, value, status='valid'):
+    return TimeSeries(unique_id='B1', timestamp=START + timedelta(hours=hour),
+                      consumption_kwh=value, validation_status=status)
+
+
+def test_out_of_order_inserts_match_bulk_construction():
+    rng = np.random.default_rng(5)
+    hours = rng.integers(0, 200, size=500)  # Doublons et désordre
+    values = rng.uniform(0, 50, size=500).round(3)
+    
+    collection = TimeSeriesCollection(building_id='B1')
+    for hour, value in zip(hours.tolist(), values.tolist()):
+        collection.add_observation(_observation(hour, value))
+    
+    order = np.argsort(hours, kind='stable')
+    np.testing.assert_array_equal(collection.values, values[order])
+    assert np.all(np.diff(collection.timestamps) >= 0)
+    assert collection.metadata['total_observations'] == 500
+    assert collection.metadata['consumption_stats']['total_kwh'] == pytest.approx(values.sum())
+    assert collection.metadata['date_range']['start'] == (START + timedelta(hours=int(hours.min()))).isoformat() + '+08:00'
+
+
+def test_add_observation_keeps_columns_lazy():
+    collection = TimeSeriesCollection.from_arrays(
+        pd.date_range(START, periods=10, freq='h', tz='Asia/Kuala_Lumpur').as_unit('ns').asi8,
+        np.arange(10, dtype=float), building_id='B1'
+    )
+    
+    collection.add_observation(_observation(-5, 99.0))
+    
+    assert collection._observations is None
+    assert collection.values[0] == 99.0
+    assert collection.metadata['consumption_stats']['max_kwh'] == 99.0
+
+
+def test_materialized_observations_stay_in_timestamp_order():
+    first, second, third = _observation(2, 1.0), _observation(0, 2.0), _observation(1, 3.0, 'suspect')
+    collection = TimeSeriesCollection([first], building_id='B1')
+    
+    collection.add_observation(second)
+    collection.add_observation(third)
+    
+    assert collection.observations == [second, third, first]
+    assert collection.observations[1] is third
+    assert collection.metadata['validation_summary'] == dict(zip(VALIDATION_STATUSES, [2, 0, 1, 0]))
+    
+    in_range = collection.get_observations_in_range(START + timedelta(hours=1), START + timedelta(hours=2))
+    assert in_range == [third, first]
+
+
+def test_interpolation_keeps_unique_ids_and_reports_snapping(caplog):
+    from app.models.timeseries import interpolate_missing_observations
+    
+    collection = TimeSeriesCollection([
+        TimeSeries(unique_id='meter-a', timestamp=START, consumption_kwh=1.0),
+        TimeSeries(unique_id='meter-b', timestamp=START + timedelta(hours=3, minutes=10), consumption_kwh=4.0),
+        TimeSeries(unique_id='meter-c', timestamp=START + timedelta(hours=3), consumption_kwh=9.0)
+    ], building_id='B1')
+    
+    with caplog.at_level('WARNING', logger='app.models.timeseries'):
+        filled = interpolate_missing_observations(collection, frequency='H')
+    
+    assert [obs.unique_id for obs in filled.observations] == ['meter-a', 'meter-a', 'meter-a', 'meter-c']
+    assert [obs.validation_status for obs in filled.observations] == ['valid', 'interpolated', 'interpolated', 'valid']
+    np.testing.assert_allclose(filled.values, [1.0, 3.67, 6.33, 9.0], atol=0.01)
+    assert '1 mesures hors grille' in caplog.text and '1 mesures en doublon' in caplog.text
+
+
+def test_interpolation_last_measurement_rounded_up_stays_in_segment():
+    from app.models.timeseries import interpolate_missing_observations
+    
+    collection = TimeSeriesCollection([
+        TimeSeries(unique_id='B1', timestamp=START, consumption_kwh=1.0),
+        TimeSeries(unique_id='B1', timestamp=START + timedelta(hours=1), consumption_kwh=2.0),
+        TimeSeries(unique_id='B1', timestamp=START + timedelta(hours=2, minutes=40), consumption_kwh=4.0)
+    ], building_id='B1')
+    
+    filled = interpolate_missing_observations(collection, frequency='H')
+    
+    assert [obs.timestamp.hour for obs in filled.observations] == [0, 1, 2, 3]
+    assert [obs.validation_status for obs in filled.observations] == ['valid', 'valid', 'interpolated', 'valid']
+    np.testing.assert_allclose(filled.values, [1.0, 2.0, 3.0, 4.0])
+
+
+def test_interpolation_rounded_up_measurement_does_not_overwrite_next_building():
+    from app.models.timeseries import interpolate_missing_timeseries
+    
+    df = pd.DataFrame({
+        'unique_id': ['a', 'a', 'b', 'b'],
+        'timestamp': pd.to_datetime(['2024-01-01 00:00', '2024-01-01 01:40',
+                                     '2024-01-01 00:00', '2024-01-01 01:00']),
+        'y': [1.0, 5.0, 10.0, 20.0]
+    })
+    
+    filled = interpolate_missing_timeseries(df, frequency='H')
+    
+    a = filled[filled['unique_id'] == 'a']
+    b = filled[filled['unique_id'] == 'b']
+    assert a['y'].tolist() == [1.0, 3.0, 5.0]
+    assert a['validation_status'].tolist() == ['valid', 'interpolated', 'valid']
+    assert b['y'].tolist() == [10.0, 20.0]
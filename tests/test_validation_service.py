@@ -0,0 +1,34 @@
+# ===== tests/test_validation_service.py =====
+"""
+Tests du ValidationService: validation complète et validation par morceaux.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.data_generator import ElectricityDataGenerator
+from app.services.validation_service import ValidationService
+
+
+@pytest.fixture(scope='module')
+def chunks():
+    generator = ElectricityDataGenerator()
+    return list(generator.iter_dataset_chunks(
+        num_buildings=12, start_date='2024-01-01', end_date='2024-01-10',
+        frequency='D', seed=3, max_records_per_chunk=40
+    ))
+
+
+@pytest.mark.filterwarnings('error::RuntimeWarning')
+def test_temporal_report_schema_matches_between_full_and_chunked(chunks):
+    buildings = pd.concat([b for b, _ in chunks], ignore_index=True)
+    timeseries = pd.concat([t for _, t in chunks], ignore_index=True)
+    service = ValidationService()
+    
+    full = service.validate_complete_dataset(buildings, timeseries)
+    chunked = service.validate_dataset_chunks(chunks)
+    
+    full_temporal = full['timeseries_validation']['temporal_validation']
+    chunked_temporal = chunked['timeseries_validation']['temporal_validation']
+    assert full_temporal['chronological_order'] is True
+    assert set(full_temporal) == set(chunked_temporal)